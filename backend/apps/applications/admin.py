@@ -2,7 +2,7 @@
 Application admin configuration.
 """
 from django.contrib import admin
-from .models import Application
+from .models import Application, ExportJob
 
 
 @admin.register(Application)
@@ -52,3 +52,16 @@ class ApplicationAdmin(admin.ModelAdmin):
     def mark_rejected(self, request, queryset):
         queryset.update(status='rejected')
     mark_rejected.short_description = "Mark as Rejected"
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Admin configuration for background exports."""
+    
+    list_display = ['id', 'format', 'state', 'rows_written', 'total_rows', 'requested_by', 'created_at']
+    list_filter = ['state', 'format']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'requested_by', 'format', 'filters', 'state', 'total_rows', 'rows_written',
+        'file', 'file_size', 'error', 'created_at', 'started_at', 'finished_at'
+    ]
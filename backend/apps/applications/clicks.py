@@ -0,0 +1,509 @@
+"""
+Buffered ingestion of external and mailto apply clicks.
+
+Recording a click used to insert a full ``Application`` (name, email and phone
+copied from the user), bump ``Job.applications_count`` and the daily rollup,
+update push audiences and invalidate the job feed, all inside the request.
+When a popular job is pushed those writes dominate. ``ApplyToJobView`` now
+only calls ``click_buffer.record()``, which:
+
+- reuses the application id already given out for the same job, user,
+  source and hour (in this process, or from the folded ``Application``);
+- otherwise hands out an id reserved ahead of time from the ``applications``
+  primary key sequence, ``CLICK_ID_BLOCK_SIZE`` ids per query;
+- appends the click to an in-process buffer that is bulk-inserted into
+  ``click_events`` every ``CLICK_FLUSH_INTERVAL`` seconds or
+  ``CLICK_FLUSH_THRESHOLD`` clicks.
+
+``fold()`` turns pending click events into ``Application`` rows (with the
+reserved ids) in batches, doing what ``Application.save()`` and its signals
+would have done. It runs on a background thread after each flush, or from
+``fold_click_events`` where in-process workers can't run. Confirming a click
+that hasn't been folded yet goes through ``find_application()``, which folds
+it on the spot; one still buffered by another process gets a retry-later
+response instead (``may_be_buffered()``).
+"""
+import atexit
+import ipaddress
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Application, ClickEvent, _adjust_applications_count, click_bucket
+
+logger = logging.getLogger(__name__)
+
+# Databases whose applications sequence reserve_ids() can advance
+SUPPORTED_VENDORS = ('postgresql', 'sqlite')
+
+# pg_advisory_xact_lock key serialising folds across processes
+FOLD_LOCK_KEY = 0x636C69636B73
+
+_RESUME_URL_MAX_LENGTH = ClickEvent._meta.get_field('resume_url').max_length
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _database():
+    return router.db_for_write(Application)
+
+
+def is_enabled():
+    """Whether clicks go through the buffer (otherwise they are saved in the request)."""
+    return (
+        _setting('CLICK_BUFFER_ENABLED', True)
+        and connections[_database()].vendor in SUPPORTED_VENDORS
+    )
+
+
+def reserve_ids(count):
+    """
+    Take ``count`` ids from the applications primary key sequence, so rows
+    inserted later with these ids can't collide with ordinary inserts.
+    """
+    using = _database()
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = Application._meta.db_table
+    column = Application._meta.pk.column
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                [quote(table), column, count]
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+
+        # SQLite AUTOINCREMENT keeps the highest id handed out in sqlite_sequence
+        cursor.execute('UPDATE sqlite_sequence SET seq = seq + %s WHERE name = %s', [count, table])
+        if not cursor.rowcount:
+            cursor.execute(
+                f'INSERT INTO sqlite_sequence (name, seq) '
+                f'SELECT %s, COALESCE(MAX({quote(column)}), 0) + %s FROM {quote(table)}',
+                [table, count]
+            )
+        cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+        last = cursor.fetchone()[0]
+    return list(range(last - count + 1, last + 1))
+
+
+def _clean_ip(value):
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+class ClickBuffer:
+    """Buffers click events in process and bulk-inserts them."""
+
+    def __init__(self, flush_interval=None, flush_threshold=None, id_block_size=None):
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._id_block_size = id_block_size
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._id_lock = threading.Lock()
+        self._pending = []
+        # (job_id, user_id, source, click_bucket) -> application id given out
+        self._assigned = {}
+        self._ids = []
+        self._timer = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return _setting('CLICK_FLUSH_INTERVAL', 2.0)
+
+    @property
+    def flush_threshold(self):
+        if self._flush_threshold is not None:
+            return self._flush_threshold
+        return _setting('CLICK_FLUSH_THRESHOLD', 200)
+
+    @property
+    def id_block_size(self):
+        if self._id_block_size is not None:
+            return self._id_block_size
+        return _setting('CLICK_ID_BLOCK_SIZE', 100)
+
+    def record(self, job, user, source, resume_url='', ip_address=None):
+        """Log a click and return the id of the application it counts towards."""
+        now = timezone.now()
+        bucket = click_bucket(now)
+        key = (job.pk, user.pk, source, bucket)
+
+        with self._lock:
+            application_id = self._assigned.get(key)
+        if application_id is None:
+            application_id = (
+                Application.objects.using(_database())
+                .filter(job_id=job.pk, user_id=user.pk, source=source, click_bucket=bucket)
+                .values_list('pk', flat=True)
+                .first()
+            ) or self._next_id()
+            with self._lock:
+                # Concurrent first clicks all get the id stored first
+                application_id = self._assigned.setdefault(key, application_id)
+
+        resume_url = str(resume_url or '')
+        event = ClickEvent(
+            job_id=job.pk,
+            user_id=user.pk,
+            source=source,
+            resume_url=resume_url if len(resume_url) <= _RESUME_URL_MAX_LENGTH else '',
+            ip_address=_clean_ip(ip_address) if ip_address else None,
+            clicked_at=now,
+            click_bucket=bucket,
+            reserved_id=application_id,
+        )
+        with self._lock:
+            self._pending.append(event)
+            due = (
+                len(self._pending) >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if not due and self._timer is None:
+                # Flush quiet periods too, so clicks don't wait for the next one
+                self._timer = threading.Timer(self.flush_interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+        return application_id
+
+    def _next_id(self):
+        with self._id_lock:
+            if not self._ids:
+                self._ids = reserve_ids(self.id_block_size)[::-1]
+            return self._ids.pop()
+
+    def pending(self):
+        """Number of clicks recorded in this process but not yet written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, wait=False, kick_fold=True):
+        """
+        Bulk-insert buffered clicks into ``click_events``. Returns the number
+        written. Unless ``wait`` is set, returns 0 straight away if another
+        thread is already flushing. ``kick_fold=False`` leaves folding to the
+        caller.
+        """
+        if not self._flush_lock.acquire(blocking=wait):
+            return 0
+        try:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                self._last_flush = time.monotonic()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                # Ids given out in past hours can't be reused by new clicks
+                current = click_bucket(timezone.now())
+                self._assigned = {key: pk for key, pk in self._assigned.items() if key[3] >= current}
+
+            if not batch:
+                return 0
+
+            try:
+                ClickEvent.objects.using(_database()).bulk_create(batch, batch_size=1000)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} click events: {e}")
+                with self._lock:
+                    self._pending[:0] = batch
+                return 0
+            if kick_fold and _setting('CLICKS_FOLD_IN_PROCESS', True):
+                transaction.on_commit(kick, using=_database())
+            return len(batch)
+        finally:
+            self._flush_lock.release()
+
+    def _flush_in_thread(self):
+        close_old_connections()
+        try:
+            self.flush(wait=True)
+        except Exception:
+            logger.exception('Click buffer flush failed')
+        finally:
+            close_old_connections()
+
+
+click_buffer = ClickBuffer()
+
+
+
+def _flush_at_exit():
+    """Write out whatever is left when the worker shuts down, and fold it here."""
+    try:
+        # The fold worker can't take new work during interpreter shutdown
+        if click_buffer.flush(wait=True, kick_fold=False) and _setting('CLICKS_FOLD_IN_PROCESS', True):
+            while fold():
+                pass
+    except Exception:
+        # Written events are folded by the next fold anywhere
+        logger.exception('Flushing click events at exit failed')
+
+
+# Don't inherit a parent's buffer or reserved ids across fork (e.g. gunicorn
+# --preload)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=click_buffer._reset)
+atexit.register(_flush_at_exit)
+
+
+# Folding
+
+_fold_lock = threading.Lock()
+
+
+def fold(limit=None, reserved_id=None):
+    """
+    Fold pending click events into applications, oldest first. Returns the
+    number of events folded. ``reserved_id`` restricts it to the clicks that
+    were given that application id.
+
+    Folds are serialised (per process, and across processes on PostgreSQL),
+    so each click group is inserted and counted exactly once.
+    """
+    using = _database()
+    limit = limit or _setting('CLICK_FOLD_BATCH_SIZE', 1000)
+    with _fold_lock, transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [FOLD_LOCK_KEY])
+
+        # Claim the batch with a write first: SQLite can't upgrade a read
+        # transaction to a write one while requests are writing
+        pending = ClickEvent.objects.using(using).filter(folded_at__isnull=True)
+        if reserved_id is not None:
+            pending = pending.filter(reserved_id=reserved_id)
+        claimed_at = timezone.now()
+        claimed = ClickEvent.objects.using(using).filter(
+            pk__in=pending.order_by('pk').values('pk')[:limit]
+        ).update(folded_at=claimed_at)
+        if claimed:
+            _fold(list(ClickEvent.objects.using(using).filter(folded_at=claimed_at).order_by('pk')), using)
+    return claimed
+
+
+def _fold(events, using):
+    from apps.jobs import feed_cache
+    from apps.jobs.models import Job
+    from apps.notifications import audiences
+
+    groups = defaultdict(list)
+    for event in events:
+        groups[(event.job_id, event.user_id, event.source, event.click_bucket)].append(event)
+
+    job_ids = set(Job.objects.using(using).filter(pk__in={key[0] for key in groups}).values_list('pk', flat=True))
+    users = (
+        get_user_model().objects.using(using)
+        .only('username', 'first_name', 'last_name', 'email', 'phone')
+        .in_bulk({key[1] for key in groups})
+    )
+    existing = {
+        row[:4]: row[4:]
+        for row in Application.objects.using(using).filter(
+            job_id__in=job_ids,
+            user_id__in=users,
+            click_bucket__in={key[3] for key in groups},
+        ).values_list('job_id', 'user_id', 'source', 'click_bucket', 'pk', 'resume_url')
+    }
+
+    resolved = {}
+    resume_updates = {}
+    new = {}
+    for key, group in groups.items():
+        job_id, user_id, source, bucket = key
+        user = users.get(user_id)
+        if job_id not in job_ids or user is None:
+            # Deleted since the click; nothing to fold into
+            resolved[key] = None
+            continue
+        resume_url = next((event.resume_url for event in reversed(group) if event.resume_url), '')
+        if key in existing:
+            application_id, current_resume_url = existing[key]
+            resolved[key] = application_id
+            if resume_url and resume_url != current_resume_url:
+                resume_updates[application_id] = resume_url
+            continue
+        resolved[key] = group[0].reserved_id
+        new[key] = Application(
+            pk=group[0].reserved_id,
+            job_id=job_id,
+            user_id=user_id,
+            name=user.get_full_name() or user.username,
+            email=user.email,
+            phone=user.phone or '',
+            source=source,
+            submission_status='clicked',
+            resume_url=resume_url,
+            ip_address=group[0].ip_address,
+            click_bucket=bucket,
+        )
+
+    if new:
+        Application.objects.using(using).bulk_create(new.values(), ignore_conflicts=True)
+        inserted = set(
+            Application.objects.using(using).filter(pk__in=[application.pk for application in new.values()])
+            .values_list('pk', flat=True)
+        )
+        for key, application in list(new.items()):
+            if application.pk not in inserted:
+                # Saved outside the buffer meanwhile (CLICK_BUFFER_ENABLED was off somewhere)
+                del new[key]
+                resolved[key] = (
+                    Application.objects.using(using)
+                    .filter(job_id=key[0], user_id=key[1], source=key[2], click_bucket=key[3])
+                    .values_list('pk', flat=True)
+                    .first()
+                )
+        _record_created(groups, new, using)
+        audiences.record_applications(new.values())
+        transaction.on_commit(feed_cache.invalidate, using=using)
+
+    for application_id, resume_url in resume_updates.items():
+        Application.objects.using(using).filter(pk=application_id).update(
+            resume_url=resume_url, updated_at=timezone.now()
+        )
+
+    # Most clicks fold into the id they were given: link those in one statement
+    folded_as_reserved = []
+    folded_elsewhere = defaultdict(list)
+    for key, group in groups.items():
+        for event in group:
+            if resolved[key] == event.reserved_id:
+                folded_as_reserved.append(event.pk)
+            elif resolved[key] is not None:
+                folded_elsewhere[resolved[key]].append(event.pk)
+    events = ClickEvent.objects.using(using)
+    if folded_as_reserved:
+        events.filter(pk__in=folded_as_reserved).update(application_id=F('reserved_id'))
+    for application_id, event_ids in folded_elsewhere.items():
+        events.filter(pk__in=event_ids).update(application_id=application_id)
+
+
+def _record_created(groups, new, using):
+    """Bump applications_count and the daily rollups for newly folded applications."""
+    from apps.jobs.rollups import SOURCE_METRICS, record_job_activity
+
+    per_job = Counter()
+    per_day = Counter()
+    for key, application in new.items():
+        per_job[application.job_id] += 1
+        day = timezone.localdate(groups[key][0].clicked_at)
+        per_day[(application.job_id, day, SOURCE_METRICS[application.source])] += 1
+
+    for job_id, count in per_job.items():
+        _adjust_applications_count(job_id, count)
+    for (job_id, day, metric), count in per_day.items():
+        record_job_activity(job_id, day=day, **{metric: count})
+
+
+def flush_and_fold():
+    """Write this process's buffer and fold every pending click. Returns the number folded."""
+    click_buffer.flush(wait=True)
+    folded = 0
+    while True:
+        count = fold()
+        if not count:
+            return folded
+        folded += count
+
+
+def find_application(application_id, user):
+    """
+    The application a click's ``application_id`` refers to, folding the click
+    first if needed. Returns None if ``user`` has no such click written yet;
+    ``may_be_buffered()`` tells whether it could still be on its way.
+    """
+    if click_buffer.pending():
+        click_buffer.flush(wait=True)
+    events = ClickEvent.objects.using(_database()).filter(reserved_id=application_id, user_id=user.pk)
+    if not events.exists():
+        return None
+    fold(reserved_id=application_id)
+    folded_into = events.filter(application__isnull=False).values_list('application_id', flat=True).first()
+    if folded_into is None:
+        return None
+    return Application.objects.using(_database()).filter(pk=folded_into, user=user).first()
+
+
+def may_be_buffered(application_id):
+    """
+    Whether ``application_id`` may belong to a click another process still
+    buffers (it reaches ``click_events`` within that process's
+    ``CLICK_FLUSH_INTERVAL``): the sequence has handed it out, and neither an
+    application nor anyone's click event has it yet.
+    """
+    using = _database()
+    return (
+        _handed_out(application_id)
+        and not Application.objects.using(using).filter(pk=application_id).exists()
+        and not ClickEvent.objects.using(using).filter(reserved_id=application_id).exists()
+    )
+
+
+def _handed_out(application_id):
+    """Whether the applications id sequence has reached ``application_id``."""
+    using = _database()
+    connection = connections[using]
+    table = Application._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT pg_sequence_last_value(pg_get_serial_sequence(%s, %s)::regclass)',
+                [connection.ops.quote_name(table), Application._meta.pk.column],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+        else:
+            return False
+        row = cursor.fetchone()
+    return bool(row and row[0] is not None and application_id <= row[0])
+
+
+# Background folding
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def kick():
+    """Fold pending clicks on the background worker thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='click-fold')
+        _executor.submit(_fold_in_thread)
+
+
+def _fold_in_thread():
+    close_old_connections()
+    try:
+        while fold():
+            pass
+    except Exception:
+        logger.exception('Folding click events failed')
+    finally:
+        close_old_connections()
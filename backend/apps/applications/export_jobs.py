@@ -0,0 +1,170 @@
+"""
+Background runner for queued application exports.
+
+Exports are written to a local temporary file and then saved to
+``default_storage`` under ``exports/``. They run on a small in-process thread
+pool, or, where background threads can't outlive a request (serverless), by
+the ``run_export_jobs`` management command or the ``/cron/exports/`` task. A
+job is claimed with a conditional UPDATE so the two never process the same
+export.
+
+The running worker refreshes ``heartbeat_at`` as it writes rows. An export
+whose heartbeat is older than ``EXPORT_LEASE_SECONDS`` lost its worker: it is
+requeued, or failed after ``EXPORT_MAX_ATTEMPTS``. Every write of an attempt
+is conditional on its attempt number, so a worker that only stalled can't
+overwrite the attempt that replaced it.
+"""
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import exports
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared export thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EXPORT_WORKERS,
+                thread_name_prefix='export',
+            )
+        return _executor
+
+
+def enqueue(export_job):
+    """Schedule an export once the transaction that created it commits."""
+    if not settings.EXPORT_RUN_IN_PROCESS:
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run_in_thread, export_job.pk))
+
+
+def _run_in_thread(export_job_id):
+    close_old_connections()
+    try:
+        run_export(export_job_id)
+    finally:
+        close_old_connections()
+
+
+def claim(export_job_id):
+    """
+    Move a queued export to running. Returns the attempt number, or 0 if
+    someone else has it.
+    """
+    now = timezone.now()
+    claimed = ExportJob.objects.filter(pk=export_job_id, state='queued').update(
+        state='running', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1
+    )
+    if not claimed:
+        return 0
+    return ExportJob.objects.filter(pk=export_job_id).values_list('attempts', flat=True).get()
+
+
+def run_export(export_job_id):
+    """Claim and produce one export. Returns True if this call ran it."""
+    attempt = claim(export_job_id)
+    if not attempt:
+        return False
+
+    export_job = ExportJob.objects.get(pk=export_job_id)
+    # This attempt's row, until requeue_stale() hands the export to another
+    current = ExportJob.objects.filter(pk=export_job.pk, state='running', attempts=attempt)
+    name = None
+    try:
+        writer, _ = exports.WRITERS[export_job.format]
+        queryset = exports.export_queryset(**export_job.filters)
+        current.update(total_rows=queryset.count(), heartbeat_at=timezone.now())
+
+        def on_rows(count):
+            current.update(rows_written=count, heartbeat_at=timezone.now())
+
+        with tempfile.TemporaryFile() as output:
+            writer(output, exports.iter_rows(queryset), on_rows=on_rows)
+            size = output.tell()
+            output.seek(0)
+            name = default_storage.save(
+                f'exports/applications-{export_job.pk}.{export_job.format}', File(output)
+            )
+
+        if not current.update(state='done', file=name, file_size=size, finished_at=timezone.now()):
+            raise RuntimeError('Lease lost to another attempt')
+        logger.info(f"Export {export_job.pk} finished: {name} ({size} bytes)")
+    except Exception as e:
+        logger.exception(f"Export {export_job.pk} attempt {attempt} failed")
+        if name is not None and not ExportJob.objects.filter(pk=export_job.pk, file=name).exists():
+            # Superseded: unless storage overwrote the replacing attempt's own file
+            default_storage.delete(name)
+        current.update(state='failed', error=str(e), finished_at=timezone.now())
+    return True
+
+
+def is_stale(export_job):
+    """Whether a running export's worker has stopped heartbeating."""
+    if export_job.state != 'running':
+        return False
+    last_seen = export_job.heartbeat_at or export_job.started_at
+    return last_seen is None or last_seen < timezone.now() - timedelta(seconds=settings.EXPORT_LEASE_SECONDS)
+
+
+def requeue_stale():
+    """
+    Requeue running exports whose lease expired, or fail them after
+    ``EXPORT_MAX_ATTEMPTS``. Returns how many were requeued.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.EXPORT_LEASE_SECONDS)
+    stale = ExportJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        state='running',
+    )
+    given_up = stale.filter(attempts__gte=settings.EXPORT_MAX_ATTEMPTS).update(
+        state='failed', error='Export worker stopped responding', finished_at=now
+    )
+    if given_up:
+        logger.error(f"Gave up on {given_up} export(s) whose worker stopped responding")
+    requeued = stale.filter(attempts__lt=settings.EXPORT_MAX_ATTEMPTS).update(state='queued')
+    if requeued:
+        logger.warning(f"Requeued {requeued} export(s) whose worker stopped responding")
+    return requeued
+
+
+def recover():
+    """Requeue stale exports and, in process, run them again."""
+    if requeue_stale() and settings.EXPORT_RUN_IN_PROCESS:
+        get_executor().submit(_run_pending_in_thread)
+
+
+def _run_pending_in_thread():
+    close_old_connections()
+    try:
+        run_pending()
+    finally:
+        close_old_connections()
+
+
+def run_pending(limit=None):
+    """Requeue stale exports, then run queued ones oldest first in this thread. Returns how many ran."""
+    requeue_stale()
+    ran = 0
+    queued = ExportJob.objects.filter(state='queued').order_by('created_at')
+    for export_job_id in queued.values_list('pk', flat=True)[:limit]:
+        if run_export(export_job_id):
+            ran += 1
+    return ran
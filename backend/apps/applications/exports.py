@@ -0,0 +1,220 @@
+"""
+Application export helpers.
+
+Rows are read with ``values_list`` (only the exported columns, no model
+instances) through ``.iterator()``, which uses a server-side cursor on
+PostgreSQL, and are written out in ~64 KB chunks so memory stays flat no
+matter how many applications are exported.
+"""
+import csv
+import zlib
+
+from .models import Application
+
+CSV_HEADER = [
+    'ID', 'Job Title', 'Company', 'Applicant Name', 'Email', 'Phone',
+    'Source', 'Status', 'Submission Status', 'Applied At', 'Resume URL'
+]
+
+EXPORT_COLUMNS = (
+    'id', 'job__title', 'job__company', 'name', 'email', 'phone',
+    'source', 'status', 'submission_status', 'applied_at', 'resume_url',
+)
+
+ITERATOR_CHUNK_SIZE = 2000
+OUTPUT_CHUNK_BYTES = 64 * 1024
+
+_SOURCE_LABELS = dict(Application.SOURCE_CHOICES)
+_STATUS_LABELS = dict(Application.STATUS_CHOICES)
+_SUBMISSION_STATUS_LABELS = dict(Application.SUBMISSION_STATUS_CHOICES)
+
+
+class _Buffer:
+    """File-like sink for ``csv.writer`` that collects written text."""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def write(self, value):
+        self.parts.append(value)
+        self.size += len(value)
+
+    def drain(self):
+        text = ''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        return text
+
+
+# Filters accepted by export_queryset, mapped to their ORM lookups.
+EXPORT_FILTERS = {
+    'job_id': 'job_id',
+    'source': 'source',
+    'status': 'status',
+    'submission_status': 'submission_status',
+    'start': 'applied_at__date__gte',
+    'end': 'applied_at__date__lte',
+}
+
+
+def export_queryset(job_id=None, **filters):
+    """
+    Applications to export, newest first.
+
+    Accepts the keys of ``EXPORT_FILTERS``; empty values are ignored.
+    """
+    filters['job_id'] = job_id
+    lookups = {
+        EXPORT_FILTERS[name]: value
+        for name, value in filters.items()
+        if value not in (None, '')
+    }
+    return Application.objects.filter(**lookups)
+
+
+def iter_rows(queryset):
+    """Yield CSV rows (lists) for an application queryset, header first."""
+    yield CSV_HEADER
+    rows = queryset.values_list(*EXPORT_COLUMNS).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    for (app_id, job_title, company, name, email, phone,
+         source, status, submission_status, applied_at, resume_url) in rows:
+        yield [
+            app_id,
+            job_title,
+            company,
+            name,
+            email,
+            phone,
+            _SOURCE_LABELS.get(source, source),
+            _STATUS_LABELS.get(status, status),
+            _SUBMISSION_STATUS_LABELS.get(submission_status, submission_status),
+            applied_at.strftime('%Y-%m-%d %H:%M'),
+            resume_url,
+        ]
+
+
+def iter_csv(queryset):
+    """Yield UTF-8 encoded CSV in chunks of roughly ``OUTPUT_CHUNK_BYTES``."""
+    return iter_csv_rows(iter_rows(queryset))
+
+
+def iter_csv_rows(rows):
+    """Encode an iterable of rows as CSV, yielded in byte chunks."""
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.size >= OUTPUT_CHUNK_BYTES:
+            yield buffer.drain().encode('utf-8')
+    if buffer.size:
+        yield buffer.drain().encode('utf-8')
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a byte-chunk stream into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# Background export file writers. Each takes an output file opened in binary
+# mode and an iterable of rows (header first), and reports progress through
+# ``on_rows(count)`` every ``PROGRESS_EVERY`` data rows.
+
+PROGRESS_EVERY = 10_000
+
+# Excel's per-sheet row limit, header included.
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _counted(rows, on_rows):
+    """Pass rows through, calling ``on_rows`` with the running data row count."""
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if on_rows and count % PROGRESS_EVERY == 0:
+            on_rows(count - 1)
+    if on_rows:
+        on_rows(max(0, count - 1))
+
+
+def write_csv(output, rows, on_rows=None, compress=False):
+    chunks = iter_csv_rows(_counted(rows, on_rows))
+    if compress:
+        chunks = gzip_chunks(chunks)
+    for chunk in chunks:
+        output.write(chunk)
+
+
+def write_csv_gzip(output, rows, on_rows=None):
+    write_csv(output, rows, on_rows, compress=True)
+
+
+def write_xlsx(output, rows, on_rows=None):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    rows = _counted(rows, on_rows)
+    header = next(rows)
+    sheet = None
+    sheet_rows = XLSX_MAX_ROWS
+    for row in rows:
+        if sheet_rows >= XLSX_MAX_ROWS:
+            # Start a new sheet once the current one is full.
+            sheet = workbook.create_sheet(f'Applications {len(workbook.worksheets) + 1}')
+            sheet.append(header)
+            sheet_rows = 1
+        sheet.append(row)
+        sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet('Applications 1').append(header)
+    workbook.save(output)
+
+
+def write_parquet(output, rows, on_rows=None, batch_rows=50_000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = _counted(rows, on_rows)
+    header = next(rows)
+    schema = pa.schema(
+        [pa.field(header[0], pa.int64())] + [pa.field(name, pa.string()) for name in header[1:]]
+    )
+    with pq.ParquetWriter(output, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                writer.write_table(pa.Table.from_pylist([dict(zip(header, r)) for r in batch], schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist([dict(zip(header, r)) for r in batch], schema))
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+WRITERS = {
+    'csv': (write_csv, None),
+    'csv.gz': (write_csv_gzip, None),
+    'xlsx': (write_xlsx, 'openpyxl'),
+    'parquet': (write_parquet, 'pyarrow'),
+}
+
+
+def available_formats():
+    """Export formats whose optional dependency is installed."""
+    return [
+        name for name, (_, dependency) in WRITERS.items()
+        if dependency is None or _has_module(dependency)
+    ]
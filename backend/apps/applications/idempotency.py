@@ -0,0 +1,153 @@
+"""
+``Idempotency-Key`` support for POST handlers.
+
+A client that may retry a request (the mobile app on a flaky network) sends
+a unique ``Idempotency-Key`` header with it. The first request with a key
+runs and its response is stored; a retry with the same key and body gets the
+stored response back, marked ``Idempotent-Replayed: true``, instead of running
+again. A retry that arrives while the first request is still running gets
+409, and reusing a key for a different request gets 422. Keys are per user
+and expire after ``IDEMPOTENCY_KEY_TTL`` seconds (see
+``purge_idempotency_keys``).
+"""
+import functools
+import hashlib
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def expired_before():
+    return timezone.now() - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400))
+
+
+def fingerprint(request):
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def claim(user, key, request_fingerprint):
+    """
+    Return ``(record, created)``. Of several concurrent requests with the same
+    key, exactly one creates the record and goes on to run.
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=request_fingerprint), True
+    except IntegrityError:
+        pass
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if record is not None and record.created_at >= expired_before():
+        return record, False
+
+    # The key expired (or was just released): start over with this request
+    IdempotencyKey.objects.filter(user=user, key=key, created_at__lt=expired_before()).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=request_fingerprint), True
+    except IntegrityError:
+        return IdempotencyKey.objects.get(user=user, key=key), False
+
+
+def replay(record, request_fingerprint):
+    if record.fingerprint != request_fingerprint:
+        return Response(
+            {'error': f'{HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if record.status_code is None:
+        return Response(
+            {'error': f'A request with this {HEADER} is still being processed'},
+            status=status.HTTP_409_CONFLICT
+        )
+    response = Response(record.response, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _start(request):
+    """
+    Claim the request's key. Returns ``(record, response)``: ``response`` is
+    sent instead of running the handler (a replay or an error); otherwise the
+    handler runs and ``record`` (None without a key) stores its response.
+    """
+    key = request.headers.get(HEADER)
+    if not key or not request.user.is_authenticated:
+        return None, None
+    if len(key) > MAX_KEY_LENGTH:
+        return None, Response(
+            {'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    request_fingerprint = fingerprint(request)
+    record, created = claim(request.user, key, request_fingerprint)
+    if not created:
+        return None, replay(record, request_fingerprint)
+    return record, None
+
+
+def _store(record, response):
+    if response.status_code >= 500:
+        # Server errors may be transient: let the client retry with the same key
+        record.delete()
+    else:
+        record.status_code = response.status_code
+        record.response = response.data
+        record.save(update_fields=['status_code', 'response'])
+
+
+def idempotent(handler):
+    """Make an APIView handler honour the ``Idempotency-Key`` request header."""
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        record, response = _start(request)
+        if response is not None:
+            return response
+        if record is None:
+            return handler(view, request, *args, **kwargs)
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        _store(record, response)
+        return response
+
+    return wrapper
+
+
+def aidempotent(handler):
+    """``idempotent`` for the coroutine handlers of ``config.async_views.AsyncAPIView``."""
+
+    @functools.wraps(handler)
+    async def wrapper(view, request, *args, **kwargs):
+        # claim() needs a transaction, which the async ORM can't open
+        record, response = await sync_to_async(_start)(request)
+        if response is not None:
+            return response
+        if record is None:
+            return await handler(view, request, *args, **kwargs)
+
+        try:
+            response = await handler(view, request, *args, **kwargs)
+        except Exception:
+            await record.adelete()
+            raise
+        await sync_to_async(_store)(record, response)
+        return response
+
+    return wrapper
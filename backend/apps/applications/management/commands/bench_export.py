@@ -0,0 +1,63 @@
+"""
+Benchmark the streaming applications CSV export.
+Samples RSS while the export is consumed to show memory stays flat.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.applications import exports
+from apps.jobs.models import Job
+from benchmarks.utils import make_applications, make_jobs, rolled_back, rss_mb
+
+
+class Command(BaseCommand):
+    help = 'Measure time and RSS of streaming the applications CSV export'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=1_000_000)
+        parser.add_argument('--jobs', type=int, default=500)
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--samples', type=int, default=10, help='RSS samples taken during the export')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.stdout.write(f"Seeding {options['applications']} applications...")
+            make_jobs(options['jobs'])
+            job_ids = list(Job.objects.values_list('id', flat=True))
+            make_applications(options['applications'], job_ids)
+
+            result = self.consume(options)
+
+        self.stdout.write(json.dumps(result, indent=2))
+
+    def consume(self, options):
+        chunks = exports.iter_csv(exports.export_queryset())
+        if options['gzip']:
+            chunks = exports.gzip_chunks(chunks)
+
+        rss_start = rss_mb()
+        readings = []
+        total_bytes = 0
+        start = time.perf_counter()
+        for chunk in chunks:
+            total_bytes += len(chunk)
+            readings.append(rss_mb())
+        elapsed = time.perf_counter() - start
+
+        # Keep evenly spaced readings across the whole export.
+        step = max(1, len(readings) // options['samples'])
+        samples = [round(value, 1) for value in readings[::step]]
+
+        return {
+            'applications': options['applications'],
+            'gzip': options['gzip'],
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(options['applications'] / elapsed) if elapsed else None,
+            'output_mb': round(total_bytes / (1024 * 1024), 2),
+            'rss_start_mb': round(rss_start, 1),
+            'rss_samples_mb': samples,
+            'rss_growth_mb': round(max(readings, default=rss_start) - rss_start, 1),
+        }
@@ -0,0 +1,153 @@
+"""
+Benchmark the memory a resume upload takes: the old buffered save, which
+copied the upload into a ``ContentFile`` first, against passing the uploaded
+file to storage as it is (see apps.applications.resumes).
+
+Each upload runs through ``UploadResumeView`` with the request body read from
+a file, so only what the view allocates is measured. Peak memory comes from
+tracemalloc: for one upload at a time, and for --concurrency uploads on as
+many threads at once, as in a gthread worker. Files are saved to a temporary
+``FileSystemStorage``; S3 is never called.
+
+    python manage.py bench_resume_upload --sizes-kb 256 1024 4096 --concurrency 8
+"""
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import force_authenticate
+
+from apps.applications.views import UploadResumeView
+from benchmarks.utils import rolled_back
+
+BOUNDARY = 'bench-resume-boundary'
+
+
+class BufferedUploadResumeView(UploadResumeView):
+    """The upload path before streaming: a full copy of the file in memory."""
+
+    def get_upload(self, request, resume_file):
+        filename, _ = super().get_upload(request, resume_file)
+        return filename, ContentFile(resume_file.read())
+
+
+MODES = {'buffered': BufferedUploadResumeView, 'streamed': UploadResumeView}
+
+
+class Command(BaseCommand):
+    help = 'Compare peak memory of buffered and streamed resume uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes-kb', type=int, nargs='+', default=[256, 1024, 4096])
+        parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous uploads')
+        parser.add_argument('--repeat', type=int, default=5, help='Uploads per size and mode, one at a time')
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='bench-resume-')
+        storage = {
+            'DEFAULT_FILE_STORAGE': 'django.core.files.storage.FileSystemStorage',
+            'MEDIA_ROOT': os.path.join(workdir, 'media'),
+            'RESUME_MAX_UPLOAD_SIZE': max(options['sizes_kb']) * 1024 + 1024,
+        }
+        results = []
+        try:
+            with rolled_back(), override_settings(**storage):
+                self.student = get_user_model().objects.create(
+                    username='bench-resume', email='bench-resume@example.com',
+                )
+                for size_kb in options['sizes_kb']:
+                    body_path = self.write_body(workdir, size_kb)
+                    for mode in MODES:
+                        result = self.bench(mode, body_path, options)
+                        result.update(mode=mode, size_kb=size_kb)
+                        results.append(result)
+                        self.stderr.write(
+                            f"{mode} {size_kb} KB: peak {result['peak_kb']} KB, "
+                            f"{options['concurrency']} at once {result['concurrent_peak_kb']} KB, "
+                            f"{result['mean_ms']} ms"
+                        )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.stdout.write(json.dumps({
+            'options': {
+                'file_upload_max_memory_size': settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+                'concurrency': options['concurrency'],
+                'repeat': options['repeat'],
+            },
+            'runs': results,
+        }, indent=2))
+
+    def write_body(self, workdir, size_kb):
+        """A multipart body with one PDF of ``size_kb``, on disk."""
+        path = os.path.join(workdir, f'body-{size_kb}.bin')
+        with open(path, 'wb') as fp:
+            fp.write((
+                f'--{BOUNDARY}\r\n'
+                f'Content-Disposition: form-data; name="resume"; filename="bench-{size_kb}.pdf"\r\n'
+                'Content-Type: application/pdf\r\n\r\n'
+                '%PDF-1.4\n'
+            ).encode())
+            fp.write(os.urandom(size_kb * 1024 - 9))
+            fp.write(f'\r\n--{BOUNDARY}--\r\n'.encode())
+        return path
+
+    def upload(self, view, body_path):
+        with open(body_path, 'rb') as body:
+            request = WSGIRequest({
+                'REQUEST_METHOD': 'POST',
+                'PATH_INFO': '/api/applications/upload/',
+                'SCRIPT_NAME': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'HTTP_HOST': 'localhost',
+                'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+                'CONTENT_LENGTH': str(os.path.getsize(body_path)),
+                'wsgi.input': body,
+                'wsgi.url_scheme': 'http',
+            })
+            force_authenticate(request, user=self.student)
+            try:
+                response = view(request)
+            finally:
+                # As the WSGI handler does: removes spooled uploads storage didn't move
+                request.close()
+        if response.status_code != 200:
+            raise RuntimeError(f'Upload failed with {response.status_code}: {response.data}')
+
+    def bench(self, mode, body_path, options):
+        view = MODES[mode].as_view()
+        self.upload(view, body_path)  # Imports and first-use caches
+
+        peaks, timings = [], []
+        for _ in range(options['repeat']):
+            tracemalloc.start()
+            start = time.perf_counter()
+            self.upload(view, body_path)
+            timings.append((time.perf_counter() - start) * 1000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        tracemalloc.start()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            for future in [pool.submit(self.upload, view, body_path) for _ in range(options['concurrency'])]:
+                future.result()
+        concurrent_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            'peak_kb': round(max(peaks) / 1024),
+            'concurrent_peak_kb': round(concurrent_peak / 1024),
+            'mean_ms': round(statistics.fmean(timings), 2),
+        }
@@ -0,0 +1,38 @@
+"""
+Management command to fold logged apply clicks into applications.
+Use this (e.g. from cron) where the in-process fold worker can't run.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.applications import clicks
+from apps.applications.models import ClickEvent
+
+
+class Command(BaseCommand):
+    help = 'Fold pending click events into applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for pending clicks')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+        parser.add_argument(
+            '--purge-days', type=int, default=None,
+            help='Also delete folded click events older than this many days'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            folded = clicks.flush_and_fold()
+            if folded:
+                self.stdout.write(self.style.SUCCESS(f'Folded {folded} click event(s)'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        if options['purge_days'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['purge_days'])
+            deleted, _ = ClickEvent.objects.filter(folded_at__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} folded click event(s)'))
@@ -0,0 +1,16 @@
+"""
+Management command to delete expired Idempotency-Key records.
+Run it daily (e.g. from cron); expired keys are also replaced when reused.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.applications.idempotency import expired_before
+from apps.applications.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=expired_before()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency key(s)'))
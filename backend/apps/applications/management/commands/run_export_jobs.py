@@ -0,0 +1,27 @@
+"""
+Management command to produce queued application exports.
+Use this (e.g. from cron) where exports can't run on the in-process pool.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.applications import export_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum exports to run')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new exports')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            ran = export_jobs.run_pending(limit=options['limit'])
+            if ran:
+                self.stdout.write(self.style.SUCCESS(f'Ran {ran} export(s)'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
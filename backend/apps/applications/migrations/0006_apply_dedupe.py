@@ -0,0 +1,81 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+import django.core.serializers.json
+import django.db.models.deletion
+
+
+def remove_duplicate_in_app_applications(apps, schema_editor):
+    """Keep the first in-app application per job and user, as the new constraint requires."""
+    Application = apps.get_model('applications', 'Application')
+    Job = apps.get_model('jobs', 'Job')
+    duplicates = (
+        Application.objects.filter(source='in_app', user__isnull=False)
+        .order_by()
+        .values('job_id', 'user_id')
+        .annotate(first_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for group in duplicates:
+        Application.objects.filter(
+            source='in_app', job_id=group['job_id'], user_id=group['user_id']
+        ).exclude(pk=group['first_id']).delete()
+        removed = group['total'] - 1
+        Job.objects.filter(pk=group['job_id'], applications_count__gte=removed).update(
+            applications_count=F('applications_count') - removed
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('applications', '0005_export_job'),
+        ('jobs', '0006_job_applications_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('fingerprint', models.CharField(help_text='Hash of the method, path and body', max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('response', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'idempotency_keys',
+            },
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='click_bucket',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(remove_duplicate_in_app_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(condition=models.Q(('source', 'in_app')), fields=('job', 'user'), name='unique_in_app_application'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(condition=models.Q(('click_bucket__isnull', False)), fields=('job', 'user', 'source', 'click_bucket'), name='unique_click_per_bucket'),
+        ),
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='idempotencykey',
+            index=models.Index(fields=['created_at'], name='idempotency_created_467cd2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='unique_idempotency_key'),
+        ),
+    ]
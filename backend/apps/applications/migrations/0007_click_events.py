@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0006_job_applications_count'),
+        ('applications', '0006_apply_dedupe'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClickEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('external_click', 'External Click'), ('mailto_click', 'Mailto Click')], max_length=20)),
+                ('resume_url', models.URLField(blank=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('clicked_at', models.DateTimeField()),
+                ('click_bucket', models.PositiveIntegerField()),
+                ('reserved_id', models.BigIntegerField(db_index=True)),
+                ('folded_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='applications.application')),
+                ('job', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobs.job')),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'click_events',
+                'indexes': [models.Index(condition=models.Q(('folded_at__isnull', True)), fields=['id'], name='click_events_pending')],
+            },
+        ),
+    ]
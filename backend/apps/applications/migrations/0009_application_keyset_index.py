@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_export_job_lease'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-applied_at', '-id'], name='application_applied_b58900_idx'),
+        ),
+    ]
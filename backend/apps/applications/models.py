@@ -1,8 +1,14 @@
 """
 Application model for tracking job applications.
 """
-from django.db import models
+import uuid
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class Application(models.Model):
@@ -67,6 +73,9 @@ class Application(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     
+    # Hour (since the epoch) of a click, so repeated clicks within it are one row
+    click_bucket = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    
     # Admin notes
     notes = models.TextField(blank=True, help_text="Internal notes for admin")
     
@@ -75,10 +84,204 @@ class Application(models.Model):
         ordering = ['-applied_at']
         indexes = [
             models.Index(fields=['job', '-applied_at']),
+            # Keyset (cursor) pagination of all applications
+            models.Index(fields=['-applied_at', '-id']),
             models.Index(fields=['user', '-applied_at']),
             models.Index(fields=['source']),
             models.Index(fields=['status']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'user'],
+                condition=Q(source='in_app'),
+                name='unique_in_app_application',
+            ),
+            models.UniqueConstraint(
+                fields=['job', 'user', 'source', 'click_bucket'],
+                condition=Q(click_bucket__isnull=False),
+                name='unique_click_per_bucket',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.job.title} ({self.source})"
+    
+    def save(self, *args, **kwargs):
+        # Keep Job.applications_count in step with inserts, in the same transaction.
+        # No savepoint: callers that recover from a failed insert (a duplicate)
+        # wrap it in their own atomic().
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+            _adjust_applications_count(self.job_id, 1)
+
+
+CLICK_BUCKET_SECONDS = 3600
+
+
+def click_bucket(moment):
+    """The dedupe bucket of a click made at ``moment``."""
+    return int(moment.timestamp()) // CLICK_BUCKET_SECONDS
+
+
+def _adjust_applications_count(job_id, delta):
+    from apps.jobs.models import Job
+    jobs = Job.objects.filter(pk=job_id)
+    if delta < 0:
+        # Never drive the counter below zero if it has already drifted
+        jobs = jobs.filter(applications_count__gte=-delta)
+    jobs.update(applications_count=F('applications_count') + delta)
+
+
+@receiver(post_delete, sender=Application)
+def _application_deleted(sender, instance, **kwargs):
+    # Runs inside the deletion transaction, including queryset and cascade deletes
+    _adjust_applications_count(instance.job_id, -1)
+
+
+class ClickEvent(models.Model):
+    """
+    Append-only log of external and mailto apply clicks.
+
+    Clicks are buffered in process and bulk-inserted here (see
+    ``apps.applications.clicks``), then folded into ``Application`` rows in
+    the background. ``reserved_id`` is the application id returned to the
+    client at click time; ``application`` is the row the click was folded
+    into, which differs only when another process reserved an id for the
+    same click first. The foreign keys have no database constraints so the
+    log stays cheap to write and is left alone when jobs or users go away.
+    """
+
+    job = models.ForeignKey(
+        'jobs.Job',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    source = models.CharField(max_length=20, choices=Application.SOURCE_CHOICES[1:])
+    resume_url = models.URLField(blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    clicked_at = models.DateTimeField()
+    click_bucket = models.PositiveIntegerField()
+    reserved_id = models.BigIntegerField(db_index=True)
+
+    # Set when the click has been folded into an application
+    application = models.ForeignKey(
+        Application,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    folded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'click_events'
+        indexes = [
+            models.Index(fields=['id'], condition=Q(folded_at__isnull=True), name='click_events_pending'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} on job {self.job_id} by {self.user_id}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied ``Idempotency-Key`` and the response it produced, so a
+    retried request gets the same answer instead of running twice.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64, help_text="Hash of the method, path and body")
+    # Empty while the first request is still being processed
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.status_code or 'in progress'})"
+
+
+class ExportJob(models.Model):
+    """A queued applications export produced in the background into default_storage."""
+
+    FORMAT_CHOICES = (
+        ('csv', 'CSV'),
+        ('csv.gz', 'CSV (gzip)'),
+        ('xlsx', 'Excel'),
+        ('parquet', 'Parquet'),
+    )
+
+    STATE_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='export_jobs'
+    )
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    filters = models.JSONField(default=dict, blank=True)
+
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='queued')
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.CharField(max_length=255, blank=True, help_text="Path in default_storage")
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    # Lease of the running worker: refreshed as rows are written, so an export
+    # whose worker died is requeued (see export_jobs.requeue_stale)
+    attempts = models.PositiveIntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'export_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['state', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.format} export {self.id} ({self.state})"
+
+    @property
+    def progress(self):
+        """Fraction of rows written, or None while the total is unknown."""
+        if self.state == 'done':
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(1.0, self.rows_written / self.total_rows)
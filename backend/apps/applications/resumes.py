@@ -0,0 +1,84 @@
+"""
+Resume upload validation.
+
+``UploadResumeView`` used to trust the client's ``content_type`` and copy the
+whole upload into a ``ContentFile`` before saving it, a second full copy in
+memory on top of Django's own. Now the uploaded file goes to storage as it
+is: ``FileSystemStorage`` writes it chunk by chunk (or moves the spooled
+temporary file), and ``S3Boto3Storage`` streams it with boto3's managed
+transfer, in multipart parts above ``AWS_S3_MULTIPART_THRESHOLD``
+(see ``AWS_S3_TRANSFER_CONFIG``).
+
+Files up to ``FILE_UPLOAD_MAX_MEMORY_SIZE`` stay in memory while the request
+is parsed; larger ones are spooled to a temporary file. ``SizeLimitUploadHandler``
+stops reading a file as soon as it passes ``RESUME_MAX_UPLOAD_SIZE``, and
+``detect_content_type()`` decides the type from the file's first bytes.
+"""
+import zipfile
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+PDF = 'application/pdf'
+DOC = 'application/msword'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Compound File Binary header of Word 97-2003 documents
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+ZIP_MAGIC = b'PK\x03\x04'
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """
+    Skip the rest of any file larger than ``RESUME_MAX_UPLOAD_SIZE``.
+
+    Goes first in ``request.upload_handlers``; the handlers after it never see
+    the skipped file, and ``too_large`` tells the view what happened.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.too_large = False
+        self.received = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.RESUME_MAX_UPLOAD_SIZE:
+            self.too_large = True
+            raise SkipFile
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def detect_content_type(file):
+    """
+    PDF, DOC or DOCX content type of ``file`` from its contents, or ``None``.
+
+    Leaves the file at its start.
+    """
+    file.seek(0)
+    header = file.read(8)
+    try:
+        if header.startswith(b'%PDF-'):
+            return PDF
+        if header == OLE2_MAGIC:
+            return DOC
+        if header.startswith(ZIP_MAGIC):
+            # Any zip starts like this: only the central directory is read
+            file.seek(0)
+            try:
+                with zipfile.ZipFile(file) as archive:
+                    if 'word/document.xml' in archive.namelist():
+                        return DOCX
+            except zipfile.BadZipFile:
+                pass
+        return None
+    finally:
+        file.seek(0)
@@ -1,8 +1,11 @@
 """
 Application serializers.
 """
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Application
+from apps.jobs.values_serializers import ValuesSerializer, datetime_formatter
+from .exports import EXPORT_FILTERS, available_formats
+from .models import Application, ExportJob
 
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
@@ -33,6 +36,41 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         ]
 
 
+class ApplicationListValuesSerializer(ValuesSerializer):
+    """Fast read path producing the same output as ``ApplicationListSerializer``."""
+    
+    columns = (
+        'id', 'job_id', 'job__title', 'job__company', 'user_id', 'user__username',
+        'name', 'email', 'phone', 'source', 'status', 'submission_status',
+        'applied_at', 'updated_at', 'resume_url',
+    )
+    
+    def serialize(self, rows):
+        datetime = datetime_formatter()
+        return [
+            {
+                'id': application_id,
+                'job': job_id,
+                'job_title': job_title,
+                'job_company': job_company,
+                'user': user_id,
+                'username': username,
+                'name': name,
+                'email': email,
+                'phone': phone,
+                'source': source,
+                'status': status,
+                'submission_status': submission_status,
+                'applied_at': datetime(applied_at),
+                'updated_at': datetime(updated_at),
+                'resume_url': resume_url,
+            }
+            for (application_id, job_id, job_title, job_company, user_id, username,
+                 name, email, phone, source, status, submission_status,
+                 applied_at, updated_at, resume_url) in rows
+        ]
+
+
 class ApplicationDetailSerializer(serializers.ModelSerializer):
     """Serializer for application detail (admin view)."""
     
@@ -64,3 +102,63 @@ class ApplicationConfirmationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['submission_status']
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for background export status (admin view)."""
+
+    progress = serializers.FloatField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'format', 'filters', 'state', 'total_rows', 'rows_written', 'progress',
+            'file_size', 'error', 'created_at', 'started_at', 'finished_at', 'download_url'
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.state != 'done':
+            return None
+        url = reverse('export_job_download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    """Serializer for queueing a background export."""
+
+    format = serializers.ChoiceField(choices=ExportJob.FORMAT_CHOICES, default='csv')
+    job_id = serializers.IntegerField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    source = serializers.ChoiceField(choices=Application.SOURCE_CHOICES, required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
+    submission_status = serializers.ChoiceField(
+        choices=Application.SUBMISSION_STATUS_CHOICES, required=False
+    )
+
+    def validate_format(self, value):
+        if value not in available_formats():
+            raise serializers.ValidationError(f'{value} exports are not available on this server.')
+        return value
+
+    def validate(self, attrs):
+        start, end = attrs.get('start'), attrs.get('end')
+        if start and end and start > end:
+            raise serializers.ValidationError({'end': 'End date must be on or after start date.'})
+        return attrs
+
+    def create(self, validated_data):
+        export_format = validated_data.pop('format')
+        filters = {
+            name: value.isoformat() if hasattr(value, 'isoformat') else value
+            for name, value in validated_data.items()
+            if name in EXPORT_FILTERS
+        }
+        return ExportJob.objects.create(
+            format=export_format,
+            filters=filters,
+            requested_by=self.context['request'].user,
+        )
@@ -0,0 +1,158 @@
+"""
+Applying to a job: one application per student and job, even when the same
+apply arrives twice at once, and ``Idempotency-Key`` replays (see
+apps.applications.idempotency). ``check_apply_concurrency`` fires bigger
+races against a real database.
+"""
+import json
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.applications import clicks
+from apps.applications.models import Application
+from apps.jobs.models import Job
+
+APPLICATION = {'name': 'Test Student', 'email': 'student@example.com', 'phone': '9800000000'}
+
+PARALLEL_APPLIES = 8
+
+
+def make_job(apply_type='in_app'):
+    return Job.objects.create(
+        title='Backend Intern', company='Acme', description='Django and PostgreSQL',
+        apply_type=apply_type, apply_target='https://example.com/apply',
+    )
+
+
+def apply(client, job, body=APPLICATION, key=None):
+    headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+    return client.post(
+        reverse('apply_to_job', kwargs={'pk': job.pk}), json.dumps(body),
+        content_type='application/json', **headers
+    )
+
+
+@pytest.fixture
+def client(api_client, student):
+    api_client.force_authenticate(student)
+    return api_client
+
+
+@pytest.mark.django_db
+def test_apply_creates_one_application(client, student):
+    job = make_job()
+
+    response = apply(client, job)
+
+    assert response.status_code == 201
+    application = Application.objects.get(job=job)
+    assert response.data['application_id'] == application.pk
+    assert (application.user, application.source, application.submission_status) == (student, 'in_app', 'submitted')
+    job.refresh_from_db()
+    assert job.applications_count == 1
+
+
+@pytest.mark.django_db
+def test_duplicate_apply_is_rejected(client):
+    job = make_job()
+    apply(client, job)
+
+    response = apply(client, job)
+
+    assert response.status_code == 400
+    assert Application.objects.filter(job=job).count() == 1
+    job.refresh_from_db()
+    assert job.applications_count == 1
+
+
+@pytest.mark.django_db
+def test_retry_with_same_key_is_replayed(client):
+    job = make_job()
+    key = uuid.uuid4().hex
+    first = apply(client, job, key=key)
+
+    retry = apply(client, job, key=key)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry['Idempotent-Replayed'] == 'true'
+    assert retry.data == first.data
+    assert Application.objects.filter(job=job).count() == 1
+
+
+@pytest.mark.django_db
+def test_key_reused_for_different_body_is_rejected(client):
+    job = make_job()
+    key = uuid.uuid4().hex
+    apply(client, job, key=key)
+
+    response = apply(client, job, body={**APPLICATION, 'cover_letter': 'changed'}, key=key)
+
+    assert response.status_code == 422
+    assert Application.objects.filter(job=job).count() == 1
+
+
+@pytest.mark.django_db
+def test_keys_are_per_user(client, admin):
+    job = make_job()
+    key = uuid.uuid4().hex
+    apply(client, job, key=key)
+    other = APIClient()
+    other.force_authenticate(admin)
+
+    response = apply(other, job, key=key)
+
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response
+    assert Application.objects.filter(job=job).count() == 2
+
+
+def race(student, job, key=None):
+    """Send PARALLEL_APPLIES applies at once, each on its own connection. Returns their responses."""
+    barrier = threading.Barrier(PARALLEL_APPLIES)
+
+    def fire(_):
+        client = APIClient()
+        client.force_authenticate(student)
+        try:
+            barrier.wait()
+            return apply(client, job, key=key)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(PARALLEL_APPLIES) as executor:
+        return list(executor.map(fire, range(PARALLEL_APPLIES)))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('apply_type, key', [
+    ('in_app', None),
+    ('in_app', 'race-key'),
+    ('external', None),
+], ids=['in_app', 'in_app_with_key', 'click'])
+def test_parallel_applies_create_one_row(student, apply_type, key):
+    job = make_job(apply_type)
+
+    responses = race(student, job, key)
+    # Clicks reach the applications table once the buffer is folded
+    clicks.flush_and_fold()
+
+    statuses = Counter(response.status_code for response in responses)
+    assert not any(code >= 500 for code in statuses), statuses
+    assert Application.objects.filter(job=job).count() == 1
+    job.refresh_from_db()
+    assert job.applications_count == 1
+    application_id = Application.objects.get(job=job).pk
+    assert {response.data['application_id'] for response in responses if 'application_id' in response.data} == {
+        application_id
+    }
+    if apply_type == 'in_app' and key is None:
+        assert statuses == {201: 1, 400: PARALLEL_APPLIES - 1}
+    elif key is not None:
+        assert statuses[201] >= 1 and set(statuses) <= {201, 409}
@@ -0,0 +1,83 @@
+"""
+Confirming an external click that may not have reached ``click_events`` yet
+(see apps.applications.clicks.find_application).
+"""
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.applications import clicks
+from apps.applications.models import Application
+from apps.jobs.models import Job
+
+CONFIRMATION = {'submission_status': 'submitted'}
+
+
+@pytest.fixture(autouse=True)
+def click_buffer():
+    clicks.click_buffer._reset()
+    yield clicks.click_buffer
+    clicks.click_buffer._reset()
+
+
+@pytest.fixture
+def job(db):
+    return Job.objects.create(
+        title='Data Analyst', company='Acme', description='SQL and Excel',
+        apply_type='external', apply_target='https://example.com/apply',
+    )
+
+
+@pytest.fixture
+def client(api_client, student):
+    api_client.force_authenticate(student)
+    return api_client
+
+
+def confirm(client, application_id):
+    started = time.monotonic()
+    response = client.post(reverse('application_confirm', kwargs={'pk': application_id}), CONFIRMATION)
+    # Never waits for another process's buffer
+    assert time.monotonic() - started < 1
+    return response
+
+
+@pytest.mark.django_db
+def test_buffered_click_is_folded_and_confirmed(client, job):
+    application_id = client.post(reverse('apply_to_job', kwargs={'pk': job.pk})).data['application_id']
+    assert not Application.objects.filter(pk=application_id).exists()
+
+    response = confirm(client, application_id)
+
+    assert response.status_code == 200
+    assert Application.objects.get(pk=application_id).submission_status == 'submitted'
+
+
+@pytest.mark.django_db
+def test_click_buffered_elsewhere_is_retried_later(client):
+    # Handed out by another process whose buffer hasn't been written yet
+    application_id = clicks.reserve_ids(1)[0]
+
+    response = confirm(client, application_id)
+
+    assert response.status_code == 202
+    assert int(response['Retry-After']) >= 1
+
+
+@pytest.mark.django_db
+def test_another_students_click_is_not_found(client, job, admin):
+    other = APIClient()
+    other.force_authenticate(admin)
+    application_id = other.post(reverse('apply_to_job', kwargs={'pk': job.pk})).data['application_id']
+    clicks.click_buffer.flush(wait=True)
+
+    assert confirm(client, application_id).status_code == 404
+    clicks.flush_and_fold()
+    assert confirm(client, application_id).status_code == 404
+
+
+@pytest.mark.django_db
+def test_unknown_id_is_not_found(client):
+    assert confirm(client, 10 ** 9).status_code == 404
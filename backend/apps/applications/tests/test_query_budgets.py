@@ -0,0 +1,44 @@
+"""
+Query budgets of the admin application lists, at any page size and in both
+pagination modes (see ``query_budget`` on the views).
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.urls import reverse
+
+from apps.applications.views import ApplicationListView, JobApplicationsView
+from apps.jobs.models import Job
+from apps.jobs.pagination import ApplicationPagination
+from benchmarks.utils import make_applications, make_jobs
+
+PAGE_SIZES = (5, 50)
+
+
+@pytest.fixture
+def busiest_job(db):
+    """Applications from distinct students; returns the job with the most."""
+    students = get_user_model().objects.bulk_create([
+        get_user_model()(username=f'applicant-{i}', email=f'applicant-{i}@example.com') for i in range(40)
+    ])
+    make_jobs(5)
+    make_applications(600, list(Job.objects.values_list('pk', flat=True)), [user.pk for user in students])
+    return Job.objects.annotate(received=Count('applications')).order_by('-received').first()
+
+
+@pytest.mark.parametrize('page_size', PAGE_SIZES)
+@pytest.mark.parametrize('params', [{}, {'cursor': ''}, {'search': 'Student'}], ids=['pages', 'cursor', 'search'])
+@pytest.mark.parametrize('view_class, route', [
+    (ApplicationListView, 'application_list'),
+    (JobApplicationsView, 'job_applications'),
+])
+def test_application_list_budget(api_client, admin, busiest_job, monkeypatch, django_assert_max_num_queries,
+                                 view_class, route, params, page_size):
+    monkeypatch.setattr(ApplicationPagination, 'page_size', page_size)
+    kwargs = {'job_id': busiest_job.pk} if route == 'job_applications' else {}
+    api_client.force_authenticate(admin)
+
+    with django_assert_max_num_queries(view_class.query_budget):
+        response = api_client.get(reverse(route, kwargs=kwargs), params)
+    assert response.status_code == 200
+    assert len(response.data['results']) == page_size
@@ -1,21 +1,31 @@
 """
 Applications URL configuration.
 """
+from django.conf import settings
 from django.urls import path
 from .views import (
     ApplicationListView,
     JobApplicationsView,
     ApplicationDetailView,
     ExportApplicationsCSVView,
+    ExportJobListCreateView,
+    ExportJobDetailView,
+    ExportJobDownloadView,
     UploadResumeView,
+    AsyncUploadResumeView,
     ApplicationConfirmationView,
 )
 
+upload_view = AsyncUploadResumeView if settings.ASYNC_VIEWS else UploadResumeView
+
 urlpatterns = [
     path('', ApplicationListView.as_view(), name='application_list'),
     path('job/<int:job_id>/', JobApplicationsView.as_view(), name='job_applications'),
     path('<int:pk>/', ApplicationDetailView.as_view(), name='application_detail'),
     path('<int:pk>/confirm/', ApplicationConfirmationView.as_view(), name='application_confirm'),
     path('export/', ExportApplicationsCSVView.as_view(), name='export_applications'),
-    path('upload/', UploadResumeView.as_view(), name='upload_resume'),
+    path('exports/', ExportJobListCreateView.as_view(), name='export_job_list_create'),
+    path('exports/<uuid:pk>/', ExportJobDetailView.as_view(), name='export_job_detail'),
+    path('exports/<uuid:pk>/download/', ExportJobDownloadView.as_view(), name='export_job_download'),
+    path('upload/', upload_view.as_view(), name='upload_resume'),
 ]
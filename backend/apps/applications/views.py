@@ -1,52 +1,70 @@
 """
 Application views for admin operations.
 """
-import csv
-from django.http import HttpResponse
-from rest_framework import generics, filters
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import generics, filters, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Application
+from . import clicks, export_jobs, exports, resumes
+from .models import Application, ExportJob
 from .serializers import (
     ApplicationListSerializer,
+    ApplicationListValuesSerializer,
     ApplicationDetailSerializer,
     ApplicationStatusUpdateSerializer,
     ApplicationConfirmationSerializer,
+    ExportJobSerializer,
+    ExportJobCreateSerializer,
 )
+from apps.jobs.pagination import ApplicationPagination
 from apps.jobs.permissions import IsAdminUser
+from apps.jobs.query_planning import plan_queryset
+from apps.jobs.values_serializers import ValuesListMixin
+from apps.jobs.rollups import record_submission_status_change
+from config.async_views import AsyncAPIView
 
 
-class ApplicationListView(generics.ListAPIView):
+class ApplicationListView(ValuesListMixin, generics.ListAPIView):
     """List all applications (admin only)."""
     
     permission_classes = [IsAdminUser]
     serializer_class = ApplicationListSerializer
+    values_serializer_class = ApplicationListValuesSerializer
+    pagination_class = ApplicationPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['job', 'source', 'status', 'user']
     search_fields = ['name', 'email', 'job__title', 'job__company']
     ordering_fields = ['applied_at', 'status']
     ordering = ['-applied_at']
+    query_budget = 2
     
     def get_queryset(self):
-        return Application.objects.select_related('job', 'user').all()
+        return plan_queryset(Application.objects.all(), self.serializer_class)
 
 
-class JobApplicationsView(generics.ListAPIView):
+class JobApplicationsView(ValuesListMixin, generics.ListAPIView):
     """List applications for a specific job (admin only)."""
     
     permission_classes = [IsAdminUser]
     serializer_class = ApplicationListSerializer
+    values_serializer_class = ApplicationListValuesSerializer
+    pagination_class = ApplicationPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['source', 'status']
     search_fields = ['name', 'email']
     ordering = ['-applied_at']
+    query_budget = 2
     
     def get_queryset(self):
         job_id = self.kwargs.get('job_id')
-        return Application.objects.filter(job_id=job_id).select_related('job', 'user')
+        return plan_queryset(Application.objects.filter(job_id=job_id), self.serializer_class)
 
 
 class ApplicationDetailView(generics.RetrieveUpdateAPIView):
@@ -62,47 +80,163 @@ class ApplicationDetailView(generics.RetrieveUpdateAPIView):
 
 
 class ExportApplicationsCSVView(APIView):
-    """Export applications to CSV (admin only)."""
+    """
+    Export applications to CSV (admin only).
+
+    The file is streamed as it is generated. Pass ``?compress=gzip`` for a
+    gzipped download.
+    """
     
     permission_classes = [IsAdminUser]
     
     def get(self, request):
         job_id = request.query_params.get('job_id')
+        compress = request.query_params.get('compress') == 'gzip'
         
-        applications = Application.objects.select_related('job', 'user')
-        if job_id:
-            applications = applications.filter(job_id=job_id)
+        chunks = exports.iter_csv(exports.export_queryset(job_id))
+        filename = 'applications.csv'
+        content_type = 'text/csv'
+        if compress:
+            chunks = exports.gzip_chunks(chunks)
+            filename += '.gz'
+            content_type = 'application/gzip'
         
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="applications.csv"'
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ExportJobListCreateView(generics.ListCreateAPIView):
+    """Queue a background export or list recent exports (admin only)."""
+    
+    permission_classes = [IsAdminUser]
+    queryset = ExportJob.objects.all()
+    
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return ExportJobCreateSerializer
+        return ExportJobSerializer
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        export_job = serializer.save()
+        export_jobs.enqueue(export_job)
+        return Response(
+            ExportJobSerializer(export_job, context=self.get_serializer_context()).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class ExportJobDetailView(generics.RetrieveAPIView):
+    """Poll a background export for progress (admin only)."""
+    
+    permission_classes = [IsAdminUser]
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+
+    def get_object(self):
+        export_job = super().get_object()
+        if export_jobs.is_stale(export_job):
+            export_jobs.recover()
+            export_job.refresh_from_db()
+        return export_job
+
+
+class ExportJobDownloadView(APIView):
+    """
+    Download a finished export (admin only).
+    
+    Supports single ``Range: bytes=`` requests so interrupted downloads of
+    large files can resume.
+    """
+    
+    permission_classes = [IsAdminUser]
+    
+    CONTENT_TYPES = {
+        'csv': 'text/csv',
+        'csv.gz': 'application/gzip',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'parquet': 'application/vnd.apache.parquet',
+    }
+    
+    def get(self, request, pk):
+        from django.core.files.storage import default_storage
         
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Job Title', 'Company', 'Applicant Name', 'Email', 'Phone',
-            'Source', 'Status', 'Submission Status', 'Applied At', 'Resume URL'
-        ])
+        try:
+            export_job = ExportJob.objects.get(pk=pk, state='done')
+        except ExportJob.DoesNotExist:
+            return Response({'error': 'Export not found or not finished'}, status=404)
         
-        for app in applications:
-            writer.writerow([
-                app.id,
-                app.job.title,
-                app.job.company,
-                app.name,
-                app.email,
-                app.phone,
-                app.get_source_display(),
-                app.get_status_display(),
-                app.get_submission_status_display(),
-                app.applied_at.strftime('%Y-%m-%d %H:%M'),
-                app.resume_url,
-            ])
+        size = export_job.file_size
+        byte_range = _parse_range(request.headers.get('Range', ''), size)
+        if byte_range == 'unsatisfiable':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
         
+        start, end = byte_range or (0, size - 1)
+        stored = default_storage.open(export_job.file, 'rb')
+        response = StreamingHttpResponse(
+            _read_range(stored, start, end),
+            status=206 if byte_range else 200,
+            content_type=self.CONTENT_TYPES.get(export_job.format, 'application/octet-stream'),
+        )
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = (
+            f'attachment; filename="applications.{export_job.format}"'
+        )
         return response
 
 
+def _parse_range(header, size):
+    """
+    Parse a single ``bytes=`` range into inclusive ``(start, end)``.
+    
+    Returns None to serve the whole file (no or unsupported header), or
+    'unsatisfiable' when the range lies outside the file.
+    """
+    if not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes.
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def _read_range(stored, start, end, chunk_size=64 * 1024):
+    try:
+        stored.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = stored.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        stored.close()
+
+
 class UploadResumeView(APIView):
     """
     Upload a resume file and return its URL.
+    
+    The upload is passed to storage as it is, without another copy in memory,
+    and its type is checked from its contents (see apps.applications.resumes).
     """
     from rest_framework.parsers import MultiPartParser, FormParser
     
@@ -110,26 +244,63 @@ class UploadResumeView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser)
     
+    # PDF/Doc
+    allowed_types = [resumes.PDF, resumes.DOC, resumes.DOCX]
+    
+    # Multipart boundaries, headers and other fields on top of the file itself
+    form_overhead = 64 * 1024
+    
     def post(self, request, *args, **kwargs):
+        from django.core.files.storage import default_storage
+        
+        resume_file, error = self.get_resume(request)
+        if error is not None:
+            return error
+        
+        path = default_storage.save(*self.get_upload(request, resume_file))
+        return self.uploaded(request, resume_file, path)
+    
+    def too_large(self):
+        limit_mb = settings.RESUME_MAX_UPLOAD_SIZE / (1024 * 1024)
+        return Response({'error': f'Resume too large. The limit is {limit_mb:g} MB.'}, status=413)
+    
+    def get_resume(self, request):
+        """Return ``(file, None)``, or ``(None, error response)``."""
+        # Refuse an oversized body before reading it
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > settings.RESUME_MAX_UPLOAD_SIZE + self.form_overhead:
+            return None, self.too_large()
+        
+        # Before request.data parses the body
+        size_limit = resumes.SizeLimitUploadHandler(request._request)
+        request.upload_handlers.insert(0, size_limit)
+        
         if 'resume' not in request.data:
-            return Response({'error': 'No resume file provided'}, status=400)
+            if size_limit.too_large:
+                return None, self.too_large()
+            return None, Response({'error': 'No resume file provided'}, status=400)
             
         resume_file = request.data['resume']
         
-        # Validate file type (PDF/Doc)
-        allowed_types = ['application/pdf', 'application/msword', 
-                        'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
-        if resume_file.content_type not in allowed_types:
-            return Response({'error': 'Invalid file type. Only PDF and Word documents are allowed.'}, status=400)
-            
-        # Save file
-        from django.core.files.storage import default_storage
-        from django.core.files.base import ContentFile
-        import os
-        
+        # Validate file type from its contents, not the client's content type
+        content_type = resumes.detect_content_type(resume_file)
+        if content_type not in self.allowed_types:
+            return None, Response({'error': 'Invalid file type. Only PDF and Word documents are allowed.'}, status=400)
+        # Storage (S3's ContentType) takes it from the file
+        resume_file.content_type = content_type
+        return resume_file, None
+    
+    def get_upload(self, request, resume_file):
+        """Storage name and content to save."""
         # Create a unique filename
         filename = f"resumes/{request.user.id}_{resume_file.name}"
-        path = default_storage.save(filename, ContentFile(resume_file.read()))
+        return filename, resume_file
+    
+    def uploaded(self, request, resume_file, path):
+        from django.core.files.storage import default_storage
         
         # Get URL
         # If using stats/media locally, we need the full URL
@@ -142,6 +313,27 @@ class UploadResumeView(APIView):
         })
 
 
+class AsyncUploadResumeView(AsyncAPIView, UploadResumeView):
+    """``UploadResumeView`` for ASGI (``ASYNC_VIEWS``)."""
+    
+    async def post(self, request, *args, **kwargs):
+        from django.core.files.storage import default_storage
+        
+        # Parsing the multipart body (spooling large files to disk) and
+        # sniffing the content type block too; no ORM, so off the event loop
+        # on a worker thread like the save
+        resume_file, error = await sync_to_async(self.get_resume, thread_sensitive=False)(request)
+        if error is not None:
+            return error
+        
+        # Storage backends (S3, the file system) block: save on a worker
+        # thread, not the request's own thread, which the ORM may need meanwhile
+        path = await sync_to_async(default_storage.save, thread_sensitive=False)(
+            *self.get_upload(request, resume_file)
+        )
+        return self.uploaded(request, resume_file, path)
+
+
 class ApplicationConfirmationView(APIView):
     """Confirm external application submission status."""
 
@@ -151,11 +343,23 @@ class ApplicationConfirmationView(APIView):
         try:
             application = Application.objects.get(pk=pk, user=request.user)
         except Application.DoesNotExist:
-            return Response({'error': 'Application not found'}, status=404)
+            # A click may still be buffered or waiting to be folded
+            application = clicks.find_application(pk, request.user)
+            if application is None:
+                if clicks.may_be_buffered(pk):
+                    # Another worker's buffer writes it within its flush interval
+                    return Response(
+                        {'status': 'pending', 'message': 'Click not recorded yet, retry shortly'},
+                        status=status.HTTP_202_ACCEPTED,
+                        headers={'Retry-After': str(math.ceil(clicks.click_buffer.flush_interval))},
+                    )
+                return Response({'error': 'Application not found'}, status=404)
 
+        previous_status = application.submission_status
         serializer = ApplicationConfirmationSerializer(application, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        record_submission_status_change(application, previous_status)
 
         return Response({
             'status': 'updated',
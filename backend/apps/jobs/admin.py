@@ -2,7 +2,7 @@
 Job admin configuration.
 """
 from django.contrib import admin
-from .models import Job
+from .models import Job, JobDailyStats
 
 
 @admin.register(Job)
@@ -17,7 +17,7 @@ class JobAdmin(admin.ModelAdmin):
     search_fields = ['title', 'company', 'description', 'skills_required']
     date_hierarchy = 'posted_at'
     ordering = ['-posted_at']
-    readonly_fields = ['posted_at', 'updated_at', 'views_count', 'push_sent']
+    readonly_fields = ['posted_at', 'updated_at', 'views_count', 'applications_count', 'push_sent']
     
     fieldsets = (
         ('Basic Info', {
@@ -34,11 +34,26 @@ class JobAdmin(admin.ModelAdmin):
             'fields': ('active', 'featured', 'deadline', 'push_on_create', 'push_sent')
         }),
         ('Metadata', {
-            'fields': ('posted_by', 'posted_at', 'updated_at', 'views_count'),
+            'fields': ('posted_by', 'posted_at', 'updated_at', 'views_count', 'applications_count'),
             'classes': ('collapse',)
         }),
     )
-    
-    def applications_count(self, obj):
-        return obj.applications.count()
-    applications_count.short_description = 'Applications'
+
+
+@admin.register(JobDailyStats)
+class JobDailyStatsAdmin(admin.ModelAdmin):
+    """Read-only view of the daily job activity rollup."""
+
+    list_display = [
+        'date', 'job', 'views', 'external_clicks', 'mailto_clicks',
+        'in_app_applications', 'submitted', 'abandoned'
+    ]
+    list_filter = ['date', 'job__company']
+    date_hierarchy = 'date'
+    raw_id_fields = ['job']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
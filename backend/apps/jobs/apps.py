@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_triggers(sender, using, **kwargs):
+    from . import search
+
+    search.install_triggers(using)
+
+
+class JobsConfig(AppConfig):
+    name = 'apps.jobs'
+
+    def ready(self):
+        # A later migration that rebuilds jobs on SQLite drops the search triggers
+        post_migrate.connect(install_search_triggers, sender=self)
@@ -0,0 +1,37 @@
+"""
+In-process hit/miss counters for the job response caches.
+
+Counters are per worker process and reset on restart; they are meant for
+spot checks through ``/api/jobs/cache-stats/``, not long-term monitoring.
+"""
+import threading
+
+
+class CacheStats:
+    """Thread-safe named counters with a ``hits / (hits + misses)`` ratio."""
+
+    def __init__(self, *names):
+        self._names = ('hits', 'misses') + names
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self._names, 0)
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = round(counts['hits'] / lookups, 4) if lookups else None
+        return counts
+
+
+# Feed: hits/misses of the response cache, plus 304s served from it
+feed_stats = CacheStats('not_modified')
+# Detail: hits are 304s answered without serializing, misses full responses
+detail_stats = CacheStats()
@@ -0,0 +1,146 @@
+"""
+Write-behind view counter for jobs.
+
+Views are summed in process and written as one ``F()`` update per distinct
+increment, instead of a read-modify-write ``save()`` per page view. Pending
+counts are only discarded once the flush transaction commits, and are merged
+back if it fails, so a retry never counts a view twice.
+
+The buffer is written every ``JOB_VIEW_FLUSH_INTERVAL`` seconds, by a timer
+when no further view comes, or after ``JOB_VIEW_FLUSH_THRESHOLD`` views. A
+worker that is killed loses at most that much. On Vercel, where an instance
+is frozen after each response, the threshold defaults to 1: views are
+written through.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class JobViewCounter:
+    """Buffers job view increments and flushes them in bulk."""
+
+    def __init__(self, flush_interval=None, flush_threshold=None):
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()
+        self._pending_total = 0
+        self._timer = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'JOB_VIEW_FLUSH_INTERVAL', 10.0)
+
+    @property
+    def flush_threshold(self):
+        if self._flush_threshold is not None:
+            return self._flush_threshold
+        return getattr(settings, 'JOB_VIEW_FLUSH_THRESHOLD', 500)
+
+    def record(self, job_id, count=1):
+        """Count ``count`` views of a job, flushing if the buffer is due."""
+        with self._lock:
+            self._pending[job_id] += count
+            self._pending_total += count
+            due = (
+                self._pending_total >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if not due and self._timer is None:
+                # Flush quiet periods too, so views don't wait for the next one
+                self._timer = threading.Timer(self.flush_interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def pending(self, job_id):
+        """Return views recorded for a job in this process but not yet flushed."""
+        with self._lock:
+            return self._pending.get(job_id, 0)
+
+    def flush(self, wait=False):
+        """
+        Write all pending views to the database. Returns the number of views
+        written. Unless ``wait`` is set, returns 0 straight away if another
+        thread is already flushing.
+        """
+        if not self._flush_lock.acquire(blocking=wait):
+            return 0
+        try:
+            with self._lock:
+                batch = self._pending
+                self._pending = Counter()
+                self._pending_total = 0
+                self._last_flush = time.monotonic()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not batch:
+                return 0
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {sum(batch.values())} job views: {e}")
+                with self._lock:
+                    self._pending.update(batch)
+                    self._pending_total += sum(batch.values())
+                return 0
+            return sum(batch.values())
+        finally:
+            self._flush_lock.release()
+
+    def _flush_in_thread(self):
+        close_old_connections()
+        try:
+            self.flush(wait=True)
+        except Exception:
+            logger.exception('Job view counter flush failed')
+        finally:
+            close_old_connections()
+
+    def _write(self, batch):
+        from .models import Job
+        from .rollups import record_job_activity
+
+        # Jobs sharing an increment are updated in one statement.
+        by_increment = defaultdict(list)
+        for job_id, count in batch.items():
+            by_increment[count].append(job_id)
+
+        with transaction.atomic():
+            for count, job_ids in by_increment.items():
+                Job.objects.filter(pk__in=job_ids).update(views_count=F('views_count') + count)
+            # Skip jobs deleted since they were viewed; their rollup row can't exist.
+            existing = set(Job.objects.filter(pk__in=list(batch)).values_list('pk', flat=True))
+            for job_id, count in batch.items():
+                if job_id in existing:
+                    record_job_activity(job_id, views=count)
+
+
+job_view_counter = JobViewCounter()
+
+# Don't inherit a parent's buffer across fork (e.g. gunicorn --preload), and
+# write out whatever is left when the worker shuts down.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=job_view_counter._reset)
+atexit.register(job_view_counter.flush)
@@ -0,0 +1,142 @@
+"""
+Versioned response cache for the student job feed.
+
+Every non-admin sees the same feed for the same query string, so
+``JobListCreateView`` caches the rendered JSON page under a key built from the
+normalized query parameters and the current feed *version*. Saving or
+deleting a job, and creating or deleting an application (which changes
+``applications_count``), bump the version after commit; entries for older
+versions are never read again and simply expire.
+
+Each entry carries a hash of its content used as the response ``ETag``, so
+clients sending ``If-None-Match`` get a 304 without a body.
+
+Invalidation only works if every worker reads the same cache, so the feed
+is never cached on a per-process backend (locmem) unless
+``JOB_FEED_CACHE_ALLOW_LOCAL`` says there is only one process.
+
+With read replicas, a page rendered right after an invalidation could come
+from a replica that hasn't replayed the write yet and stay cached for the
+whole TTL. For ``REPLICA_PIN_SECONDS`` after an invalidation, misses are
+therefore rendered from the primary.
+"""
+import hashlib
+import logging
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from config.db import routing as db_routing
+
+from .cache_stats import feed_stats
+
+CACHE_ALIAS = 'job_feed'
+VERSION_KEY = 'job_feed:version'
+INVALIDATED_KEY = 'job_feed:invalidated'
+
+logger = logging.getLogger(__name__)
+_warned_per_process = False
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def is_shared():
+    """Whether every worker process sees the same cache entries."""
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def is_enabled():
+    global _warned_per_process
+    if getattr(settings, 'JOB_FEED_CACHE_TTL', 300) <= 0:
+        return False
+    if is_shared() or getattr(settings, 'JOB_FEED_CACHE_ALLOW_LOCAL', False):
+        return True
+    if not _warned_per_process:
+        _warned_per_process = True
+        logger.warning(
+            'Job feed cache disabled: the job_feed cache is per process. Set CACHE_URL '
+            '(or JOB_FEED_CACHE_URL) to a shared backend, or JOB_FEED_CACHE_ALLOW_LOCAL=True '
+            'for a single process.'
+        )
+    return False
+
+
+def current_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Never expires on its own; a lost version key just starts a new
+        # generation that can't collide with the old one.
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """Start a new feed version, orphaning every cached page."""
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, timeout=None)
+    if db_routing.replicas_enabled():
+        cache.set(INVALIDATED_KEY, True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def recently_invalidated():
+    """True while replicas may not have caught up with the last invalidation."""
+    return db_routing.replicas_enabled() and get_cache().get(INVALIDATED_KEY, False)
+
+
+def normalize_params(query_params):
+    """
+    Query parameters as a canonical query string, sorted. Blank values stay:
+    a bare ``?cursor=`` switches the feed to keyset pagination.
+    """
+    items = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+    )
+    return urlencode(items)
+
+
+def cache_key(request, version):
+    # Host and scheme are part of the key because pagination links are
+    # absolute; the media type because e.g. ``; indent=4`` changes the body.
+    raw = (
+        f'{request.accepted_media_type} {request.scheme}://{request.get_host()}'
+        f'{request.path}?{normalize_params(request.query_params)}'
+    )
+    return f'job_feed:v{version}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def make_etag(content):
+    return '"%s"' % hashlib.md5(content).hexdigest()
+
+
+def lookup(request):
+    """Return ``(key, entry)``; ``entry`` is None on a miss."""
+    key = cache_key(request, current_version())
+    entry = get_cache().get(key)
+    feed_stats.incr('hits' if entry is not None else 'misses')
+    return key, entry
+
+
+def store(key, content, content_type):
+    """Cache a rendered page. Returns the entry."""
+    entry = {'etag': make_etag(content), 'content': content, 'content_type': content_type}
+    get_cache().set(key, entry, timeout=settings.JOB_FEED_CACHE_TTL)
+    return entry
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,291 @@
+"""
+Benchmark the main API endpoints on a seeded dataset (see benchmarks.seed).
+
+Both phases send requests through Django's WSGI handler, in this process:
+
+1. Endpoints: sequential requests per endpoint, measuring latency, queries
+   and response size.
+2. Load: for each --concurrency level, threads send --requests requests
+   drawn from a weighted mix of the endpoints (LOAD_MIX).
+
+The results are JSON (also written to --output) and record the commit,
+database and settings they were measured with. Compare two runs with
+check_bench_regressions. The dataset is seeded on first use and kept. Apply
+requests go to jobs created for the run, which are deleted afterwards.
+
+    python manage.py bench_api --scale 100k --concurrency 1 8 32 --output head.json
+"""
+import itertools
+import json
+import math
+import platform
+import random
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications import clicks
+from apps.applications.models import ClickEvent
+from apps.jobs.models import Job
+from benchmarks import seed
+from benchmarks.client import WSGIClient
+from benchmarks.utils import counting_queries, summarize
+
+# Share of load-test requests per endpoint; the full export is only timed on its own
+LOAD_MIX = {
+    'jobs_list': 30,
+    'jobs_search': 10,
+    'job_detail': 30,
+    'apply_click': 15,
+    'apply_in_app': 5,
+    'applications_list': 10,
+    'applications_export': 0,
+}
+
+SEARCH_TERMS = ('python', 'data analyst', 'react native', 'java developer', 'intern', 'aws cloud')
+
+APPLICATION_FORM = {'name': 'Load Student', 'email': 'load-student@example.com', 'phone': '9700000000'}
+
+# Settings that change what is measured, recorded with the results
+REPORTED_SETTINGS = (
+    'DEBUG', 'DB_CONN_MODE', 'DATABASE_REPLICAS', 'JSON_BACKEND', 'FAST_READ_SERIALIZERS',
+    'JOB_FEED_CACHE_TTL', 'CLICK_BUFFER_ENABLED',
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, queries and throughput of the main API endpoints on a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=seed.SCALES, default='10k')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--endpoints', nargs='+', choices=LOAD_MIX, default=list(LOAD_MIX))
+        parser.add_argument('--repeat', type=int, default=30, help='Sequential requests per endpoint')
+        parser.add_argument('--export-repeat', type=int, default=3, help='Sequential full exports')
+        parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 8], help='Load levels (none to skip)')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per load level')
+        parser.add_argument('--students', type=int, default=500, help='Students sending requests')
+        parser.add_argument('--feed-cache', action='store_true', help='Keep the job feed cache on')
+        parser.add_argument('--output', help='Also write the JSON results to this file')
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        if seed.dataset_counts() is None:
+            self.stderr.write(f'Seeding the {scale} dataset (kept for later runs)...')
+            seed.seed(scale, seed=options['seed'], log=self.stderr.write)
+        elif seed.current_scale() != scale:
+            raise CommandError(
+                f'The seeded dataset is not {scale} ({seed.dataset_counts()}); '
+                f'run seed_load_data --scale {scale} --clear'
+            )
+        if settings.DEBUG:
+            self.stderr.write('DEBUG is on: queries are logged in memory, which inflates latencies.')
+
+        # The load threads share this process, so a locmem feed cache is shared too
+        overrides = {'JOB_FEED_CACHE_ALLOW_LOCAL': True} if options['feed_cache'] else {'JOB_FEED_CACHE_TTL': 0}
+        with override_settings(**overrides):
+            self.setup(options)
+            try:
+                results = {
+                    'meta': self.metadata(options),
+                    'endpoints': self.bench_endpoints(options),
+                    'load': [self.bench_load(level, options) for level in options['concurrency']],
+                }
+            finally:
+                self.teardown()
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fp:
+                fp.write(output + '\n')
+        self.stdout.write(output)
+
+    # Setup
+
+    def setup(self, options):
+        self.client = WSGIClient()
+        self.rng_lock = threading.Lock()
+        admin = seed.get_admin()
+        self.admin_headers = self.auth(admin)
+        self.student_headers = [
+            self.auth(student) for student in seed.students().order_by('pk')[:options['students']]
+        ]
+        self.job_ids = list(
+            Job.objects.filter(posted_by=admin, active=True).order_by('pk').values_list('pk', flat=True)
+        )
+
+        # Apply targets: one external job everyone clicks (as after a push), and
+        # enough in-app jobs for every request to be a new (job, student) pair
+        def run_job(apply_type, title):
+            return Job.objects.create(
+                title=title, company='Load Test', description='Created by bench_api',
+                apply_type=apply_type, apply_target='https://example.com/apply',
+            )
+
+        self.run_jobs = [run_job('external', 'Load Test Click Target')]
+        self.click_job = self.run_jobs[0].pk
+        in_app_requests = options['repeat'] + 2 + options['requests'] * len(options['concurrency'])
+        in_app_jobs = [
+            run_job('in_app', f'Load Test Form Target {i}')
+            for i in range(math.ceil(in_app_requests / len(self.student_headers)))
+        ]
+        self.run_jobs += in_app_jobs
+        self.in_app_pairs = itertools.product([job.pk for job in in_app_jobs], range(len(self.student_headers)))
+        self.check_search()
+
+    def check_search(self):
+        """Every search term finds jobs: an empty or stale index answers fast and would pass unnoticed."""
+        for term in SEARCH_TERMS:
+            response = self.client.get(
+                reverse('job_list_create'), query_string=urlencode({'search': term}), headers=self.student_headers[0]
+            )
+            if response.status_code != 200 or not json.loads(response.content)['results']:
+                raise CommandError(
+                    f'Searching jobs for {term!r} found nothing ({response.status_code}). '
+                    'If the search index is stale, run rebuild_job_search_index.'
+                )
+
+    def teardown(self):
+        clicks.flush_and_fold()
+        run_job_ids = [job.pk for job in self.run_jobs]
+        ClickEvent.objects.filter(job_id__in=run_job_ids).delete()
+        Job.objects.filter(pk__in=run_job_ids).delete()
+
+    def auth(self, user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def metadata(self, options):
+        def git(*args):
+            try:
+                return subprocess.run(
+                    ['git', *args], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+                ).stdout.strip()
+            except (OSError, subprocess.CalledProcessError):
+                return None
+
+        status = git('status', '--porcelain', '--untracked-files=no')
+        return {
+            'commit': git('rev-parse', 'HEAD'),
+            'dirty': bool(status) if status is not None else None,
+            'measured_at': datetime.now(dt_timezone.utc).isoformat(timespec='seconds'),
+            'scale': options['scale'],
+            'dataset': seed.dataset_counts(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'settings': {name: getattr(settings, name, None) for name in REPORTED_SETTINGS},
+            'options': {
+                name: options[name] for name in ('repeat', 'export_repeat', 'requests', 'students', 'seed')
+            },
+        }
+
+    # Requests
+
+    def send(self, endpoint, rng):
+        """Send one request to ``endpoint``. Returns the response."""
+        student = self.student_headers[rng.randrange(len(self.student_headers))]
+        if endpoint == 'jobs_list':
+            return self.client.get(reverse('job_list_create'), headers=student)
+        if endpoint == 'jobs_search':
+            return self.client.get(
+                reverse('job_list_create'), query_string=urlencode({'search': rng.choice(SEARCH_TERMS)}), headers=student
+            )
+        if endpoint == 'job_detail':
+            return self.client.get(reverse('job_detail', kwargs={'pk': rng.choice(self.job_ids)}), headers=student)
+        if endpoint == 'apply_click':
+            return self.client.post(reverse('apply_to_job', kwargs={'pk': self.click_job}), b'{}', headers=student)
+        if endpoint == 'apply_in_app':
+            with self.rng_lock:
+                job_id, index = next(self.in_app_pairs)
+            return self.client.post(
+                reverse('apply_to_job', kwargs={'pk': job_id}),
+                json.dumps(APPLICATION_FORM).encode(),
+                headers=self.student_headers[index],
+            )
+        if endpoint == 'applications_list':
+            return self.client.get(reverse('application_list'), headers=self.admin_headers)
+        if endpoint == 'applications_export':
+            return self.client.get(reverse('export_applications'), headers=self.admin_headers)
+        raise ValueError(f'Unknown endpoint: {endpoint}')
+
+    # Phases
+
+    def bench_endpoints(self, options):
+        results = {}
+        for endpoint in options['endpoints']:
+            rng = random.Random(options['seed'])
+            repeat = options['export_repeat'] if endpoint == 'applications_export' else options['repeat']
+            for _ in range(2):
+                self.send(endpoint, rng)
+
+            samples, queries, sizes, statuses = [], [], [], Counter()
+            for _ in range(repeat):
+                with counting_queries() as counter:
+                    start = time.perf_counter()
+                    response = self.send(endpoint, rng)
+                    samples.append((time.perf_counter() - start) * 1000)
+                queries.append(counter['queries'])
+                sizes.append(len(response.content))
+                statuses[response.status_code] += 1
+
+            results[endpoint] = {
+                'latency': summarize(samples),
+                'queries': {'mean': round(sum(queries) / len(queries), 2), 'max': max(queries)},
+                'bytes': round(sum(sizes) / len(sizes)),
+                'statuses': {str(code): count for code, count in sorted(statuses.items())},
+            }
+            self.stderr.write(f"{endpoint}: p50 {results[endpoint]['latency']['p50_ms']} ms")
+        return results
+
+    def bench_load(self, concurrency, options):
+        endpoints = [endpoint for endpoint in options['endpoints'] if LOAD_MIX[endpoint]]
+        weights = [LOAD_MIX[endpoint] for endpoint in endpoints]
+        per_thread = [options['requests'] // concurrency] * concurrency
+        for i in range(options['requests'] % concurrency):
+            per_thread[i] += 1
+
+        def worker(index, count):
+            rng = random.Random(options['seed'] * 1000 + index)
+            samples = []
+            for endpoint in rng.choices(endpoints, weights, k=count):
+                start = time.perf_counter()
+                response = self.send(endpoint, rng)
+                samples.append((endpoint, (time.perf_counter() - start) * 1000, response.status_code))
+            return samples
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            # Open each thread's connection before measuring
+            list(executor.map(lambda index: self.send('jobs_list', random.Random(index)), range(concurrency)))
+            started = time.perf_counter()
+            samples = [
+                sample for chunk in executor.map(worker, range(concurrency), per_thread) for sample in chunk
+            ]
+            elapsed = time.perf_counter() - started
+
+        by_endpoint = defaultdict(list)
+        errors = Counter()
+        for endpoint, ms, status in samples:
+            by_endpoint[endpoint].append(ms)
+            if status >= 400:
+                errors[f'{endpoint} {status}'] += 1
+        self.stderr.write(f'concurrency {concurrency}: {len(samples) / elapsed:.1f} req/s')
+        return {
+            'concurrency': concurrency,
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'latency': summarize([ms for _, ms, _ in samples]),
+            'endpoints': {endpoint: summarize(by_endpoint[endpoint]) for endpoint in endpoints},
+            'errors': dict(errors),
+        }
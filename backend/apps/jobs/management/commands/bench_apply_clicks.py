@@ -0,0 +1,84 @@
+"""
+Benchmark external apply clicks: saving an application per click in the
+request vs. the click buffer (bulk-inserted log, folded in the background).
+Each click is a different student, as when a pushed job is opened by many.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.applications import clicks
+from apps.applications.models import Application
+from apps.jobs.models import Job
+from apps.jobs.views import ApplyToJobView
+from benchmarks.utils import counting_queries, make_jobs, rolled_back, summarize
+
+
+class Command(BaseCommand):
+    help = 'Compare per-click cost of direct application inserts and the click buffer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clicks', type=int, default=1000, help='Clicks (students) per mode')
+
+    def handle(self, *args, **options):
+        if not clicks.is_enabled():
+            self.stderr.write('The click buffer needs PostgreSQL or SQLite')
+            return
+        count = options['clicks']
+        view = ApplyToJobView.as_view()
+        factory = APIRequestFactory()
+        results = {'clicks': count, 'vendor': connection.vendor}
+
+        with rolled_back():
+            make_jobs(1)
+            job = Job.objects.latest('id')
+            Job.objects.filter(pk=job.pk).update(apply_type='external', active=True)
+            User = get_user_model()
+            User.objects.bulk_create([
+                User(username=f'bench-click-{i}', email=f'bench-click-{i}@example.com')
+                for i in range(count * 2)
+            ])
+            students = list(User.objects.filter(username__startswith='bench-click-').order_by('pk'))
+
+            def click(student):
+                request = factory.post(f'/api/jobs/{job.pk}/apply/', {}, format='json', HTTP_HOST='localhost')
+                force_authenticate(request, user=student)
+                return view(request, pk=job.pk)
+
+            def run(students):
+                samples = []
+                with counting_queries() as counter:
+                    for student in students:
+                        start = time.perf_counter()
+                        click(student)
+                        samples.append((time.perf_counter() - start) * 1000)
+                return {**summarize(samples), 'queries_per_click': round(counter['queries'] / len(students), 2)}
+
+            with override_settings(CLICK_BUFFER_ENABLED=False):
+                results['direct'] = run(students[:count])
+
+            # Flush on the size threshold only, and fold here rather than on the worker
+            with override_settings(CLICK_FLUSH_INTERVAL=3600, CLICKS_FOLD_IN_PROCESS=False):
+                results['buffered'] = run(students[count:])
+                start = time.perf_counter()
+                with counting_queries() as counter:
+                    folded = clicks.flush_and_fold()
+                elapsed = (time.perf_counter() - start) * 1000
+                results['fold'] = {
+                    'events': folded,
+                    'total_ms': round(elapsed, 3),
+                    'ms_per_click': round(elapsed / max(folded, 1), 4),
+                    'queries': counter['queries'],
+                }
+
+            job.refresh_from_db()
+            results['applications'] = Application.objects.filter(job=job).count()
+            results['applications_count'] = job.applications_count
+
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,60 @@
+"""
+Benchmark job detail responses: full serialization vs. 304 revalidation.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.jobs.cache_stats import detail_stats
+from apps.jobs.counters import job_view_counter
+from apps.jobs.models import Job
+from apps.jobs.views import JobDetailView
+from benchmarks.utils import make_jobs, rolled_back, summarize, time_call
+
+
+class Command(BaseCommand):
+    help = 'Compare full and conditional (304) job detail responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--description-kb', type=int, default=20, help='Size of the job description')
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        view = JobDetailView.as_view()
+        factory = APIRequestFactory()
+
+        with rolled_back():
+            make_jobs(1)
+            job = Job.objects.latest('id')
+            Job.objects.filter(pk=job.pk).update(description='x' * options['description_kb'] * 1024)
+            student = get_user_model().objects.create(username='bench-detail', email='bench-detail@example.com')
+
+            def fetch(**headers):
+                request = factory.get(f'/api/jobs/{job.pk}/', HTTP_HOST='localhost', **headers)
+                force_authenticate(request, user=student)
+                response = view(request, pk=job.pk)
+                if hasattr(response, 'render'):
+                    response.render()
+                return response
+
+            detail_stats.reset()
+            first = fetch()
+            results = {
+                'full': summarize(time_call(fetch, repeat=options['repeat'])),
+                'if_none_match': summarize(time_call(
+                    lambda: fetch(HTTP_IF_NONE_MATCH=first['ETag']), repeat=options['repeat']
+                )),
+                'if_modified_since': summarize(time_call(
+                    lambda: fetch(HTTP_IF_MODIFIED_SINCE=first['Last-Modified']), repeat=options['repeat']
+                )),
+                'full_bytes': len(first.content),
+                'stats': detail_stats.snapshot(),
+            }
+            # 304s still count as views
+            job_view_counter.flush()
+            results['views_recorded'] = Job.objects.get(pk=job.pk).views_count
+
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,60 @@
+"""
+Benchmark the student job feed with and without the response cache.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.jobs import feed_cache
+from apps.jobs.cache_stats import feed_stats
+from apps.jobs.views import JobListCreateView
+from benchmarks.utils import make_jobs, rolled_back, summarize, time_call
+
+
+class Command(BaseCommand):
+    help = 'Compare uncached, cached and 304 responses for the job feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=20_000)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        view = JobListCreateView.as_view()
+        factory = APIRequestFactory()
+
+        # One process: a locmem feed cache is as good as a shared one here
+        with rolled_back(), override_settings(JOB_FEED_CACHE_ALLOW_LOCAL=True):
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            make_jobs(options['jobs'])
+            student = get_user_model().objects.create(username='bench-feed', email='bench-feed@example.com')
+
+            def fetch(params, **headers):
+                request = factory.get('/api/jobs/', params, HTTP_HOST='localhost', **headers)
+                force_authenticate(request, user=student)
+                return view(request)
+
+            cases = {
+                'page_1': {'page': 1},
+                'filtered': {'job_type': 'internship', 'page': 1},
+                'search': {'search': 'python developer'},
+            }
+            results = {}
+            for name, params in cases.items():
+                with override_settings(JOB_FEED_CACHE_TTL=0):
+                    uncached = time_call(lambda: fetch(params), repeat=options['repeat'])
+                feed_cache.invalidate()
+                etag = fetch(params)['ETag']
+                cached = time_call(lambda: fetch(params), repeat=options['repeat'])
+                not_modified = time_call(lambda: fetch(params, HTTP_IF_NONE_MATCH=etag), repeat=options['repeat'])
+                results[name] = {
+                    'uncached': summarize(uncached),
+                    'cached': summarize(cached),
+                    'not_modified': summarize(not_modified),
+                }
+            results['cache_stats'] = feed_stats.snapshot()
+
+        self.stdout.write(json.dumps(results, indent=2))
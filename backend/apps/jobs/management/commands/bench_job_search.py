@@ -0,0 +1,75 @@
+"""
+Benchmark job feed search: legacy icontains scan vs. the full-text index.
+Both must find the same jobs before anything is timed: an empty index is fast too.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from apps.jobs import search
+from apps.jobs.models import Job
+from benchmarks.utils import make_jobs, rolled_back, summarize, time_call
+
+QUERIES = ['python', 'data analyst', 'react native', 'senior backend engineer', 'pune intern']
+
+
+class Command(BaseCommand):
+    help = 'Measure p50/p95 search latency over synthetic jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            make_jobs(options['jobs'])
+
+            if search.get_search_backend() is None:
+                raise CommandError('No job search index on this database. Run migrations first.')
+
+            results = {}
+            for query in QUERIES:
+                hits = {'icontains': self.icontains(query).count(), 'fulltext': self.fulltext(query).count()}
+                if hits['icontains'] != hits['fulltext']:
+                    raise CommandError(
+                        f'Full-text and icontains search disagree on {query!r}: {hits}. '
+                        'If the index is stale, run rebuild_job_search_index.'
+                    )
+                results[query] = {
+                    'hits': hits,
+                    'icontains': summarize(time_call(
+                        lambda: self.icontains_page(query, options['page_size']),
+                        repeat=options['repeat'],
+                    )),
+                    'fulltext': summarize(time_call(
+                        lambda: self.fulltext_page(query, options['page_size']),
+                        repeat=options['repeat'],
+                    )),
+                }
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def icontains(self, query):
+        queryset = Job.objects.filter(active=True)
+        for term in query.split():
+            condition = Q()
+            for field in search.SEARCH_COLUMNS:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def icontains_page(self, query, page_size):
+        return list(self.icontains(query).order_by('-posted_at')[:page_size])
+
+    def fulltext(self, query):
+        request = Request(APIRequestFactory().get('/api/jobs/', {'search': query}))
+        return search.JobSearchFilter().filter_queryset(request, Job.objects.filter(active=True), view=None)
+
+    def fulltext_page(self, query, page_size):
+        return list(self.fulltext(query)[:page_size])
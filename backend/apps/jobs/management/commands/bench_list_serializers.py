@@ -0,0 +1,132 @@
+"""
+Benchmark the values() read path against the ModelSerializers it replaces,
+for the job feed and the application list, and check both render the same
+JSON bytes. All synthetic rows are rolled back when the command finishes.
+"""
+import json
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.applications.models import Application
+from apps.applications.serializers import ApplicationListSerializer, ApplicationListValuesSerializer
+from apps.applications.views import ApplicationListView
+from apps.jobs.models import Job
+from apps.jobs.query_planning import plan_queryset
+from apps.jobs.serializers import JobListSerializer, JobListValuesSerializer
+from apps.jobs.views import JobListCreateView
+from benchmarks.utils import make_applications, make_jobs, rolled_back, summarize, time_call
+
+# (model, ModelSerializer, ValuesSerializer, list view, ordering)
+CASES = {
+    'job_list': (Job, JobListSerializer, JobListValuesSerializer, JobListCreateView, ('-posted_at', '-id')),
+    'application_list': (
+        Application, ApplicationListSerializer, ApplicationListValuesSerializer,
+        ApplicationListView, ('-applied_at', '-id'),
+    ),
+}
+
+# Query strings compared through the views with the fast path on and off
+VIEW_QUERIES = [
+    {}, {'page': 2}, {'cursor': ''}, {'count': 'approximate'},
+    {'ordering': 'deadline'}, {'search': 'python'}, {'job_type': 'internship'},
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare ModelSerializer and values() serialization of list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[20, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        largest = max(options['page_sizes'])
+
+        with rolled_back(), override_settings(JOB_FEED_CACHE_TTL=0):
+            admin = self.seed(largest, options['seed'])
+            self.check_views(admin)
+
+            results = []
+            for name, (model, model_serializer, values_serializer, _, ordering) in CASES.items():
+                queryset = model.objects.order_by(*ordering)
+                for page_size in options['page_sizes']:
+                    def slow():
+                        rows = list(plan_queryset(queryset, model_serializer)[:page_size])
+                        return renderer.render(model_serializer(rows, many=True).data)
+
+                    def fast():
+                        serializer = values_serializer()
+                        rows = list(serializer.prepare(queryset)[:page_size])
+                        return renderer.render(serializer.serialize(rows))
+
+                    if slow() != fast():
+                        raise CommandError(f'{name}: values() output differs at page size {page_size}')
+
+                    slow_ms = summarize(time_call(slow, repeat=options['repeat']))
+                    fast_ms = summarize(time_call(fast, repeat=options['repeat']))
+                    results.append({
+                        'endpoint': name,
+                        'page_size': page_size,
+                        'model_serializer': slow_ms,
+                        'values_serializer': fast_ms,
+                        'us_per_row': {
+                            'model_serializer': round(slow_ms['p50_ms'] * 1000 / page_size, 2),
+                            'values_serializer': round(fast_ms['p50_ms'] * 1000 / page_size, 2),
+                        },
+                        'speedup': round(slow_ms['p50_ms'] / fast_ms['p50_ms'], 2) if fast_ms['p50_ms'] else None,
+                    })
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def seed(self, count, seed):
+        rng = random.Random(seed)
+        User = get_user_model()
+        admin = User.objects.create(username='bench-values-admin', email='bench-values@example.com', role='admin')
+        posters = User.objects.bulk_create([
+            User(username=f'bench-values-{i}', email=f'bench-values-{i}@example.com',
+                 first_name=rng.choice(['', 'Asha', 'Rahul']), last_name=rng.choice(['', 'Patil']))
+            for i in range(20)
+        ])
+
+        make_jobs(count, seed=seed)
+        now = timezone.now()
+        for job_id in Job.objects.values_list('pk', flat=True):
+            # Cover every salary_range / posted_by_name / deadline branch
+            salary_min = rng.choice([None, Decimal('300000.00'), Decimal('450000.50')])
+            salary_max = rng.choice([None, Decimal('600000.00')])
+            Job.objects.filter(pk=job_id).update(
+                salary_min=salary_min,
+                salary_max=salary_max,
+                deadline=rng.choice([None, now + timedelta(days=rng.randint(1, 60))]),
+                posted_by=rng.choice(posters + [None]),
+            )
+        job_ids = list(Job.objects.values_list('pk', flat=True))
+        make_applications(count, job_ids, [poster.pk for poster in posters] + [None], seed=seed)
+        return admin
+
+    def check_views(self, admin):
+        """Fail if any list endpoint renders differently with the fast path on."""
+        factory = APIRequestFactory()
+        for name, (_, _, _, view_class, _) in CASES.items():
+            view = view_class.as_view()
+            for params in VIEW_QUERIES:
+                bodies = []
+                for fast in (False, True):
+                    with override_settings(FAST_READ_SERIALIZERS=fast):
+                        request = factory.get('/', params, HTTP_HOST='localhost')
+                        force_authenticate(request, user=admin)
+                        response = view(request)
+                        response.render()
+                        bodies.append(response.content)
+                if bodies[0] != bodies[1]:
+                    raise CommandError(f'{name} {params}: values() response differs from the serializer')
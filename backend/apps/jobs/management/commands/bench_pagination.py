@@ -0,0 +1,64 @@
+"""
+Benchmark page-number vs. keyset pagination on the job feed.
+All synthetic rows are rolled back when the command finishes.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.jobs.models import Job
+from apps.jobs.pagination import JobFeedPagination
+from benchmarks.utils import make_jobs, rolled_back, summarize, time_call
+
+
+class Command(BaseCommand):
+    help = 'Compare page 1 and a deep page for page-number and keyset pagination'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=20_000)
+        parser.add_argument('--deep-page', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        deep_page = options['deep_page']
+        page_size = JobFeedPagination().page_size
+        needed = deep_page * page_size
+        if options['jobs'] < needed:
+            options['jobs'] = int(needed / 0.9) + page_size
+
+        with rolled_back():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            make_jobs(options['jobs'])
+
+            deep_cursor = self.cursor_for_page(deep_page, page_size)
+            cases = {
+                'page_number_page_1': {'page': 1},
+                f'page_number_page_{deep_page}': {'page': deep_page},
+                'page_number_page_1_approximate_count': {'page': 1, 'count': 'approximate'},
+                'keyset_page_1': {'cursor': ''},
+                f'keyset_page_{deep_page}': {'cursor': deep_cursor},
+                'keyset_page_1_approximate_count': {'cursor': '', 'count': 'approximate'},
+            }
+            results = {
+                name: summarize(time_call(lambda: self.fetch_page(params), repeat=options['repeat']))
+                for name, params in cases.items()
+            }
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def feed_queryset(self):
+        return Job.objects.filter(active=True)
+
+    def fetch_page(self, params):
+        request = Request(APIRequestFactory().get('/api/jobs/', params, HTTP_HOST='localhost'))
+        paginator = JobFeedPagination()
+        page = paginator.paginate_queryset(self.feed_queryset().order_by('-posted_at'), request)
+        return paginator.get_paginated_response([job.id for job in page])
+
+    def cursor_for_page(self, page, page_size):
+        last_row = self.feed_queryset().order_by(
+            *JobFeedPagination.keyset_ordering
+        )[(page - 1) * page_size - 1]
+        return JobFeedPagination().encode_cursor(last_row)
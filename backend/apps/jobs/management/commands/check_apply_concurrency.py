@@ -0,0 +1,130 @@
+"""
+Fire many parallel applies at the same job and check that exactly one row
+is created, with and without an Idempotency-Key.
+
+Each request runs on its own thread and database connection, released
+together by a barrier, so the duplicate checks really race. The command
+commits its own users and jobs and deletes them afterwards. Run it against
+PostgreSQL to exercise row locking under real concurrency; on SQLite writes
+are serialized by the database lock.
+"""
+import json
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications import clicks
+from apps.applications.models import Application
+from apps.jobs.models import Job
+
+APPLICATION = {'name': 'Race Applicant', 'email': 'race@example.com', 'phone': '9800000000'}
+
+
+class Command(BaseCommand):
+    help = 'Check that parallel applies to one job create exactly one application'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+
+    def handle(self, *args, **options):
+        self.failures = []
+        User = get_user_model()
+        user = User.objects.create(username=f'race-{uuid.uuid4().hex[:8]}', email='race-student@example.com')
+        self.authorization = f'Bearer {AccessToken.for_user(user)}'
+        jobs = []
+        try:
+            for label, apply_type, key in (
+                ('in_app', 'in_app', None),
+                ('click', 'external', None),
+                ('in_app + Idempotency-Key', 'in_app', uuid.uuid4().hex),
+            ):
+                job = Job.objects.create(
+                    title=f'Race {label}', company='Bench', description='Concurrency check',
+                    apply_type=apply_type, apply_target='https://example.com/apply',
+                )
+                jobs.append(job)
+                self.race(label, job, key, options['requests'])
+
+            # A retry after the race replays the stored response
+            job, key = jobs[-1], self.last_key
+            response = self.apply(job, key)
+            self.expect(
+                'retry with the same key is replayed',
+                response.status_code == 201 and response.get('Idempotent-Replayed') == 'true',
+                response.status_code,
+            )
+            response = self.apply(job, key, body={**APPLICATION, 'cover_letter': 'changed'})
+            self.expect('key reused for a different body is rejected', response.status_code == 422, response.status_code)
+        finally:
+            for job in jobs:
+                job.delete()
+            user.delete()
+
+        if self.failures:
+            raise CommandError('Concurrency checks failed:\n' + '\n'.join(self.failures))
+        self.stdout.write(self.style.SUCCESS('Exactly one application per race'))
+
+    def race(self, label, job, key, count):
+        self.last_key = key
+        barrier = threading.Barrier(count)
+
+        def fire(_):
+            try:
+                barrier.wait()
+                response = self.apply(job, key)
+                return response.status_code, response.json().get('application_id')
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(count) as executor:
+            results = list(executor.map(fire, range(count)))
+
+        statuses = Counter(status for status, _ in results)
+        application_ids = {application_id for _, application_id in results if application_id}
+        # Clicks reach the applications table once the buffer is folded
+        clicks.flush_and_fold()
+        rows = Application.objects.filter(job=job).count()
+        job.refresh_from_db(fields=['applications_count'])
+        self.stdout.write(json.dumps({
+            'race': label,
+            'requests': count,
+            'statuses': dict(statuses),
+            'rows': rows,
+            'applications_count': job.applications_count,
+        }))
+
+        self.expect(f'{label}: one row', rows == 1, rows)
+        self.expect(f'{label}: applications_count is 1', job.applications_count == 1, job.applications_count)
+        self.expect(f'{label}: no server errors', not any(status >= 500 for status in statuses), dict(statuses))
+        self.expect(f'{label}: every success names the same application', len(application_ids) == 1, application_ids)
+        self.expect(
+            f'{label}: the application has that id',
+            Application.objects.filter(job=job).values_list('pk', flat=True).first() in application_ids,
+            application_ids,
+        )
+        if job.apply_type == 'in_app' and key is None:
+            self.expect(f'{label}: one 201, duplicates 400', statuses[201] == 1 and statuses[400] == count - 1, dict(statuses))
+        elif key is not None:
+            self.expect(f'{label}: only 201 or 409 (in progress)', set(statuses) <= {201, 409}, dict(statuses))
+
+    def apply(self, job, key=None, body=APPLICATION):
+        headers = {'HTTP_AUTHORIZATION': self.authorization}
+        if key:
+            headers['HTTP_IDEMPOTENCY_KEY'] = key
+        client = Client(HTTP_HOST='localhost')
+        return client.post(
+            reverse('apply_to_job', kwargs={'pk': job.pk}), json.dumps(body),
+            content_type='application/json', **headers
+        )
+
+    def expect(self, name, passed, detail):
+        if not passed:
+            self.failures.append(f'{name}: {detail}')
@@ -0,0 +1,79 @@
+"""
+Compare two bench_api result files and fail on regressions.
+
+An endpoint regresses when its p50 or p95 latency grows by more than
+--threshold (and by at least --min-ms), or when it runs more queries per
+request than --query-tolerance allows. A load level regresses when its
+throughput drops by more than --threshold. Compare runs on the same scale,
+database and machine; differences in those are reported first.
+
+    python manage.py check_bench_regressions base.json head.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+LATENCY_METRICS = ('p50_ms', 'p95_ms')
+
+
+class Command(BaseCommand):
+    help = 'Diff two bench_api result files and fail if the second regressed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('base', help='Results of the baseline (e.g. the main branch)')
+        parser.add_argument('head', help='Results to check')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown (0.2 = 20%%)')
+        parser.add_argument('--min-ms', type=float, default=1.0, help='Ignore latency changes smaller than this')
+        parser.add_argument('--query-tolerance', type=float, default=0.5, help='Allowed extra queries per request')
+
+    def handle(self, *args, **options):
+        base, head = self.load(options['base']), self.load(options['head'])
+        for key in ('scale', 'database', 'settings'):
+            if base['meta'].get(key) != head['meta'].get(key):
+                self.stdout.write(self.style.WARNING(
+                    f"{key} differs: {base['meta'].get(key)} vs {head['meta'].get(key)}"
+                ))
+
+        self.regressions = []
+        threshold = options['threshold']
+        for endpoint, before in base['endpoints'].items():
+            after = head['endpoints'].get(endpoint)
+            if after is None:
+                continue
+            for metric in LATENCY_METRICS:
+                old, new = before['latency'][metric], after['latency'][metric]
+                regressed = new > old * (1 + threshold) and new - old >= options['min_ms']
+                self.report(f'{endpoint} {metric}', old, new, regressed)
+            old, new = before['queries']['mean'], after['queries']['mean']
+            self.report(f'{endpoint} queries', old, new, new > old + options['query_tolerance'])
+
+        head_load = {level['concurrency']: level for level in head.get('load', [])}
+        for before in base.get('load', []):
+            after = head_load.get(before['concurrency'])
+            if after is None:
+                continue
+            old, new = before['throughput_rps'], after['throughput_rps']
+            self.report(f"load x{before['concurrency']} req/s", old, new, new < old * (1 - threshold))
+            if after['errors']:
+                self.report(f"load x{before['concurrency']} errors", sum(before['errors'].values()),
+                            sum(after['errors'].values()), True)
+
+        if self.regressions:
+            raise CommandError(f"{len(self.regressions)} regression(s): {', '.join(self.regressions)}")
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def load(self, path):
+        try:
+            with open(path) as fp:
+                return json.load(fp)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+    def report(self, name, old, new, regressed):
+        change = f'{(new - old) / old:+.1%}' if old else 'n/a'
+        line = f'{name:<40} {old:>10} -> {new:<10} {change}'
+        if regressed:
+            self.regressions.append(name)
+            self.stdout.write(self.style.ERROR(f'{line}  REGRESSION'))
+        else:
+            self.stdout.write(line)
@@ -0,0 +1,110 @@
+"""
+Management command that fails when a list endpoint exceeds its query budget.
+
+Every URL whose view declares ``query_budget`` is requested at several page
+sizes against seeded data (rolled back afterwards). The command exits
+non-zero if any request runs more queries than the budget, or if the query
+count changes with the page size, which is how an N+1 shows up. The pytest
+budget tests (apps/*/tests/test_query_budgets.py) run in CI; this command
+checks the same budgets against more data.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.jobs.models import Job
+from benchmarks.utils import make_applications, make_jobs, rolled_back
+
+
+def _budgeted_routes(patterns=None, prefix=''):
+    """Yield ``(route, pattern, view_class)`` for URL patterns whose view declares a query budget."""
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _budgeted_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if getattr(view_class, 'query_budget', None) is not None:
+                yield prefix + str(pattern.pattern), pattern, view_class
+
+
+class Command(BaseCommand):
+    help = 'Check that list endpoints stay within their declared query budget at any page size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[5, 20, 100])
+        parser.add_argument('--jobs', type=int, default=300)
+        parser.add_argument('--applications', type=int, default=1000)
+        parser.add_argument('--verbose-sql', action='store_true', help='Print the queries of failing requests')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        results = []
+        failures = []
+
+        # Measure the database, not the response cache
+        with rolled_back(), override_settings(JOB_FEED_CACHE_TTL=0):
+            User = get_user_model()
+            admin = User.objects.create(username='bench-budget-admin', email='bench-budget@example.com', role='admin')
+            student = User.objects.create(username='bench-budget-student', email='bench-budget-student@example.com')
+            # Distinct posters and applicants so per-row lookups can't hide behind one cached user
+            posters = User.objects.bulk_create([
+                User(username=f'bench-budget-{i}', email=f'bench-budget-{i}@example.com', first_name=f'Poster {i}')
+                for i in range(50)
+            ])
+            make_jobs(options['jobs'])
+            job_ids = list(Job.objects.values_list('pk', flat=True))
+            for i, job_id in enumerate(job_ids):
+                Job.objects.filter(pk=job_id).update(posted_by=posters[i % len(posters)])
+            make_applications(options['applications'], job_ids, [user.pk for user in posters])
+            busiest_job = (
+                Job.objects.annotate(received=Count('applications'))
+                .order_by('-received').values_list('pk', flat=True).first()
+            )
+
+            for route, pattern, view_class in _budgeted_routes():
+                kwargs = {name: busiest_job for name in pattern.pattern.converters}
+                path = reverse(pattern.name, kwargs=kwargs)
+                for user in (student, admin):
+                    counts = {}
+                    for page_size in options['page_sizes']:
+                        pagination = view_class.pagination_class
+                        view = view_class.as_view(
+                            pagination_class=type(pagination.__name__, (pagination,), {'page_size': page_size})
+                        )
+                        request = factory.get(path, HTTP_HOST='localhost')
+                        force_authenticate(request, user=user)
+                        with CaptureQueriesContext(connection) as queries:
+                            response = view(request, **kwargs)
+                        if response.status_code == 403:
+                            break
+                        counts[page_size] = len(queries)
+                        if len(queries) > view_class.query_budget:
+                            failures.append(
+                                f'{view_class.__name__} ({user.username}, page size {page_size}): '
+                                f'{len(queries)} queries, budget {view_class.query_budget}'
+                            )
+                            if options['verbose_sql']:
+                                for query in queries.captured_queries:
+                                    self.stderr.write(query['sql'])
+                    if not counts:
+                        continue
+                    if len(set(counts.values())) > 1:
+                        failures.append(f'{view_class.__name__} ({user.username}): query count grows with page size {counts}')
+                    results.append({
+                        'view': view_class.__name__,
+                        'route': '/' + route,
+                        'user': 'admin' if user.is_admin else 'student',
+                        'budget': view_class.query_budget,
+                        'queries_by_page_size': counts,
+                    })
+
+        self.stdout.write(json.dumps(results, indent=2))
+        if failures:
+            raise CommandError('Query budget exceeded:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} endpoint checks within budget'))
@@ -0,0 +1,178 @@
+"""
+Check read-replica routing against a primary and a replica SQLite file.
+
+The command creates two throwaway databases, migrates the primary and runs
+the checks in a subprocess configured with ``DATABASE_REPLICA_URLS``.
+Replication is simulated by copying the primary over the replica (SQLite's
+backup API), so the replica lags behind until the next copy. The checks
+assert which database served each request, that a client reads its own
+writes right after applying, and that other clients and the export keep
+reading from the (stale) replica.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications import clicks
+from apps.jobs import feed_cache
+from apps.jobs.models import Job
+from config.db import routing as db_routing
+
+REPLICA = 'replica_0'
+PIN_SECONDS = 2
+
+
+class Command(BaseCommand):
+    help = 'Check read-replica routing and read-your-writes pinning on two SQLite files'
+
+    def add_arguments(self, parser):
+        # Internal: run the checks in this (replica-configured) process
+        parser.add_argument('--run', action='store_true', help='(internal)')
+
+    def handle(self, *args, **options):
+        if options['run']:
+            self.run_checks()
+            return
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'DATABASE_URL': f'sqlite:///{directory}/primary.sqlite3',
+                'DATABASE_REPLICA_URLS': f'sqlite:///{directory}/replica.sqlite3',
+                'REPLICA_PIN_SECONDS': str(PIN_SECONDS),
+                'CACHE_URL': 'locmem://default',
+                'JOB_FEED_CACHE_URL': 'locmem://job_feed',
+                'JOB_FEED_CACHE_ALLOW_LOCAL': 'True',
+                'ALLOWED_HOSTS': 'localhost',
+            }
+            manage = [sys.executable, str(settings.BASE_DIR / 'manage.py')]
+            subprocess.run(manage + ['migrate', '--noinput', '-v', '0'], env=env, check=True)
+            if subprocess.run(manage + ['check_replica_routing', '--run'], env=env).returncode != 0:
+                raise CommandError('Replica routing checks failed')
+
+    def run_checks(self):
+        if settings.DATABASE_REPLICAS != [REPLICA]:
+            raise CommandError(f'Expected exactly one replica, {REPLICA}')
+        self.failures = 0
+        self.tokens = {}
+
+        User = get_user_model()
+        admin = User.objects.create(username='replica-admin', email='replica-admin@example.com', role='admin')
+        applicant = User.objects.create(username='replica-applicant', email='replica-applicant@example.com')
+        reader = User.objects.create(username='replica-reader', email='replica-reader@example.com')
+        job = Job.objects.create(
+            title='Replica Routing Engineer', company='Bench', description='Routing checks',
+            apply_type='external', apply_target='https://example.com/apply',
+        )
+        self.replicate()
+
+        status, body, served_by = self.request(reader, 'get', reverse('job_list_create'))
+        self.expect('feed is read from the replica', status == 200 and served_by == REPLICA, served_by)
+
+        status, body, served_by = self.request(applicant, 'post', reverse('apply_to_job', kwargs={'pk': job.pk}))
+        self.expect('apply writes to the primary', status == 200 and served_by == 'default', served_by)
+        application_id = body.get('application_id')
+        clicks.flush_and_fold()
+
+        detail = reverse('job_detail', kwargs={'pk': job.pk})
+        status, body, served_by = self.request(applicant, 'get', detail)
+        self.expect(
+            'applicant reads its own write from the primary',
+            served_by == 'default' and body.get('applications_count') == 1, (served_by, body.get('applications_count')),
+        )
+
+        status, body, served_by = self.request(reader, 'get', detail)
+        self.expect(
+            'other clients read the lagging replica',
+            served_by == REPLICA and body.get('applications_count') == 0, (served_by, body.get('applications_count')),
+        )
+
+        status, body, served_by = self.request(reader, 'get', reverse('job_list_create'))
+        counts = [row['applications_count'] for row in body.get('results', [])]
+        self.expect(
+            'feed rendered after an invalidation comes from the primary',
+            served_by in ('default', 'both') and counts == [1], (served_by, counts),
+        )
+
+        applications = reverse('application_list')
+        status, body, served_by = self.request(admin, 'get', applications)
+        ids = [row['id'] for row in body.get('results', [])]
+        self.expect('admin list is read from the stale replica', served_by == REPLICA and ids == [], (served_by, ids))
+
+        self.replicate()
+        status, body, served_by = self.request(admin, 'get', applications)
+        ids = [row['id'] for row in body.get('results', [])]
+        self.expect(
+            'admin list sees the application once replicated',
+            served_by == REPLICA and ids == [application_id], (served_by, ids),
+        )
+
+        status, content, served_by = self.request(admin, 'get', reverse('export_applications'))
+        self.expect(
+            'streamed CSV export is read from the replica',
+            status == 200 and served_by == REPLICA and b'replica-applicant@example.com' in content, served_by,
+        )
+
+        time.sleep(PIN_SECONDS + 0.5)
+        status, body, served_by = self.request(applicant, 'get', detail)
+        self.expect('pin expires and the applicant reads the replica again', served_by == REPLICA, served_by)
+
+        with db_routing.replica_reads(REPLICA):
+            outside = router.db_for_read(Job)
+            with transaction.atomic():
+                inside = router.db_for_read(Job)
+        self.expect('reads inside a transaction use the primary', (outside, inside) == (REPLICA, 'default'), (outside, inside))
+        self.expect('reads outside a request use the primary', router.db_for_read(Job) == 'default', router.db_for_read(Job))
+        self.expect('writes always use the primary', router.db_for_write(Job) == 'default', router.db_for_write(Job))
+
+        if self.failures:
+            raise CommandError(f'{self.failures} replica routing checks failed')
+        self.stdout.write(self.style.SUCCESS('All replica routing checks passed'))
+
+    def replicate(self):
+        """Bring the replica up to date by copying the primary over it."""
+        connections[REPLICA].close()
+        source = sqlite3.connect(connections['default'].settings_dict['NAME'])
+        target = sqlite3.connect(connections[REPLICA].settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        # The replica has every write now, so the feed may be cached from it again
+        feed_cache.get_cache().delete(feed_cache.INVALIDATED_KEY)
+
+    def request(self, user, method, path):
+        """Return ``(status, body, served_by)``; ``served_by`` names the database(s) queried."""
+        # One token per user: pins are keyed by the client's credentials
+        token = self.tokens.setdefault(user.pk, str(AccessToken.for_user(user)))
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(client, method)(path)
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+        served_by = {
+            (True, False): 'default', (False, True): REPLICA, (True, True): 'both', (False, False): 'none',
+        }[(len(primary) > 0, len(replica) > 0)]
+        if response.get('Content-Type', '').startswith('application/json'):
+            content = response.json()
+        return response.status_code, content, served_by
+
+    def expect(self, name, passed, detail):
+        if passed:
+            self.stdout.write(f'  ok    {name}')
+        else:
+            self.failures += 1
+            self.stdout.write(self.style.ERROR(f'  FAIL  {name}: {detail}'))
@@ -0,0 +1,25 @@
+"""
+Management command to rebuild the job full-text search index.
+Triggers keep the index current; this is for repairs and bulk loads.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        backend = search.get_search_backend(options['database'])
+        if backend is None:
+            raise CommandError('No job search index on this database. Run migrations first.')
+
+        missing = search.install_triggers(options['database'])
+        if missing:
+            self.stdout.write(f"Recreated missing triggers: {', '.join(missing)}")
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {backend.vendor} job search index'))
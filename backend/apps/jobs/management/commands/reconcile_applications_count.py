@@ -0,0 +1,39 @@
+"""
+Management command to repair drift in Job.applications_count.
+The counter is kept in step on insert/delete; bulk writes that bypass
+Application.save() (raw SQL, bulk_create) can leave it behind.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from apps.jobs import feed_cache
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recount applications per job and fix jobs whose stored count has drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        drifted = (
+            Job.objects.annotate(actual_count=Count('applications'))
+            .filter(~Q(applications_count=F('actual_count')))
+            .values_list('id', 'applications_count', 'actual_count')
+        )
+
+        fixed = 0
+        for job_id, stored, actual in drifted:
+            self.stdout.write(f'Job {job_id}: stored {stored}, actual {actual}')
+            if not options['dry_run']:
+                Job.objects.filter(pk=job_id).update(applications_count=actual)
+            fixed += 1
+
+        if fixed and not options['dry_run']:
+            feed_cache.invalidate()
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{fixed} job(s) drifted (dry run, nothing changed)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled {fixed} job(s)'))
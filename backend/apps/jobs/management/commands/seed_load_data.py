@@ -0,0 +1,34 @@
+"""
+Management command to create (or remove) the committed load-test dataset
+used by bench_api. Point DATABASE_URL at a scratch database.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import seed
+
+
+class Command(BaseCommand):
+    help = 'Seed users, jobs and applications for load tests (10k, 100k or 1m applications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=seed.SCALES, default='10k')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help='Delete the existing dataset first')
+        parser.add_argument('--clear-only', action='store_true', help='Delete the dataset and exit')
+
+    def handle(self, *args, **options):
+        if options['clear'] or options['clear_only']:
+            seed.clear()
+            self.stdout.write('Cleared the load dataset')
+            if options['clear_only']:
+                return
+
+        existing = seed.dataset_counts()
+        if existing is not None:
+            if seed.current_scale() == options['scale']:
+                self.stdout.write(f"The {options['scale']} dataset is already seeded: {existing}")
+                return
+            raise CommandError(f'Another load dataset exists ({existing}); pass --clear to replace it')
+
+        seed.seed(options['scale'], seed=options['seed'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"Seeded the {options['scale']} dataset: {seed.dataset_counts()}"))
@@ -0,0 +1,108 @@
+from django.db import migrations
+
+
+# Frozen copy of apps.jobs.search.postgres_vector_sql(): migrations don't
+# import app code, which may change after they're written
+def postgres_vector_sql(row):
+    weights = {'title': 'A', 'company': 'A', 'skills_required': 'B', 'description': 'C'}
+    return ' || '.join(
+        f"setweight(to_tsvector('english', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in weights.items()
+    )
+
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {postgres_vector_sql('NEW')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER jobs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, company, description, skills_required ON jobs
+    FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """,
+    f"UPDATE jobs SET search_vector = {postgres_vector_sql('jobs')}",
+    "CREATE INDEX IF NOT EXISTS jobs_search_vector_gin ON jobs USING gin(search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs",
+    "DROP FUNCTION IF EXISTS jobs_search_vector_update()",
+    "DROP INDEX IF EXISTS jobs_search_vector_gin",
+    "ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, skills_required, description,
+        content='jobs', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    # Column weights mirror the PostgreSQL A/A/B/C setweight() ranking.
+    "INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', 'bm25(10.0, 10.0, 4.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+        VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+        VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+    AFTER UPDATE OF title, company, skills_required, description ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+        VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+        VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+    END
+    """,
+    "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS jobs_fts_insert",
+    "DROP TRIGGER IF EXISTS jobs_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_fts_update",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        if schema_editor.connection.vendor == 'sqlite' and not _sqlite_has_fts5(schema_editor):
+            statements = []
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+def _sqlite_has_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_job_type_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
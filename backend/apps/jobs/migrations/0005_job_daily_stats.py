@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('external_clicks', models.PositiveIntegerField(default=0)),
+                ('mailto_clicks', models.PositiveIntegerField(default=0)),
+                ('in_app_applications', models.PositiveIntegerField(default=0)),
+                ('submitted', models.PositiveIntegerField(default=0)),
+                ('abandoned', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'db_table': 'job_daily_stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='job_daily_s_date_714607_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobdailystats',
+            constraint=models.UniqueConstraint(fields=('job', 'date'), name='unique_job_daily_stats'),
+        ),
+    ]
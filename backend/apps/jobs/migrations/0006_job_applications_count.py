@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("applications", "Application")
+    counts = (
+        Application.objects.filter(job=OuterRef("pk"))
+        .order_by()
+        .values("job")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Job.objects.update(applications_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_job_daily_stats"),
+        ("applications", "0004_add_submission_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="applications_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# SQLite drops a table's triggers when a migration rebuilds it, as 0006's
+# AddField did to jobs: recreate the FTS5 triggers from 0004 and reindex the
+# rows written without them. PostgreSQL keeps its trigger through ALTER TABLE.
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+        VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+        VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+    AFTER UPDATE OF title, company, skills_required, description ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+        VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+        VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+    END
+    """,
+    "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+]
+
+
+def restore_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if 'jobs_fts' not in connection.introspection.table_names(cursor):
+            # SQLite built without FTS5: 0004 created nothing
+            return
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_job_applications_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+    ]
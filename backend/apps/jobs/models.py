@@ -1,7 +1,9 @@
 """
 Job model for placement assistance.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
 
 
@@ -58,6 +60,8 @@ class Job(models.Model):
     
     # Analytics
     views_count = models.PositiveIntegerField(default=0)
+    # Maintained by Application.save() and the post_delete handler in applications.models
+    applications_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         db_table = 'jobs'
@@ -74,15 +78,61 @@ class Job(models.Model):
     @property
     def salary_range(self):
         """Return formatted salary range."""
-        if self.salary_min and self.salary_max:
-            return f"₹{self.salary_min:,.0f} - ₹{self.salary_max:,.0f}"
-        elif self.salary_min:
-            return f"₹{self.salary_min:,.0f}+"
-        elif self.salary_max:
-            return f"Up to ₹{self.salary_max:,.0f}"
-        return "Not disclosed"
-    
-    @property
-    def applications_count(self):
-        """Return total applications for this job."""
-        return self.applications.count()
+        return format_salary_range(self.salary_min, self.salary_max)
+
+
+def format_salary_range(salary_min, salary_max):
+    """Format a salary range for display, e.g. "₹300,000 - ₹500,000"."""
+    if salary_min and salary_max:
+        return f"₹{salary_min:,.0f} - ₹{salary_max:,.0f}"
+    elif salary_min:
+        return f"₹{salary_min:,.0f}+"
+    elif salary_max:
+        return f"Up to ₹{salary_max:,.0f}"
+    return "Not disclosed"
+
+
+class JobDailyStats(models.Model):
+    """Per-job, per-day activity rollup, updated incrementally as events happen."""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+
+    views = models.PositiveIntegerField(default=0)
+    external_clicks = models.PositiveIntegerField(default=0)
+    mailto_clicks = models.PositiveIntegerField(default=0)
+    in_app_applications = models.PositiveIntegerField(default=0)
+    submitted = models.PositiveIntegerField(default=0)
+    abandoned = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'job_daily_stats'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'date'], name='unique_job_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} on {self.date}"
+
+
+def _invalidate_job_feed():
+    from . import feed_cache
+    transaction.on_commit(feed_cache.invalidate)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def _job_changed(sender, **kwargs):
+    _invalidate_job_feed()
+
+
+@receiver(post_save, sender='applications.Application')
+@receiver(post_delete, sender='applications.Application')
+def _application_changed(sender, created=True, **kwargs):
+    # Only inserts and deletes change Job.applications_count in the feed
+    if created:
+        _invalidate_job_feed()
@@ -0,0 +1,194 @@
+"""
+Pagination for job and application listings.
+
+Page-number pagination stays the default. Passing ``?cursor=`` (empty for the
+first page) switches a request to keyset pagination, which seeks past the last
+row seen instead of using ``OFFSET`` and skips ``COUNT(*)`` unless asked for.
+``?count=approximate`` returns a planner estimate instead of an exact count in
+either mode.
+
+Cursor mode always sorts by the paginator's ``keyset_ordering``. A request
+ordered any other way (``?ordering=status``, search relevance) gets a 400
+rather than a page silently sorted differently from what it asked for.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Capped COUNT used for approximate counts on databases without planner estimates.
+APPROXIMATE_COUNT_CAP = 10_000
+
+
+def approximate_count(queryset):
+    """
+    Cheap row count estimate for a queryset.
+
+    PostgreSQL reads the planner's row estimate from ``EXPLAIN``. Other
+    databases count at most ``APPROXIMATE_COUNT_CAP`` rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset.order_by()[:APPROXIMATE_COUNT_CAP].count()
+
+
+class ApproximateCountPaginator(Paginator):
+    """Django paginator that uses ``approximate_count`` for its total."""
+
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Subclasses set ``keyset_ordering`` to the indexed sort order; it must end
+    with a unique column (``id``) so cursors are stable when timestamps tie.
+    """
+
+    keyset_ordering = ('-id',)
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        self.count_mode = request.query_params.get(self.count_query_param, '')
+
+        if not self.cursor_mode:
+            if self.count_mode == 'approximate':
+                self.django_paginator_class = ApproximateCountPaginator
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.check_ordering(queryset)
+
+        self.total = None
+        if self.count_mode == 'approximate':
+            self.total = approximate_count(queryset)
+        elif self.count_mode == 'exact':
+            self.total = queryset.count()
+
+        queryset = queryset.order_by(*self.keyset_ordering)
+        self.model = queryset.model
+        position = self.decode_cursor(request.query_params[self.cursor_query_param], queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        payload = OrderedDict()
+        if self.total is not None:
+            payload['count'] = self.total
+        payload['next'] = self.get_next_cursor_link()
+        payload['previous'] = None
+        payload['results'] = data
+        return Response(payload)
+
+    def check_ordering(self, queryset):
+        """Reject orderings other than a prefix of ``keyset_ordering``."""
+        ordering = list(queryset.query.order_by)
+        if ordering != list(self.keyset_ordering[:len(ordering)]):
+            raise ValidationError({
+                self.cursor_query_param: (
+                    f"Cursor pagination is ordered by {', '.join(self.keyset_ordering)}; "
+                    f"omit {self.cursor_query_param} to use another ordering or relevance."
+                )
+            })
+
+    # Cursor encoding
+
+    def get_next_cursor_link(self):
+        if not self.has_next:
+            return None
+        last = self.page_rows[-1]
+        cursor = self.encode_cursor(last, self.model)
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def encode_cursor(self, instance, model=None):
+        # ``instance`` may also be a named values_list() row of ``model``
+        opts = (model or instance)._meta
+        values = []
+        for field_name in self.keyset_fields:
+            field = opts.get_field(field_name)
+            values.append(field.value_to_string(instance))
+        raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, encoded, model):
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if len(values) != len(self.keyset_fields):
+                raise ValueError
+            return [
+                model._meta.get_field(field_name).to_python(value)
+                for field_name, value in zip(self.keyset_fields, values)
+            ]
+        except Exception:
+            raise NotFound('Invalid cursor.')
+
+    @property
+    def keyset_fields(self):
+        return [ordering.lstrip('-') for ordering in self.keyset_ordering]
+
+    def seek_filter(self, position):
+        """
+        Build the lexicographic "after this row" condition, e.g. for
+        ``('-posted_at', '-id')``: ``posted_at < p OR (posted_at = p AND id < i)``.
+        """
+        condition = Q()
+        for index, ordering in enumerate(self.keyset_ordering):
+            field_name = ordering.lstrip('-')
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            step = Q(**{f'{field_name}__{lookup}': position[index]})
+            for previous_name, previous_value in zip(self.keyset_fields[:index], position[:index]):
+                step &= Q(**{previous_name: previous_value})
+            condition |= step
+        return condition
+
+
+class JobFeedPagination(KeysetPagination):
+    """Job feed pagination keyed on the ``(active, -posted_at)`` index."""
+
+    keyset_ordering = ('-posted_at', '-id')
+
+
+class ApplicationPagination(KeysetPagination):
+    """
+    Application pagination keyed on the ``(-applied_at, -id)`` index, or
+    ``(job, -applied_at)`` for one job's applications.
+    """
+
+    keyset_ordering = ('-applied_at', '-id')
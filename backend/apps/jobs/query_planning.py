@@ -0,0 +1,69 @@
+"""
+Prefetch planning for read serializers.
+
+``plan_queryset(queryset, SerializerClass)`` adds the ``select_related`` and
+``prefetch_related`` calls a serializer needs so that serializing a page costs
+a fixed number of queries, however many rows it has. Relations are found
+from dotted field sources (``source='job.title'``) and from an optional
+``Meta.select_related`` / ``Meta.prefetch_related`` declaration for
+relations only touched in ``SerializerMethodField`` methods.
+
+List views also declare a ``query_budget``: the most queries one GET may
+run. The ``test_query_budgets`` tests enforce it, and ``manage.py
+check_query_budgets`` checks it against more data.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+
+
+def _relation_path(model, source):
+    """
+    Split a dotted source into a ``select_related`` path (forward FK and
+    one-to-one hops) and a ``prefetch_related`` path (anything to-many).
+    Returns ``(None, None)`` when the source doesn't start with a relation.
+    """
+    path = []
+    for name in source.split('.')[:-1]:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        path.append(name)
+        if field.many_to_many or field.one_to_many:
+            return None, '__'.join(path)
+        model = field.related_model
+    return ('__'.join(path) or None), None
+
+
+@lru_cache(maxsize=None)
+def related_lookups(serializer_class):
+    """``(select_related, prefetch_related)`` tuples needed by a ModelSerializer."""
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return (), ()
+
+    select = list(getattr(meta, 'select_related', ()))
+    prefetch = list(getattr(meta, 'prefetch_related', ()))
+    for field in serializer_class().fields.values():
+        if field.write_only or '.' not in field.source:
+            continue
+        select_path, prefetch_path = _relation_path(model, field.source)
+        if select_path:
+            select.append(select_path)
+        if prefetch_path:
+            prefetch.append(prefetch_path)
+    return tuple(dict.fromkeys(select)), tuple(dict.fromkeys(prefetch))
+
+
+def plan_queryset(queryset, serializer_class):
+    """Apply the joins and prefetches ``serializer_class`` needs to ``queryset``."""
+    select, prefetch = related_lookups(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
@@ -0,0 +1,110 @@
+"""
+Daily per-job activity rollups.
+
+Writers call ``record_job_activity`` as events happen; each call is a single
+``UPDATE ... SET col = col + n`` on the ``(job, date)`` row, falling back to an
+insert the first time a job is touched on a given day. Readers aggregate
+``JobDailyStats`` by day, job or company without touching ``applications``.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import JobDailyStats
+
+METRICS = (
+    'views',
+    'external_clicks',
+    'mailto_clicks',
+    'in_app_applications',
+    'submitted',
+    'abandoned',
+)
+
+# Application.source -> rollup column for newly created applications.
+SOURCE_METRICS = {
+    'in_app': 'in_app_applications',
+    'external_click': 'external_clicks',
+    'mailto_click': 'mailto_clicks',
+}
+
+# Application.submission_status -> rollup column for confirmations.
+SUBMISSION_STATUS_METRICS = {
+    'submitted': 'submitted',
+    'abandoned': 'abandoned',
+}
+
+GROUPINGS = {
+    'day': ('date',),
+    'job': ('date', 'job_id', 'job__title', 'job__company'),
+    'company': ('date', 'job__company'),
+}
+
+# Output names for related fields in GROUPINGS.
+GROUPING_LABELS = {
+    'job__title': 'job_title',
+    'job__company': 'company',
+}
+
+
+def record_job_activity(job_id, day=None, **increments):
+    """Add ``increments`` (metric=count) to a job's rollup row for ``day``."""
+    increments = {metric: count for metric, count in increments.items() if count}
+    unknown = set(increments) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown rollup metrics: {', '.join(sorted(unknown))}")
+    if not increments:
+        return
+
+    day = day or timezone.localdate()
+    updates = {metric: F(metric) + count for metric, count in increments.items()}
+
+    rows = JobDailyStats.objects.filter(job_id=job_id, date=day)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            JobDailyStats.objects.create(job_id=job_id, date=day, **increments)
+    except IntegrityError:
+        # Another request created today's row first.
+        rows.update(**updates)
+
+
+def record_application_created(application):
+    metric = SOURCE_METRICS.get(application.source)
+    if metric:
+        record_job_activity(application.job_id, **{metric: 1})
+
+
+def record_submission_status_change(application, previous_status):
+    metric = SUBMISSION_STATUS_METRICS.get(application.submission_status)
+    if metric and application.submission_status != previous_status:
+        record_job_activity(application.job_id, **{metric: 1})
+
+
+def daily_totals(start, end, group_by='day', job_id=None, company=None):
+    """
+    Sum rollup rows between ``start`` and ``end`` (inclusive).
+
+    Returns one dict per day (or per day and job/company) with every metric,
+    newest day first.
+    """
+    queryset = JobDailyStats.objects.filter(date__gte=start, date__lte=end)
+    if job_id:
+        queryset = queryset.filter(job_id=job_id)
+    if company:
+        queryset = queryset.filter(job__company=company)
+
+    fields = GROUPINGS[group_by]
+    rows = list(
+        queryset.values(*fields)
+        .annotate(**{f'total_{metric}': Sum(metric) for metric in METRICS})
+        .order_by('-date', *fields[1:])
+    )
+    for row in rows:
+        for field, label in GROUPING_LABELS.items():
+            if field in row:
+                row[label] = row.pop(field)
+        for metric in METRICS:
+            row[metric] = row.pop(f'total_{metric}') or 0
+    return rows
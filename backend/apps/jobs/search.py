@@ -0,0 +1,280 @@
+"""
+Full-text search for the job feed.
+
+PostgreSQL keeps a weighted ``tsvector`` column on ``jobs`` (GIN indexed and
+maintained by a trigger), SQLite keeps an FTS5 shadow table ``jobs_fts``
+maintained by triggers. Both are created by migration ``0004_job_search_index``.
+Any other database, or a database where the index is missing, falls back to
+DRF's ``icontains`` search.
+
+SQLite drops a table's triggers whenever a migration rebuilds it (any
+``AddField``/``AlterField`` on ``jobs``), which leaves the index silently
+stale. ``install_triggers()`` runs after every ``migrate`` (see
+``JobsConfig``) and recreates missing triggers, rebuilding the index if it
+had to.
+"""
+import logging
+import re
+
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+logger = logging.getLogger(__name__)
+
+# Columns indexed for search, highest weight first.
+SEARCH_COLUMNS = ('title', 'company', 'skills_required', 'description')
+
+POSTGRES_WEIGHTS = {
+    'title': 'A',
+    'company': 'A',
+    'skills_required': 'B',
+    'description': 'C',
+}
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(text):
+    """Split raw search input into index-safe word tokens."""
+    return _TERM_RE.findall(text or '')
+
+
+def postgres_vector_sql(row='NEW'):
+    """SQL expression that builds the weighted tsvector for a ``jobs`` row."""
+    parts = [
+        f"setweight(to_tsvector('english', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in POSTGRES_WEIGHTS.items()
+    ]
+    return ' || '.join(parts)
+
+
+class BaseJobSearchBackend:
+    """Filters and ranks a job queryset by a search string."""
+
+    vendor = None
+
+    # Trigger name -> statements that create it
+    triggers = {}
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def is_available(self):
+        raise NotImplementedError
+
+    def search(self, queryset, terms):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def missing_triggers(self):
+        raise NotImplementedError
+
+    def install_triggers(self):
+        """Recreate missing triggers; returns their names."""
+        missing = self.missing_triggers()
+        if missing:
+            with self.connection.cursor() as cursor:
+                for name in missing:
+                    for statement in self.triggers[name]:
+                        cursor.execute(statement)
+            # Rows written without the triggers aren't indexed
+            self.rebuild()
+        return missing
+
+
+class PostgresJobSearchBackend(BaseJobSearchBackend):
+    """``tsvector`` + GIN backend with prefix matching and ``ts_rank_cd`` ranking."""
+
+    vendor = 'postgresql'
+
+    triggers = {
+        'jobs_search_vector_trigger': [
+            f"""
+            CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {postgres_vector_sql('NEW')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            """
+            CREATE TRIGGER jobs_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, company, description, skills_required ON jobs
+            FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+            """,
+        ],
+    }
+
+    def is_available(self):
+        with self.connection.cursor() as cursor:
+            columns = self.connection.introspection.get_table_description(cursor, 'jobs')
+        return any(column.name == 'search_vector' for column in columns)
+
+    def build_query(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, queryset, terms):
+        query = self.build_query(terms)
+        matches = RawSQL(
+            "SELECT id FROM jobs WHERE search_vector @@ to_tsquery('english', %s)",
+            [query],
+        )
+        rank = RawSQL(
+            "ts_rank_cd(jobs.search_vector, to_tsquery('english', %s))",
+            [query],
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"UPDATE jobs SET search_vector = {postgres_vector_sql('jobs')}")
+
+    def missing_triggers(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tgname FROM pg_trigger WHERE tgrelid = 'jobs'::regclass AND tgname = ANY(%s)",
+                [list(self.triggers)],
+            )
+            present = {row[0] for row in cursor.fetchall()}
+        return [name for name in self.triggers if name not in present]
+
+
+class SQLiteJobSearchBackend(BaseJobSearchBackend):
+    """FTS5 external-content backend ranked by ``bm25``."""
+
+    vendor = 'sqlite'
+
+    triggers = {
+        'jobs_fts_insert': [
+            """
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+                VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+            END
+            """,
+        ],
+        'jobs_fts_delete': [
+            """
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+                VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+            END
+            """,
+        ],
+        'jobs_fts_update': [
+            """
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+            AFTER UPDATE OF title, company, skills_required, description ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, skills_required, description)
+                VALUES ('delete', old.id, old.title, old.company, old.skills_required, old.description);
+                INSERT INTO jobs_fts(rowid, title, company, skills_required, description)
+                VALUES (new.id, new.title, new.company, new.skills_required, new.description);
+            END
+            """,
+        ],
+    }
+
+    def is_available(self):
+        with self.connection.cursor() as cursor:
+            return 'jobs_fts' in self.connection.introspection.table_names(cursor)
+
+    def build_query(self, terms):
+        return ' AND '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, terms):
+        # Join the FTS table directly: a correlated bm25() subquery per row
+        # degrades quadratically when a common term matches most jobs.
+        # rank is bm25(), lower-is-better, so negate it to sort descending.
+        return queryset.extra(
+            tables=['jobs_fts'],
+            where=['jobs_fts.rowid = jobs.id', 'jobs_fts MATCH %s'],
+            params=[self.build_query(terms)],
+            select={'search_rank': '-jobs_fts.rank'},
+        )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+    def missing_triggers(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs'")
+            present = {row[0] for row in cursor.fetchall()}
+        return [name for name in self.triggers if name not in present]
+
+
+SEARCH_BACKENDS = {
+    backend.vendor: backend
+    for backend in (PostgresJobSearchBackend, SQLiteJobSearchBackend)
+}
+
+_availability = {}
+
+
+def get_search_backend(using='default'):
+    """Return the search backend for a database alias, or None if unindexed."""
+    connection = connections[using]
+    backend_class = SEARCH_BACKENDS.get(connection.vendor)
+    if backend_class is None:
+        return None
+
+    backend = backend_class(connection)
+    if using not in _availability:
+        try:
+            _availability[using] = backend.is_available()
+        except Exception as e:  # pragma: no cover - introspection failure
+            logger.warning(f"Job search index check failed on '{using}': {e}")
+            _availability[using] = False
+    return backend if _availability[using] else None
+
+
+def install_triggers(using='default'):
+    """Recreate the index triggers a migration dropped (no-op without an index)."""
+    _availability.pop(using, None)
+    backend = get_search_backend(using)
+    if backend is None:
+        return []
+    missing = backend.install_triggers()
+    if missing:
+        logger.warning(f"Recreated job search triggers on '{using}' and rebuilt the index: {', '.join(missing)}")
+    return missing
+
+
+def is_ranked(queryset):
+    """Return True if a queryset carries a ``search_rank`` from a backend."""
+    query = queryset.query
+    return 'search_rank' in query.annotations or 'search_rank' in query.extra
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for ``SearchFilter`` on the job feed.
+
+    Keeps the ``?search=`` parameter, but resolves it against the full-text
+    index and annotates each job with ``search_rank``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(request.query_params.get(self.search_param, ''))
+        if not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        backend = get_search_backend(queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        return backend.search(queryset, terms).order_by('-search_rank', '-posted_at')
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """Keep relevance order for searches unless ``?ordering=`` is explicit."""
+
+    def filter_queryset(self, request, queryset, view):
+        if self.ordering_param not in request.query_params and is_ranked(queryset):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
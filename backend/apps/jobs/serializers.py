@@ -2,14 +2,14 @@
 Job serializers.
 """
 from rest_framework import serializers
-from .models import Job
+from .models import Job, format_salary_range
+from .values_serializers import ValuesSerializer, datetime_formatter
 
 
 class JobListSerializer(serializers.ModelSerializer):
     """Serializer for job list (minimal fields)."""
 
     posted_by_name = serializers.SerializerMethodField()
-    applications_count = serializers.SerializerMethodField()
     salary_range = serializers.CharField(read_only=True)
     
     class Meta:
@@ -20,24 +20,59 @@ class JobListSerializer(serializers.ModelSerializer):
             'active', 'featured', 'applications_count', 'posted_by_name',
             'job_type_tags'
         ]
+        read_only_fields = ['applications_count']
+        # Used by get_posted_by_name; see apps.jobs.query_planning
+        select_related = ['posted_by']
 
     def get_posted_by_name(self, obj):
         if obj.posted_by:
             return obj.posted_by.get_full_name() or obj.posted_by.username
         return 'Placement Team'
 
-    def get_applications_count(self, obj):
-        annotated_value = getattr(obj, 'applications_total', None)
-        if annotated_value is not None:
-            return annotated_value
-        return obj.applications.count()
+
+class JobListValuesSerializer(ValuesSerializer):
+    """Fast read path producing the same output as ``JobListSerializer``."""
+    
+    columns = (
+        'id', 'title', 'company', 'location', 'job_type',
+        'salary_min', 'salary_max', 'apply_type', 'posted_at', 'deadline',
+        'active', 'featured', 'applications_count',
+        'posted_by_id', 'posted_by__first_name', 'posted_by__last_name', 'posted_by__username',
+        'job_type_tags',
+    )
+    
+    def serialize(self, rows):
+        datetime = datetime_formatter()
+        return [
+            {
+                'id': job_id,
+                'title': title,
+                'company': company,
+                'location': location,
+                'job_type': job_type,
+                'salary_range': format_salary_range(salary_min, salary_max),
+                'apply_type': apply_type,
+                'posted_at': datetime(posted_at),
+                'deadline': datetime(deadline),
+                'active': active,
+                'featured': featured,
+                'applications_count': applications_count,
+                'posted_by_name': (
+                    f'{first_name} {last_name}'.strip() or username
+                    if posted_by_id is not None else 'Placement Team'
+                ),
+                'job_type_tags': job_type_tags,
+            }
+            for (job_id, title, company, location, job_type, salary_min, salary_max,
+                 apply_type, posted_at, deadline, active, featured, applications_count,
+                 posted_by_id, first_name, last_name, username, job_type_tags) in rows
+        ]
 
 
 class JobDetailSerializer(serializers.ModelSerializer):
     """Serializer for job detail (all fields)."""
 
     posted_by_name = serializers.SerializerMethodField()
-    applications_count = serializers.SerializerMethodField()
     salary_range = serializers.CharField(read_only=True)
     
     class Meta:
@@ -49,19 +84,16 @@ class JobDetailSerializer(serializers.ModelSerializer):
             'posted_by', 'posted_by_name', 'posted_at', 'updated_at', 'deadline',
             'active', 'featured', 'views_count', 'applications_count', 'job_type_tags'
         ]
-        read_only_fields = ['posted_by', 'posted_at', 'updated_at', 'views_count', 'push_sent']
+        read_only_fields = [
+            'posted_by', 'posted_at', 'updated_at', 'views_count', 'applications_count', 'push_sent'
+        ]
+        select_related = ['posted_by']
 
     def get_posted_by_name(self, obj):
         if obj.posted_by:
             return obj.posted_by.get_full_name() or obj.posted_by.username
         return 'Placement Team'
 
-    def get_applications_count(self, obj):
-        annotated_value = getattr(obj, 'applications_total', None)
-        if annotated_value is not None:
-            return annotated_value
-        return obj.applications.count()
-
 
 class JobCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating jobs (admin only)."""
@@ -0,0 +1,48 @@
+"""
+Job views reach the database without a later view or a clean shutdown
+(see apps.jobs.counters).
+"""
+import time
+
+import pytest
+
+from apps.jobs.counters import JobViewCounter
+from apps.jobs.models import Job
+
+
+@pytest.fixture
+def job(db):
+    return Job.objects.create(
+        title='QA Intern', company='Acme', description='Testing', apply_type='external',
+        apply_target='https://example.com/apply',
+    )
+
+
+def views_count(job):
+    job.refresh_from_db(fields=['views_count'])
+    return job.views_count
+
+
+@pytest.mark.django_db(transaction=True)
+def test_quiet_period_is_flushed_by_the_timer(job):
+    counter = JobViewCounter(flush_interval=0.2, flush_threshold=100)
+    counter.record(job.pk)
+    counter.record(job.pk)
+    assert views_count(job) == 0
+
+    deadline = time.monotonic() + 5
+    while views_count(job) != 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert views_count(job) == 2
+    assert counter.pending(job.pk) == 0
+
+
+@pytest.mark.django_db
+def test_threshold_of_one_writes_through(job):
+    counter = JobViewCounter(flush_interval=3600, flush_threshold=1)
+
+    counter.record(job.pk)
+
+    assert views_count(job) == 1
+    assert counter._timer is None
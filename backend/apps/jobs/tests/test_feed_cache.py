@@ -0,0 +1,58 @@
+"""
+The job feed response cache keeps pages apart that the feed renders
+differently, whichever of them is cached first.
+"""
+import pytest
+from django.urls import reverse
+
+from apps.jobs import feed_cache
+from benchmarks.utils import make_jobs
+
+
+@pytest.fixture
+def feed(api_client, student, settings):
+    settings.JOB_FEED_CACHE_ALLOW_LOCAL = True
+    feed_cache.get_cache().clear()
+    make_jobs(30)
+    api_client.force_authenticate(student)
+
+    def get(query=''):
+        return api_client.get(f"{reverse('job_list_create')}?{query}")
+
+    yield get
+    feed_cache.get_cache().clear()
+
+
+def assert_page_numbers(response):
+    assert response.status_code == 200
+    assert 'count' in response.json()
+    assert 'page=2' in response.json()['next']
+
+
+def assert_cursor(response):
+    assert response.status_code == 200
+    assert 'count' not in response.json()
+    assert 'cursor=' in response.json()['next']
+
+
+@pytest.mark.django_db
+def test_cursor_page_is_not_served_for_page_numbers(feed):
+    assert_cursor(feed('cursor='))
+    response = feed()
+    assert response['X-Cache'] == 'MISS'
+    assert_page_numbers(response)
+
+
+@pytest.mark.django_db
+def test_page_numbers_are_not_served_for_cursor(feed):
+    assert_page_numbers(feed())
+    response = feed('cursor=')
+    assert response['X-Cache'] == 'MISS'
+    assert_cursor(response)
+    assert feed('cursor=')['X-Cache'] == 'HIT'
+
+
+@pytest.mark.django_db
+def test_ranked_search_with_cursor_is_rejected_after_search_is_cached(feed):
+    assert feed('search=python').status_code == 200
+    assert feed('search=python&cursor=').status_code == 400
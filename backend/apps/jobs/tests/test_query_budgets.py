@@ -0,0 +1,86 @@
+"""
+Query budgets of the job endpoints.
+
+A request must stay within its budget at any page size, which is how an N+1
+shows up. List views declare theirs as ``query_budget``; the detail and
+analytics budgets are set here. ``check_query_budgets`` runs the list checks
+against more data.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.jobs.counters import JobViewCounter
+from apps.jobs.models import Job
+from apps.jobs.pagination import JobFeedPagination
+from apps.jobs.rollups import record_job_activity
+from apps.jobs.views import JobListCreateView
+from benchmarks.utils import make_applications, make_jobs
+
+PAGE_SIZES = (5, 50)
+
+# Conditional-request lookup, then the job with its poster
+JOB_DETAIL_BUDGET = 2
+
+# One grouped query over the rollup table
+JOB_ANALYTICS_BUDGET = 1
+
+
+@pytest.fixture
+def jobs(db):
+    """Jobs by distinct posters, so a per-row poster lookup can't hide behind one cached user."""
+    posters = get_user_model().objects.bulk_create([
+        get_user_model()(username=f'poster-{i}', email=f'poster-{i}@example.com', first_name=f'Poster {i}')
+        for i in range(10)
+    ])
+    make_jobs(120)
+    for i, job in enumerate(Job.objects.order_by('pk')):
+        Job.objects.filter(pk=job.pk).update(posted_by=posters[i % len(posters)], active=True)
+    job_ids = list(Job.objects.values_list('pk', flat=True))
+    make_applications(300, job_ids, [poster.pk for poster in posters])
+    return list(Job.objects.order_by('pk'))
+
+
+@pytest.fixture
+def view_counter(db, monkeypatch):
+    """A counter that never flushes during the request, so views don't add queries."""
+    counter = JobViewCounter(flush_interval=3600, flush_threshold=10 ** 6)
+    monkeypatch.setattr('apps.jobs.views.job_view_counter', counter)
+    yield counter
+    counter.flush()  # Stops its timer
+
+
+@pytest.mark.parametrize('page_size', PAGE_SIZES)
+@pytest.mark.parametrize('params', [{}, {'cursor': ''}, {'job_type': 'internship'}], ids=['pages', 'cursor', 'filtered'])
+def test_job_feed_budget(api_client, student, jobs, settings, monkeypatch, django_assert_max_num_queries,
+                         page_size, params):
+    settings.JOB_FEED_CACHE_TTL = 0
+    monkeypatch.setattr(JobFeedPagination, 'page_size', page_size)
+    api_client.force_authenticate(student)
+
+    with django_assert_max_num_queries(JobListCreateView.query_budget):
+        response = api_client.get(reverse('job_list_create'), params)
+    assert response.status_code == 200
+    assert response.data['results']
+
+
+@pytest.mark.parametrize('user', ['student', 'admin'])
+def test_job_detail_budget(api_client, jobs, view_counter, django_assert_max_num_queries, request, user):
+    api_client.force_authenticate(request.getfixturevalue(user))
+
+    with django_assert_max_num_queries(JOB_DETAIL_BUDGET):
+        response = api_client.get(reverse('job_detail', kwargs={'pk': jobs[0].pk}))
+    assert response.status_code == 200
+    assert response.data['posted_by_name']
+
+
+@pytest.mark.parametrize('group_by', ['day', 'job', 'company'])
+def test_job_analytics_budget(api_client, admin, jobs, django_assert_max_num_queries, group_by):
+    for job in jobs[:30]:
+        record_job_activity(job.pk, views=3, external_clicks=1)
+    api_client.force_authenticate(admin)
+
+    with django_assert_max_num_queries(JOB_ANALYTICS_BUDGET):
+        response = api_client.get(reverse('job_analytics'), {'group_by': group_by})
+    assert response.status_code == 200
+    assert response.data['results']
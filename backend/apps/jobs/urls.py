@@ -1,11 +1,18 @@
 """
 Jobs URL configuration.
 """
+from django.conf import settings
 from django.urls import path
-from .views import JobListCreateView, JobDetailView, ApplyToJobView
+from .views import (
+    JobListCreateView, JobDetailView, ApplyToJobView, AsyncApplyToJobView, JobAnalyticsView, JobCacheStatsView,
+)
+
+apply_view = AsyncApplyToJobView if settings.ASYNC_VIEWS else ApplyToJobView
 
 urlpatterns = [
     path('', JobListCreateView.as_view(), name='job_list_create'),
     path('<int:pk>/', JobDetailView.as_view(), name='job_detail'),
-    path('<int:pk>/apply/', ApplyToJobView.as_view(), name='apply_to_job'),
+    path('<int:pk>/apply/', apply_view.as_view(), name='apply_to_job'),
+    path('analytics/', JobAnalyticsView.as_view(), name='job_analytics'),
+    path('cache-stats/', JobCacheStatsView.as_view(), name='job_cache_stats'),
 ]
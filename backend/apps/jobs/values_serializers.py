@@ -0,0 +1,80 @@
+"""
+Read-only "values" serializers for hot list endpoints.
+
+A ``ValuesSerializer`` reads exactly the columns it needs with
+``values_list()`` (joined relations included), and builds each output dict
+from a row tuple. That skips model instantiation and DRF's per-field
+machinery, which dominate the cost of serializing large pages. Subclasses
+must produce exactly the same JSON as the ``ModelSerializer`` they stand in
+for (``bench_list_serializers`` checks this).
+
+Views opt in through ``ValuesListMixin`` and ``values_serializer_class``;
+``FAST_READ_SERIALIZERS = False`` switches back to the regular serializers.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def datetime_formatter():
+    """
+    Return a function rendering datetimes exactly as DRF's ``DateTimeField``
+    does, specialised for the common ISO 8601 + ``USE_TZ`` configuration.
+    """
+    if api_settings.DATETIME_FORMAT != ISO_8601 or not settings.USE_TZ:
+        return serializers.DateTimeField().to_representation
+
+    tz = timezone.get_current_timezone()
+
+    def to_representation(value):
+        if not value:
+            return None
+        if timezone.is_aware(value):
+            value = value.astimezone(tz).isoformat()
+        else:
+            value = timezone.make_aware(value, tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return to_representation
+
+
+class ValuesSerializer:
+    """
+    Base class: set ``columns`` and implement ``serialize(rows)``, where each
+    row is a named tuple of those columns in order.
+    """
+
+    columns = ()
+
+    def prepare(self, queryset):
+        # Named rows also expose the keyset pagination fields as attributes
+        return queryset.values_list(*self.columns, named=True)
+
+    def serialize(self, rows):
+        raise NotImplementedError
+
+
+class ValuesListMixin:
+    """Serve GET lists through ``values_serializer_class`` when it applies."""
+
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        if self.values_serializer_class is None or not getattr(settings, 'FAST_READ_SERIALIZERS', True):
+            return None
+        return self.values_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = values_serializer.prepare(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
@@ -1,31 +1,52 @@
 """
 Job views for CRUD and apply operations.
 """
-from rest_framework import generics, status, filters
+from asgiref.sync import sync_to_async
+from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
+from apps.applications.idempotency import aidempotent, idempotent
+from config.async_views import AsyncAPIView
+from config.db import routing as db_routing
+
+from . import feed_cache
+from .cache_stats import detail_stats, feed_stats
+from .counters import job_view_counter
 from .models import Job
-from .serializers import JobListSerializer, JobDetailSerializer, JobCreateSerializer
+from .serializers import JobListSerializer, JobListValuesSerializer, JobDetailSerializer, JobCreateSerializer
+from .pagination import JobFeedPagination
 from .permissions import IsAdminOrReadOnly, IsAdminUser
-from services.fcm import send_job_notification
+from .query_planning import plan_queryset
+from .rollups import GROUPINGS, daily_totals, record_application_created
+from .search import JobSearchFilter, RelevanceOrderingFilter
+from .values_serializers import ValuesListMixin
+from apps.notifications.outbox import enqueue_job_notification
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     """List all active jobs or create a new job (admin only)."""
     
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = JobFeedPagination
+    values_serializer_class = JobListValuesSerializer
+    filter_backends = [DjangoFilterBackend, JobSearchFilter, RelevanceOrderingFilter]
     filterset_fields = ['company', 'job_type', 'apply_type', 'active', 'featured']
     search_fields = ['title', 'company', 'description', 'skills_required']
     ordering_fields = ['posted_at', 'deadline', 'salary_min']
     ordering = ['-posted_at']
+    # Page query + count, whatever the page size (see check_query_budgets)
+    query_budget = 2
     
     def get_queryset(self):
-        queryset = Job.objects.annotate(applications_total=Count('applications'))
+        queryset = plan_queryset(Job.objects.all(), self.get_serializer_class())
         
         # Non-admin users only see active jobs
         if not self.request.user.is_admin:
@@ -38,14 +59,45 @@ class JobListCreateView(generics.ListCreateAPIView):
             return JobCreateSerializer
         return JobListSerializer
     
-    def perform_create(self, serializer):
-        job = serializer.save(posted_by=self.request.user)
+    def list(self, request, *args, **kwargs):
+        # Students all see the same feed, so serve it from the response cache
+        if (request.user.is_admin or not feed_cache.is_enabled()
+                or request.accepted_renderer.format != 'json'):
+            return super().list(request, *args, **kwargs)
         
-        # Send push notification if enabled
-        if job.push_on_create and not job.push_sent:
-            send_job_notification(job)
-            job.push_sent = True
-            job.save(update_fields=['push_sent'])
+        key, entry = feed_cache.lookup(request)
+        cache_status = 'HIT'
+        if entry is None:
+            cache_status = 'MISS'
+            if feed_cache.recently_invalidated():
+                # Don't cache a replica's view of a write it may not have yet
+                db_routing.use_primary()
+            response = super().list(request, *args, **kwargs)
+            renderer = request.accepted_renderer
+            content_type = request.accepted_media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            content = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+            entry = feed_cache.store(key, content, content_type)
+        
+        if feed_cache.etag_matches(request, entry['etag']):
+            feed_stats.incr('not_modified')
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        # Let the app keep its copy but revalidate it every time
+        response['Cache-Control'] = 'private, no-cache'
+        response['X-Cache'] = cache_status
+        return response
+    
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            job = serializer.save(posted_by=self.request.user)
+            
+            # Queue the push; the outbox worker sends it and sets push_sent
+            if job.push_on_create and not job.push_sent:
+                enqueue_job_notification(job)
 
 
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -54,7 +106,7 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminOrReadOnly]
     
     def get_queryset(self):
-        return Job.objects.annotate(applications_total=Count('applications'))
+        return plan_queryset(Job.objects.all(), self.get_serializer_class())
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -62,15 +114,55 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         return JobDetailSerializer
     
     def retrieve(self, request, *args, **kwargs):
+        # Answer conditional requests from a narrow row before loading and
+        # serializing the full job (description, requirements, ...)
+        validators = (
+            self.get_queryset().filter(pk=kwargs['pk'])
+            .values('pk', 'updated_at', 'applications_count')
+            .first()
+        )
+        if validators is not None:
+            etag, last_modified = _job_validators(validators)
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                if not request.user.is_admin:
+                    job_view_counter.record(validators['pk'])
+                detail_stats.incr('hits')
+                return self._with_validators(not_modified, etag, last_modified)
+        
         instance = self.get_object()
         
-        # Increment view count for non-admin users
+        # Count views by non-admin users; the counter writes them in batches
         if not request.user.is_admin:
-            instance.views_count += 1
-            instance.save(update_fields=['views_count'])
+            job_view_counter.record(instance.pk)
+        instance.views_count += job_view_counter.pending(instance.pk)
         
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        detail_stats.incr('misses')
+        etag, last_modified = _job_validators({
+            'pk': instance.pk,
+            'updated_at': instance.updated_at,
+            'applications_count': instance.applications_count,
+        })
+        return self._with_validators(Response(serializer.data), etag, last_modified)
+    
+    def _with_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def _job_validators(row):
+    """
+    ETag and Last-Modified (epoch seconds) for a job detail response.
+    
+    The ETag is weak because views_count is left out: it changes on every
+    view, and a slightly stale count is an acceptable reason to return 304.
+    """
+    version = int(row['updated_at'].timestamp() * 1_000_000)
+    etag = f'W/"{row["pk"]}-{version}-{row["applications_count"]}"'
+    return etag, int(row['updated_at'].timestamp())
 
 
 class ApplyToJobView(APIView):
@@ -83,10 +175,10 @@ class ApplyToJobView(APIView):
     
     permission_classes = [IsAuthenticated]
     
+    @idempotent
     def post(self, request, pk):
-        from apps.applications.models import Application
+        from apps.applications import clicks
         from apps.applications.serializers import ApplicationCreateSerializer
-        from urllib.parse import quote
         
         try:
             job = Job.objects.get(pk=pk, active=True)
@@ -105,24 +197,23 @@ class ApplyToJobView(APIView):
             serializer = ApplicationCreateSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             
-            # Check for duplicate application
-            existing = Application.objects.filter(
-                job=job, user=user, source='in_app'
-            ).exists()
-            
-            if existing:
+            # Insert straight away; the unique_in_app_application constraint
+            # rejects a duplicate, even one racing this request
+            try:
+                with transaction.atomic():
+                    application = serializer.save(
+                        job=job,
+                        user=user,
+                        source='in_app',
+                        submission_status='submitted',
+                        ip_address=self.get_client_ip(request)
+                    )
+            except IntegrityError:
                 return Response(
                     {'error': 'You have already applied to this job'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            application = serializer.save(
-                job=job,
-                user=user,
-                source='in_app',
-                submission_status='submitted',
-                ip_address=self.get_client_ip(request)
-            )
+            record_application_created(application)
             
             return Response({
                 'status': 'applied',
@@ -131,21 +222,34 @@ class ApplyToJobView(APIView):
             }, status=status.HTTP_201_CREATED)
         
         else:
-            # For external types, record the click
+            # For external types, record the click: one row per user, job and
+            # hour, enforced by the unique_click_per_bucket constraint
             source = 'mailto_click' if job.apply_type == 'email' else 'external_click'
             
-            # Check for recent duplicate click (within last hour)
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            recent_click = Application.objects.filter(
-                job=job,
-                user=user,
-                source=source,
-                applied_at__gte=timezone.now() - timedelta(hours=1)
-            ).exists()
+            if clicks.is_enabled():
+                # Logged in bulk and folded into the application in the background
+                application_id = clicks.click_buffer.record(
+                    job, user, source,
+                    resume_url=resume_url,
+                    ip_address=self.get_client_ip(request)
+                )
+            else:
+                application_id = self._save_click(job, user, source, resume_url, request)
             
-            if not recent_click:
+            return Response({
+                'status': 'recorded',
+                'application_id': application_id,
+                'apply_type': job.apply_type,
+                'redirect_url': self.get_redirect_url(job, user, resume_url),
+                'message': 'Click recorded, opening external application'
+            })
+    
+    def _save_click(self, job, user, source, resume_url, request):
+        from apps.applications.models import Application, click_bucket
+        
+        bucket = click_bucket(timezone.now())
+        try:
+            with transaction.atomic():
                 application = Application.objects.create(
                     job=job,
                     user=user,
@@ -155,46 +259,182 @@ class ApplyToJobView(APIView):
                     source=source,
                     submission_status='clicked',
                     resume_url=resume_url or '',
-                    ip_address=self.get_client_ip(request)
-                )
-            else:
-                application = Application.objects.filter(
-                    job=job, user=user, source=source
-                ).latest('applied_at')
-
-                if resume_url and application.resume_url != resume_url:
-                    application.resume_url = resume_url
-                    application.save(update_fields=['resume_url', 'updated_at'])
-            
-            # Build redirect URL
-            redirect_url = job.apply_target
-            if job.apply_type == 'email':
-                # Build mailto link with prefilled data
-                subject = f"Application for {job.title} at {job.company}"
-                body = (
-                    "Hi,\n\n"
-                    f"I am interested in the {job.title} position.\n"
-                    f"Name: {user.get_full_name() or user.username}\n"
-                    f"Email: {user.email}\n"
-                    f"Phone: {user.phone or 'N/A'}\n"
-                )
-                if resume_url:
-                    body += f"\nResume: {resume_url}\n"
-                body += "\nRegards,\n" + (user.get_full_name() or user.username)
-                redirect_url = (
-                    f"mailto:{job.apply_target}?subject={quote(subject)}&body={quote(body)}"
+                    ip_address=self.get_client_ip(request),
+                    click_bucket=bucket
                 )
+        except IntegrityError:
+            application = Application.objects.get(
+                job=job, user=user, source=source, click_bucket=bucket
+            )
             
-            return Response({
-                'status': 'recorded',
-                'application_id': application.id,
-                'apply_type': job.apply_type,
-                'redirect_url': redirect_url,
-                'message': 'Click recorded, opening external application'
-            })
+            if resume_url and application.resume_url != resume_url:
+                application.resume_url = resume_url
+                application.save(update_fields=['resume_url', 'updated_at'])
+        else:
+            record_application_created(application)
+        return application.id
+    
+    def get_redirect_url(self, job, user, resume_url):
+        from urllib.parse import quote
+        
+        if job.apply_type != 'email':
+            return job.apply_target
+        # Build mailto link with prefilled data
+        subject = f"Application for {job.title} at {job.company}"
+        body = (
+            "Hi,\n\n"
+            f"I am interested in the {job.title} position.\n"
+            f"Name: {user.get_full_name() or user.username}\n"
+            f"Email: {user.email}\n"
+            f"Phone: {user.phone or 'N/A'}\n"
+        )
+        if resume_url:
+            body += f"\nResume: {resume_url}\n"
+        body += "\nRegards,\n" + (user.get_full_name() or user.username)
+        return f"mailto:{job.apply_target}?subject={quote(subject)}&body={quote(body)}"
     
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
             return x_forwarded_for.split(',')[0]
         return request.META.get('REMOTE_ADDR')
+
+
+class AsyncApplyToJobView(AsyncAPIView, ApplyToJobView):
+    """
+    ``ApplyToJobView`` for ASGI (``ASYNC_VIEWS``): same responses, but the
+    request waits on the database without holding a thread.
+    """
+
+    @aidempotent
+    async def post(self, request, pk):
+        from apps.applications import clicks
+        from apps.applications.models import Application
+        from apps.applications.serializers import ApplicationCreateSerializer
+
+        try:
+            job = await Job.objects.aget(pk=pk, active=True)
+        except Job.DoesNotExist:
+            return Response(
+                {'error': 'Job not found or no longer active'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        user = request.user
+
+        resume_url = request.data.get('resume_url', '') if isinstance(request.data, dict) else ''
+
+        if job.apply_type == 'in_app':
+            serializer = ApplicationCreateSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+
+            # A single INSERT, so no transaction is needed to recover from
+            # the unique_in_app_application violation of a duplicate
+            try:
+                application = await Application.objects.acreate(
+                    **serializer.validated_data,
+                    job=job,
+                    user=user,
+                    source='in_app',
+                    submission_status='submitted',
+                    ip_address=self.get_client_ip(request)
+                )
+            except IntegrityError:
+                return Response(
+                    {'error': 'You have already applied to this job'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            await sync_to_async(record_application_created)(application)
+
+            return Response({
+                'status': 'applied',
+                'application_id': application.id,
+                'message': 'Application submitted successfully'
+            }, status=status.HTTP_201_CREATED)
+
+        source = 'mailto_click' if job.apply_type == 'email' else 'external_click'
+        # Both may write (a flush, an id block, the click itself) inside a transaction
+        if clicks.is_enabled():
+            application_id = await sync_to_async(clicks.click_buffer.record)(
+                job, user, source,
+                resume_url=resume_url,
+                ip_address=self.get_client_ip(request)
+            )
+        else:
+            application_id = await sync_to_async(self._save_click)(job, user, source, resume_url, request)
+
+        return Response({
+            'status': 'recorded',
+            'application_id': application_id,
+            'apply_type': job.apply_type,
+            'redirect_url': self.get_redirect_url(job, user, resume_url),
+            'message': 'Click recorded, opening external application'
+        })
+
+
+class JobAnalyticsView(APIView):
+    """
+    Daily job activity from the rollup table (admin only).
+
+    Query params: ``start``/``end`` (YYYY-MM-DD, default last 7 days),
+    ``group_by`` (day, job or company), ``job`` and ``company`` filters.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from datetime import timedelta
+        from django.utils import timezone
+        from django.utils.dateparse import parse_date
+
+        params = request.query_params
+        today = timezone.localdate()
+        try:
+            end = parse_date(params['end']) if params.get('end') else today
+            start = parse_date(params['start']) if params.get('start') else end - timedelta(days=6)
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return Response(
+                {'error': 'start and end must be dates in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        group_by = params.get('group_by', 'day')
+        if group_by not in GROUPINGS:
+            return Response(
+                {'error': f"group_by must be one of: {', '.join(GROUPINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            job_id = int(params['job']) if params.get('job') else None
+        except ValueError:
+            return Response(
+                {'error': 'job must be a job ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'start': start,
+            'end': end,
+            'group_by': group_by,
+            'results': daily_totals(
+                start, end,
+                group_by=group_by,
+                job_id=job_id,
+                company=params.get('company'),
+            ),
+        })
+
+
+class JobCacheStatsView(APIView):
+    """Hit/miss counters of the feed cache and job detail revalidation (admin only)."""
+    
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            'feed': feed_stats.snapshot(),
+            'detail': detail_stats.snapshot(),
+        })
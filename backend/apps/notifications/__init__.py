@@ -0,0 +1 @@
+# Notifications app
@@ -0,0 +1,35 @@
+"""
+Notification outbox admin configuration.
+"""
+from django.contrib import admin
+from .models import AudienceMember, NotificationOutbox
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    """Admin configuration for queued push notifications."""
+    
+    list_display = ['kind', 'job', 'state', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['kind', 'state']
+    ordering = ['-created_at']
+    raw_id_fields = ['job']
+    readonly_fields = ['attempts', 'last_error', 'created_at', 'sent_at']
+    
+    actions = ['retry_now']
+    
+    def retry_now(self, request, queryset):
+        from django.utils import timezone
+        queryset.exclude(state='sent').update(state='pending', next_attempt_at=timezone.now())
+    retry_now.short_description = "Retry now"
+
+
+
+@admin.register(AudienceMember)
+class AudienceMemberAdmin(admin.ModelAdmin):
+    """Admin configuration for push segment memberships."""
+    
+    list_display = ['segment', 'user', 'added_at']
+    search_fields = ['segment', 'user__email']
+    ordering = ['segment']
+    raw_id_fields = ['user']
+    readonly_fields = ['added_at']
@@ -0,0 +1,204 @@
+"""
+Precomputed push audiences.
+
+A segment is a string key, ``<kind>:<value>``:
+
+- ``job_type:<type>``: users who applied to a job of that type (``Job.job_type``
+  or one of its ``job_type_tags``).
+- ``skill:<skill>``: users whose profile ``skills`` mention the skill, matched
+  case-insensitively against the comma-separated ``Job.skills_required``.
+
+Memberships live in ``AudienceMember`` and are maintained incrementally by the
+signal handlers in ``apps.notifications.models``, so resolving even a large
+segment to device tokens is a single indexed join rather than a scan of
+applications and profiles. ``rebuild()`` recomputes everything from scratch.
+"""
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import AudienceMember
+
+SEGMENT_KINDS = ('job_type', 'skill')
+
+BULK_BATCH_SIZE = 5000
+
+_SKILL_SEPARATORS = re.compile(r'[,;\n|/]+')
+_WHITESPACE = re.compile(r'\s+')
+_MAX_VALUE_LENGTH = AudienceMember._meta.get_field('segment').max_length - len('job_type:')
+
+
+def _normalize(value):
+    return _WHITESPACE.sub(' ', str(value)).strip().lower()[:_MAX_VALUE_LENGTH]
+
+
+def segment_key(kind, value):
+    """Build the key of a segment, e.g. ``segment_key('skill', 'Python')``."""
+    if kind not in SEGMENT_KINDS:
+        raise ValueError(f"Unknown segment kind: {kind}")
+    return f'{kind}:{_normalize(value)}'
+
+
+def parse_segment(key):
+    """
+    Normalise a segment key given by a client. Raises ValueError if the kind
+    is unknown or the value is empty.
+    """
+    kind, _, value = str(key).partition(':')
+    if not _normalize(value):
+        raise ValueError(f"Invalid segment: {key}")
+    return segment_key(kind.strip().lower(), value)
+
+
+def parse_skills(text):
+    """Split a skills field (comma-separated or a JSON list) into normalised skills."""
+    if not text:
+        return []
+    values = None
+    if text.lstrip().startswith('['):
+        try:
+            values = json.loads(text)
+        except ValueError:
+            pass
+    if not isinstance(values, list):
+        values = _SKILL_SEPARATORS.split(text)
+    skills = (_normalize(value) for value in values)
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+
+def skill_segments(text):
+    return [segment_key('skill', skill) for skill in parse_skills(text)]
+
+
+def job_type_segments(job_type, job_type_tags=None):
+    types = [job_type] + [tag for tag in (job_type_tags or []) if isinstance(tag, str)]
+    return list(dict.fromkeys(segment_key('job_type', t) for t in types if t))
+
+
+def job_skill_segments(job):
+    """Segments of users whose skills overlap the job's ``skills_required``."""
+    return skill_segments(job.skills_required)
+
+
+# Maintenance
+
+def add_members(segments, user_id):
+    """Add one user to several segments; existing memberships are left alone."""
+    AudienceMember.objects.bulk_create(
+        [AudienceMember(segment=segment, user_id=user_id) for segment in segments],
+        ignore_conflicts=True,
+    )
+
+
+def record_application(application):
+    """Add the applicant to the segments of the job they applied to."""
+    if not application.user_id:
+        return
+    from apps.jobs.models import Job
+
+    job = Job.objects.filter(pk=application.job_id).values('job_type', 'job_type_tags').first()
+    if job:
+        add_members(job_type_segments(job['job_type'], job['job_type_tags']), application.user_id)
+
+
+def record_applications(applications):
+    """``record_application`` for many applications at once (e.g. after ``bulk_create``)."""
+    from apps.jobs.models import Job
+
+    applications = [application for application in applications if application.user_id]
+    jobs = {
+        job['pk']: job for job in
+        Job.objects.filter(pk__in={application.job_id for application in applications})
+        .values('pk', 'job_type', 'job_type_tags')
+    }
+    members = {
+        (segment, application.user_id)
+        for application in applications if application.job_id in jobs
+        for segment in job_type_segments(jobs[application.job_id]['job_type'], jobs[application.job_id]['job_type_tags'])
+    }
+    AudienceMember.objects.bulk_create(
+        [AudienceMember(segment=segment, user_id=user_id) for segment, user_id in members],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def sync_user_skills(user):
+    """Bring a user's ``skill:*`` memberships in line with their profile."""
+    wanted = set(skill_segments(user.skills))
+    memberships = AudienceMember.objects.filter(user_id=user.pk, segment__startswith='skill:')
+    current = set(memberships.values_list('segment', flat=True))
+    if current - wanted:
+        memberships.filter(segment__in=current - wanted).delete()
+    if wanted - current:
+        add_members(wanted - current, user.pk)
+
+
+def _iter_memberships():
+    from apps.applications.models import Application
+
+    applied = (
+        Application.objects.filter(user__isnull=False)
+        .values_list('user_id', 'job__job_type', 'job__job_type_tags')
+        .distinct()
+        .iterator(chunk_size=BULK_BATCH_SIZE)
+    )
+    for user_id, job_type, job_type_tags in applied:
+        for segment in job_type_segments(job_type, job_type_tags):
+            yield segment, user_id
+
+    profiles = (
+        get_user_model().objects.exclude(skills='')
+        .values_list('pk', 'skills')
+        .iterator(chunk_size=BULK_BATCH_SIZE)
+    )
+    for user_id, skills in profiles:
+        for segment in skill_segments(skills):
+            yield segment, user_id
+
+
+def rebuild():
+    """Recompute every membership from applications and profiles. Returns the row count."""
+    created = 0
+    batch = []
+    with transaction.atomic():
+        AudienceMember.objects.all().delete()
+        for segment, user_id in _iter_memberships():
+            batch.append(AudienceMember(segment=segment, user_id=user_id))
+            if len(batch) >= BULK_BATCH_SIZE:
+                AudienceMember.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+                batch = []
+        if batch:
+            AudienceMember.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+# Lookups
+
+def segment_users(segments):
+    """Users in any of ``segments``."""
+    return get_user_model().objects.filter(
+        pk__in=AudienceMember.objects.filter(segment__in=segments).values('user_id')
+    )
+
+
+def resolve_tokens(segments):
+    """Distinct FCM tokens of users in any of ``segments``."""
+    tokens = segment_users(segments).exclude(fcm_token='').values_list('fcm_token', flat=True)
+    return list(dict.fromkeys(tokens))
+
+
+def segment_sizes(kind=None):
+    """``{segment: member count}``, optionally for one kind only."""
+    from django.db.models import Count
+
+    queryset = AudienceMember.objects.all()
+    if kind:
+        queryset = queryset.filter(segment__startswith=f'{kind}:')
+    return dict(
+        queryset.values_list('segment').annotate(members=Count('id')).order_by('segment')
+    )
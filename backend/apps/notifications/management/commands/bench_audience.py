@@ -0,0 +1,90 @@
+"""
+Benchmark resolving a push segment to device tokens through the audience
+index, against the equivalent ad-hoc query over applications.
+Synthetic users, jobs and applications are rolled back afterwards.
+"""
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.jobs.models import Job
+from apps.notifications import audiences
+from benchmarks.utils import WORDS, make_applications, make_jobs, rolled_back, summarize, time_call
+
+USERNAME_PREFIX = 'bench-audience-'
+
+
+class Command(BaseCommand):
+    help = 'Measure segment-to-token resolution for large audiences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50_000)
+        parser.add_argument('--applications-per-user', type=int, default=3)
+        parser.add_argument('--jobs', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with rolled_back():
+            self.populate(rng, options)
+            self.stdout.write('Building audience index...')
+            audiences.rebuild()
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE audience_members')
+
+            User = get_user_model()
+            cases = [
+                (audiences.segment_key('job_type', job_type), {'applications__job__job_type': job_type})
+                for job_type, _ in Job.JOB_TYPE_CHOICES
+            ] + [
+                (audiences.segment_key('skill', skill), {'skills__icontains': skill})
+                for skill in rng.sample(WORDS, 3)
+            ]
+
+            results = []
+            for segment, adhoc_filter in cases:
+                def indexed():
+                    return audiences.resolve_tokens([segment])
+
+                def adhoc():
+                    # What targeting costs without the index (substring
+                    # matching also over-selects skills, e.g. "java" in "javascript").
+                    return list(
+                        User.objects.filter(**adhoc_filter).exclude(fcm_token='')
+                        .values_list('fcm_token', flat=True).distinct()
+                    )
+
+                results.append({
+                    'segment': segment,
+                    'tokens': len(indexed()),
+                    'indexed': summarize(time_call(indexed, repeat=options['repeat'])),
+                    'adhoc': summarize(time_call(adhoc, repeat=options['repeat'])),
+                })
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def populate(self, rng, options, batch_size=5000):
+        User = get_user_model()
+        make_jobs(options['jobs'], seed=options['seed'])
+        job_ids = list(Job.objects.values_list('pk', flat=True))
+
+        user_count = options['users']
+        for i in range(0, user_count, batch_size):
+            User.objects.bulk_create([
+                User(
+                    username=f'{USERNAME_PREFIX}{n}',
+                    email=f'{USERNAME_PREFIX}{n}@example.com',
+                    fcm_token=f'bench-audience-token-{n}',
+                    skills=', '.join(rng.sample(WORDS, 3)),
+                )
+                for n in range(i, min(user_count, i + batch_size))
+            ])
+        user_ids = list(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('pk', flat=True))
+        make_applications(
+            user_count * options['applications_per_user'], job_ids, user_ids, seed=options['seed']
+        )
@@ -0,0 +1,93 @@
+"""
+Benchmark multicast fan-out against the in-memory FCM transport.
+Users created for token pruning are rolled back when the command finishes.
+
+``thread`` times ``send_notification_to_tokens`` (a thread pool) and
+``async`` times ``asend_notification_to_tokens`` (one event loop); in both,
+``--workers`` caps the batches in flight.
+"""
+import asyncio
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Substr
+from django.test.utils import override_settings
+
+from benchmarks.utils import rolled_back
+from services import fcm
+from services.fcm_fake import fake_messaging
+
+FAKE_TRANSPORT = 'services.fcm_fake.fake_messaging'
+USERNAME_PREFIX = 'bench-fcm-'
+
+
+class Command(BaseCommand):
+    help = 'Measure send_notification_to_tokens throughput for many devices'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--devices', type=int, default=100_000)
+        parser.add_argument('--latency-ms', type=float, default=80.0, help='Simulated FCM round trip per request')
+        parser.add_argument('--dead-ratio', type=float, default=0.02, help='Fraction of tokens reported unregistered')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+        parser.add_argument('--modes', nargs='+', choices=['thread', 'async'], default=['thread', 'async'])
+
+    def handle(self, *args, **options):
+        devices = options['devices']
+        tokens = [f'fake-token-{i:07d}' for i in range(devices)]
+        dead_every = int(1 / options['dead_ratio']) if options['dead_ratio'] else 0
+        dead = set(tokens[::dead_every]) if dead_every else set()
+
+        results = []
+        with rolled_back():
+            self.create_users(tokens)
+            for mode in options['modes']:
+                for workers in options['workers']:
+                    results.append(self.run(mode, workers, tokens, dead, options))
+        fake_messaging.reset()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, mode, workers, tokens, dead, options):
+        devices = len(tokens)
+        fake_messaging.reset()
+        fake_messaging.latency = options['latency_ms'] / 1000
+        fake_messaging.dead_tokens = dead
+
+        with override_settings(FCM_TRANSPORT=FAKE_TRANSPORT, FCM_MULTICAST_WORKERS=workers):
+            start = time.perf_counter()
+            if mode == 'async':
+                result = asyncio.run(fcm.asend_notification_to_tokens(tokens, 'Benchmark', 'Fan-out', prune=False))
+            else:
+                result = fcm.send_notification_to_tokens(tokens, 'Benchmark', 'Fan-out', prune=False)
+            send_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pruned = fcm.prune_dead_tokens(result.dead_tokens)
+        prune_seconds = time.perf_counter() - start
+        # Restore tokens (username is prefix + token) so every run prunes the same rows.
+        get_user_model().objects.filter(
+            username__startswith=USERNAME_PREFIX, fcm_token=''
+        ).update(fcm_token=Substr('username', len(USERNAME_PREFIX) + 1))
+
+        return {
+            'mode': mode,
+            'devices': devices,
+            'workers': workers,
+            'requests': fake_messaging.calls,
+            'send_seconds': round(send_seconds, 3),
+            'devices_per_second': round(devices / send_seconds) if send_seconds else None,
+            'success': result.success_count,
+            'dead': len(result.dead_tokens),
+            'pruned': pruned,
+            'prune_seconds': round(prune_seconds, 3),
+        }
+
+    def create_users(self, tokens, batch_size=5000):
+        User = get_user_model()
+        for i in range(0, len(tokens), batch_size):
+            User.objects.bulk_create([
+                User(username=f'{USERNAME_PREFIX}{token}', email=f'{token}@example.com', fcm_token=token)
+                for token in tokens[i:i + batch_size]
+            ])
@@ -0,0 +1,27 @@
+"""
+Management command to deliver queued push notifications.
+Use this (e.g. from cron) where the in-process outbox worker can't run.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications import outbox
+
+
+class Command(BaseCommand):
+    help = 'Send due notifications from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum notifications to send')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for due notifications')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = outbox.drain(limit=options['limit'])
+            if sent:
+                self.stdout.write(self.style.SUCCESS(f'Sent {sent} notification(s)'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,16 @@
+"""
+Management command to recompute push segment memberships from applications
+and profiles. Run once after deploying the audience index, or to repair it.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.notifications import audiences
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the push audience index'
+
+    def handle(self, *args, **options):
+        created = audiences.rebuild()
+        segments = len(audiences.segment_sizes())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {created} membership(s) across {segments} segment(s)'))
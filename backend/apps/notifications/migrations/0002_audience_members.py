@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='kind',
+            field=models.CharField(choices=[('new_job', 'New Job'), ('segment', 'Segment')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='AudienceMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('segment', models.CharField(max_length=120)),
+                ('added_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audience_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'audience_members',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='audiencemember',
+            constraint=models.UniqueConstraint(fields=('segment', 'user'), name='unique_audience_member'),
+        ),
+    ]
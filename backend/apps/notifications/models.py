@@ -0,0 +1,100 @@
+"""
+Outbox of push notifications waiting to be delivered, and the audience index
+used to target them.
+"""
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+class NotificationOutbox(models.Model):
+    """
+    A push notification written in the same transaction as the change that
+    caused it, and delivered later by the outbox worker with retries.
+    """
+
+    KIND_CHOICES = (
+        ('new_job', 'New Job'),
+        ('segment', 'Segment'),
+    )
+
+    STATE_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    job = models.ForeignKey(
+        'jobs.Job',
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+    payload = models.JSONField(default=dict, blank=True)
+
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    # Also serves as the lease: a claimed row is pushed into the future so a
+    # crashed worker's row becomes due again instead of being stuck.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['state', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.state})"
+
+
+class AudienceMember(models.Model):
+    """
+    Membership of a user in a push segment such as ``job_type:internship`` or
+    ``skill:python``. Kept up to date as users apply and edit their profile
+    (see ``apps.notifications.audiences``) so a segment's device tokens are
+    one indexed join away.
+    """
+
+    segment = models.CharField(max_length=120)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='audience_memberships'
+    )
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'audience_members'
+        constraints = [
+            models.UniqueConstraint(fields=['segment', 'user'], name='unique_audience_member'),
+        ]
+
+    def __str__(self):
+        return f"{self.segment}: {self.user_id}"
+
+
+@receiver(post_save, sender='applications.Application')
+def _application_saved(sender, instance, created, **kwargs):
+    if created:
+        from . import audiences
+        audiences.record_application(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created and not instance.skills:
+        return
+    if update_fields is None or 'skills' in update_fields:
+        from . import audiences
+        audiences.sync_user_skills(instance)
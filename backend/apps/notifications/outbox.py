@@ -0,0 +1,290 @@
+"""
+Notification outbox: enqueue pushes transactionally, deliver them in the background.
+
+``enqueue_*`` functions insert a ``NotificationOutbox`` row inside the caller's
+transaction, so a rolled-back job never produces a push. Rows are delivered by
+``drain()``, either on an in-process worker thread kicked after commit or by
+the ``drain_notifications`` management command; on serverless deployments
+the ``/cron/notifications/`` task drains it. ``NOTIFICATIONS_DRAIN_ON_COMMIT``
+opts in to also sending the one new row in the request after commit, only if
+the rate limit allows it right away.
+Failed sends are retried with exponential backoff up to
+``NOTIFICATION_MAX_ATTEMPTS``; sends are paced by a token-bucket rate limit.
+Without Firebase credentials nothing can be sent, and rows are ``skipped``.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from services import fcm
+
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` sends per second with bursts of ``burst``."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until one send is allowed."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """Take a send if one is allowed now. Never blocks."""
+        return not self._take()
+
+    def _take(self):
+        """Take a token; returns 0, or the seconds until one is available."""
+        if not self.rate:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+def backoff_delay(attempts):
+    """Seconds to wait before retry number ``attempts`` (1-based), with jitter."""
+    base = _setting('NOTIFICATION_BACKOFF_BASE', 30)
+    cap = _setting('NOTIFICATION_BACKOFF_MAX', 3600)
+    delay = min(cap, base * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+# Senders
+
+class SkipNotification(Exception):
+    """Raised by a sender when retrying can't help: the row is marked ``skipped``."""
+
+
+def _require_firebase():
+    if not fcm.is_enabled():
+        raise SkipNotification('Firebase not configured')
+
+
+def _send_new_job(notification):
+    from apps.jobs.models import Job
+
+    job = notification.job
+    if job is None:
+        raise ValueError('Job no longer exists')
+    _require_firebase()
+    if not fcm.send_job_notification(job):
+        raise RuntimeError('send_job_notification failed')
+    Job.objects.filter(pk=job.pk).update(push_sent=True)
+
+
+def _send_segment(notification):
+    from .audiences import resolve_tokens
+
+    _require_firebase()
+    payload = notification.payload
+    tokens = resolve_tokens(payload['segments'])
+    result = fcm.send_notification_to_tokens(tokens, payload['title'], payload['body'], payload.get('data'))
+    if result is None:
+        raise SkipNotification('Firebase not configured')
+    # Per-token failures are recorded rather than retried, so devices that
+    # already received the push don't get it twice.
+    NotificationOutbox.objects.filter(pk=notification.pk).update(payload={
+        **payload,
+        'result': {
+            'tokens': len(tokens),
+            'success': result.success_count,
+            'failure': result.failure_count,
+            'dead': len(result.dead_tokens),
+        },
+    })
+
+
+SENDERS = {
+    'new_job': _send_new_job,
+    'segment': _send_segment,
+}
+
+
+# Enqueueing
+
+def enqueue_job_notification(job):
+    """Queue the "new job" push for ``job`` in the current transaction."""
+    notification = NotificationOutbox.objects.create(kind='new_job', job=job)
+    _kick_after_commit(notification)
+    return notification
+
+
+def enqueue_segment_notification(segments, title, body, data=None, job=None):
+    """Queue a push to every user in any of ``segments`` (see ``audiences``)."""
+    payload = {'segments': list(segments), 'title': title, 'body': body}
+    if data:
+        # FCM data payloads only carry strings.
+        payload['data'] = {key: str(value) for key, value in data.items()}
+    notification = NotificationOutbox.objects.create(kind='segment', job=job, payload=payload)
+    _kick_after_commit(notification)
+    return notification
+
+
+def _kick_after_commit(notification):
+    if _setting('NOTIFICATIONS_RUN_IN_PROCESS', True):
+        transaction.on_commit(kick)
+    elif _setting('NOTIFICATIONS_DRAIN_ON_COMMIT', False):
+        # No worker outlives the response: send this one now, best effort
+        transaction.on_commit(lambda: _deliver_quietly(notification.pk))
+
+
+def _deliver_quietly(notification_id):
+    try:
+        # The request doesn't wait for the rate limit: the cron drain sends it then
+        deliver(notification_id, wait=False)
+    except Exception:
+        # Still pending: a later drain picks it up
+        logger.exception(f'Delivering notification {notification_id} after commit failed')
+
+
+# Delivery
+
+_executor = None
+_executor_lock = threading.Lock()
+_retry_timer = None
+_limiter = None
+
+
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(_setting('NOTIFICATION_RATE_LIMIT', 10))
+    return _limiter
+
+
+def kick():
+    """Drain the outbox on the background worker thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # A single worker keeps drains serialised within the process.
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+        _executor.submit(_drain_in_thread)
+
+
+def _drain_in_thread():
+    close_old_connections()
+    try:
+        drain()
+        _schedule_retry()
+    except Exception:
+        logger.exception('Notification outbox drain failed')
+    finally:
+        close_old_connections()
+
+
+def _schedule_retry():
+    """Wake the worker when the next retry falls due."""
+    global _retry_timer
+    next_due = (
+        NotificationOutbox.objects.filter(state='pending')
+        .order_by('next_attempt_at')
+        .values_list('next_attempt_at', flat=True)
+        .first()
+    )
+    if next_due is None:
+        return
+    delay = max(0.0, (next_due - timezone.now()).total_seconds())
+    with _executor_lock:
+        if _retry_timer is not None:
+            _retry_timer.cancel()
+        _retry_timer = threading.Timer(delay, kick)
+        _retry_timer.daemon = True
+        _retry_timer.start()
+
+
+def claim(notification_id):
+    """
+    Lease a due notification for this worker. Returns False if it is not due
+    or another worker holds it.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=_setting('NOTIFICATION_LEASE_SECONDS', 120))
+    return bool(
+        NotificationOutbox.objects.filter(
+            pk=notification_id, state='pending', next_attempt_at__lte=now
+        ).update(next_attempt_at=now + lease, attempts=F('attempts') + 1)
+    )
+
+
+def deliver(notification_id, wait=True):
+    """
+    Claim and send one notification. Returns True if it was sent. Unless
+    ``wait`` is set, leaves it pending if the rate limit allows no send now.
+    """
+    # Checked before claiming, so a send put off doesn't use up an attempt
+    if not wait and not get_rate_limiter().try_acquire():
+        return False
+    if not claim(notification_id):
+        return False
+
+    notification = NotificationOutbox.objects.select_related('job').get(pk=notification_id)
+    if wait:
+        get_rate_limiter().acquire()
+    try:
+        SENDERS[notification.kind](notification)
+    except SkipNotification as e:
+        logger.warning(f"Skipping notification {notification.pk}: {e}")
+        NotificationOutbox.objects.filter(pk=notification.pk).update(state='skipped', last_error=str(e))
+        return False
+    except Exception as e:
+        max_attempts = _setting('NOTIFICATION_MAX_ATTEMPTS', 6)
+        if notification.attempts >= max_attempts:
+            logger.error(f"Giving up on notification {notification.pk} after {notification.attempts} attempts: {e}")
+            NotificationOutbox.objects.filter(pk=notification.pk).update(state='failed', last_error=str(e))
+        else:
+            retry_at = timezone.now() + timedelta(seconds=backoff_delay(notification.attempts))
+            logger.warning(f"Notification {notification.pk} attempt {notification.attempts} failed: {e}")
+            NotificationOutbox.objects.filter(pk=notification.pk).update(
+                next_attempt_at=retry_at, last_error=str(e)
+            )
+        return False
+
+    NotificationOutbox.objects.filter(pk=notification.pk).update(
+        state='sent', sent_at=timezone.now(), last_error=''
+    )
+    return True
+
+
+def drain(limit=None):
+    """Deliver all due notifications, oldest first. Returns how many were sent."""
+    due = (
+        NotificationOutbox.objects.filter(state='pending', next_attempt_at__lte=timezone.now())
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)
+    )
+    sent = 0
+    for notification_id in list(due[:limit]):
+        if deliver(notification_id):
+            sent += 1
+    return sent
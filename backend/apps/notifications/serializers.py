@@ -0,0 +1,56 @@
+"""
+Notification serializers.
+"""
+from rest_framework import serializers
+
+from apps.jobs.models import Job
+from . import audiences
+from .models import NotificationOutbox
+
+
+class SegmentPushSerializer(serializers.Serializer):
+    """
+    Validate a targeted push. ``segments`` are audience keys such as
+    ``skill:python``; passing ``job`` also targets users whose skills match
+    the job's ``skills_required`` and defaults the title and body to the job's.
+    """
+    
+    segments = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all(), required=False)
+    title = serializers.CharField(max_length=255, required=False)
+    body = serializers.CharField(max_length=1000, required=False)
+    data = serializers.DictField(child=serializers.CharField(), required=False)
+    
+    def validate_segments(self, value):
+        try:
+            return [audiences.parse_segment(segment) for segment in value]
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+    
+    def validate(self, attrs):
+        job = attrs.get('job')
+        segments = list(attrs['segments'])
+        data = dict(attrs.get('data') or {})
+        if job is not None:
+            segments += audiences.job_skill_segments(job)
+            attrs.setdefault('title', f"New Job: {job.title}")
+            attrs.setdefault('body', f"{job.company} - {job.location or 'Location not specified'}")
+            data.setdefault('job_id', str(job.id))
+            data.setdefault('click_action', 'OPEN_JOB_DETAIL')
+        if not segments:
+            raise serializers.ValidationError({'segments': 'At least one segment is required.'})
+        for field in ('title', 'body'):
+            if not attrs.get(field):
+                raise serializers.ValidationError({field: 'This field is required.'})
+        attrs['segments'] = list(dict.fromkeys(segments))
+        attrs['data'] = data
+        return attrs
+
+
+class SegmentNotificationSerializer(serializers.ModelSerializer):
+    """Serializer for a queued segment push."""
+    
+    class Meta:
+        model = NotificationOutbox
+        fields = ['id', 'kind', 'job', 'payload', 'state', 'attempts', 'created_at', 'sent_at']
+        read_only_fields = fields
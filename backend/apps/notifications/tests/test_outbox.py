@@ -0,0 +1,68 @@
+"""
+Sending the notification queued by a request (see
+apps.notifications.outbox): left to the worker or cron drain by default;
+with ``NOTIFICATIONS_DRAIN_ON_COMMIT`` sent after commit, but never waiting
+for the rate limit.
+"""
+import time
+
+import pytest
+
+from apps.jobs.models import Job
+from apps.notifications import outbox
+from apps.notifications.models import NotificationOutbox
+from services.fcm_fake import fake_messaging
+
+
+@pytest.fixture(autouse=True)
+def fake_fcm(settings, monkeypatch):
+    settings.FCM_TRANSPORT = 'services.fcm_fake.fake_messaging'
+    fake_messaging.reset()
+    monkeypatch.setattr(outbox, '_limiter', outbox.RateLimiter(rate=0.01, burst=1))
+    yield fake_messaging
+    fake_messaging.reset()
+
+
+def queue_job_push(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        job = Job.objects.create(
+            title='Frontend Intern', company='Acme', description='React', apply_type='external',
+            apply_target='https://example.com/apply', push_on_create=True,
+        )
+        notification = outbox.enqueue_job_notification(job)
+    notification.refresh_from_db()
+    return notification
+
+
+@pytest.mark.django_db
+def test_request_leaves_delivery_to_the_drain(fake_fcm, django_capture_on_commit_callbacks):
+    notification = queue_job_push(django_capture_on_commit_callbacks)
+
+    assert (notification.state, notification.attempts) == ('pending', 0)
+    assert not fake_fcm.sent
+    assert outbox.drain() == 1
+    assert len(fake_fcm.sent) == 1
+
+
+@pytest.mark.django_db
+def test_drain_on_commit_sends_in_the_request(settings, fake_fcm, django_capture_on_commit_callbacks):
+    settings.NOTIFICATIONS_DRAIN_ON_COMMIT = True
+
+    notification = queue_job_push(django_capture_on_commit_callbacks)
+
+    assert notification.state == 'sent'
+    assert len(fake_fcm.sent) == 1
+
+
+@pytest.mark.django_db
+def test_drain_on_commit_does_not_wait_for_the_rate_limit(settings, fake_fcm, django_capture_on_commit_callbacks):
+    settings.NOTIFICATIONS_DRAIN_ON_COMMIT = True
+    outbox.get_rate_limiter().acquire()  # Next send allowed in 100 seconds
+
+    started = time.monotonic()
+    notification = queue_job_push(django_capture_on_commit_callbacks)
+
+    assert time.monotonic() - started < 1
+    assert (notification.state, notification.attempts) == ('pending', 0)
+    assert not fake_fcm.sent
+    assert NotificationOutbox.objects.filter(state='pending').count() == 1
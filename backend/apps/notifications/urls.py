@@ -0,0 +1,10 @@
+"""
+Notifications URL configuration.
+"""
+from django.urls import path
+from .views import SegmentListView, SegmentPushView
+
+urlpatterns = [
+    path('segments/', SegmentListView.as_view(), name='segment_list'),
+    path('segments/send/', SegmentPushView.as_view(), name='segment_push'),
+]
@@ -0,0 +1,54 @@
+"""
+Targeted push notification views (admin only).
+"""
+from django.db import transaction
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from apps.jobs.permissions import IsAdminUser
+from . import audiences, outbox
+from .serializers import SegmentPushSerializer, SegmentNotificationSerializer
+
+
+class SegmentListView(APIView):
+    """
+    List push segments and their sizes.
+    
+    Query params:
+    - kind: job_type or skill (optional)
+    """
+    
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        kind = request.query_params.get('kind')
+        if kind and kind not in audiences.SEGMENT_KINDS:
+            return Response(
+                {'error': f"kind must be one of: {', '.join(audiences.SEGMENT_KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        sizes = audiences.segment_sizes(kind)
+        return Response({
+            'segments': [{'segment': segment, 'members': members} for segment, members in sizes.items()],
+        })
+
+
+class SegmentPushView(APIView):
+    """Queue a push to every user in the given segments (admin only)."""
+    
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request):
+        serializer = SegmentPushSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        with transaction.atomic():
+            notification = outbox.enqueue_segment_notification(
+                data['segments'], data['title'], data['body'], data=data['data'], job=data.get('job'),
+            )
+        
+        response = SegmentNotificationSerializer(notification).data
+        response['audience'] = audiences.segment_users(data['segments']).exclude(fcm_token='').count()
+        return Response(response, status=status.HTTP_202_ACCEPTED)
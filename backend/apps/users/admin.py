@@ -18,7 +18,7 @@ class UserAdmin(BaseUserAdmin):
     ordering = ['-date_joined']
     
     fieldsets = BaseUserAdmin.fieldsets + (
-        ('Profile', {'fields': ('phone', 'resume_url', 'profile_complete')}),
+        ('Profile', {'fields': ('phone', 'resume_url', 'skills', 'profile_complete')}),
         ('App Settings', {'fields': ('role', 'fcm_token')}),
     )
     
@@ -17,6 +17,7 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='user')
     phone = models.CharField(max_length=20, blank=True)
     resume_url = models.URLField(blank=True)
+    skills = models.TextField(blank=True)  # Comma-separated, matched against Job.skills_required
     fcm_token = models.CharField(max_length=255, blank=True)
     profile_complete = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -45,7 +45,7 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'username', 'first_name', 'last_name', 
-                  'phone', 'resume_url', 'role', 'is_admin', 'profile_complete', 
+                  'phone', 'resume_url', 'skills', 'role', 'is_admin', 'profile_complete', 
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'email', 'role', 'is_admin', 'created_at', 'updated_at']
 
@@ -55,7 +55,7 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = ['first_name', 'last_name', 'phone', 'resume_url', 'profile_complete']
+        fields = ['first_name', 'last_name', 'phone', 'resume_url', 'skills', 'profile_complete']
 
 
 class FCMTokenSerializer(serializers.Serializer):
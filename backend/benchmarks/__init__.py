@@ -0,0 +1,2 @@
+# Benchmark helpers shared by the bench_* management commands. Installed as
+# an app for the commands that benchmark the project-level setup.
@@ -0,0 +1,6 @@
+"""``config.asgi`` with the simulated query latency of ``benchmarks.latency``."""
+from config.asgi import application  # noqa: F401
+
+from .latency import delay_queries
+
+delay_queries()
@@ -0,0 +1,94 @@
+"""
+HTTP clients for load tests.
+
+``WSGIClient`` sends requests in-process, through Django's ``WSGIHandler`` as
+they would go under a threaded WSGI server: ``request_started`` and
+``request_finished`` fire, so database connections are closed, kept or
+returned to the pool as configured, and each thread uses its own connection.
+Django's test ``Client`` disconnects those signals, which hides connection
+costs.
+
+``http_request`` sends one request over a socket to a real server (gunicorn,
+uvicorn), from asyncio, so one process can hold thousands of requests open
+at once.
+"""
+import asyncio
+import io
+import sys
+from collections import namedtuple
+
+from django.core.handlers.wsgi import WSGIHandler
+
+WSGIResponse = namedtuple('WSGIResponse', ['status_code', 'headers', 'content'])
+
+
+class WSGIClient:
+    """Send requests straight to a WSGI application (a new ``WSGIHandler`` by default). Thread-safe."""
+
+    def __init__(self, host='localhost', handler=None):
+        self.handler = handler or WSGIHandler()
+        self.host = host
+
+    def request(self, method, path, query_string='', body=b'', content_type='', headers=None):
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': query_string,
+            'CONTENT_TYPE': content_type,
+            'CONTENT_LENGTH': str(len(body)),
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host,
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in (headers or {}).items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        started = []
+
+        def start_response(status, response_headers, exc_info=None):
+            started.append((status, response_headers))
+
+        response = self.handler(environ, start_response)
+        try:
+            content = b''.join(response)
+        finally:
+            # Fires request_finished, where Django closes or keeps the connection
+            response.close()
+        status, response_headers = started[0]
+        return WSGIResponse(int(status.split(' ', 1)[0]), dict(response_headers), content)
+
+    def get(self, path, query_string='', headers=None):
+        return self.request('GET', path, query_string=query_string, headers=headers)
+
+    def post(self, path, body=b'', content_type='application/json', headers=None):
+        return self.request('POST', path, body=body, content_type=content_type, headers=headers)
+
+
+async def http_request(host, port, method, path, body=b'', headers=None, timeout=60.0):
+    """
+    Send one HTTP/1.1 request on a new connection and read the response until
+    the server closes it. Chunked bodies are returned as received.
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {host}', 'Connection: close', f'Content-Length: {len(body)}']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, content = raw.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in header_lines if ': ' in line)
+    return WSGIResponse(int(status_line.split(' ', 2)[1]), response_headers, content)
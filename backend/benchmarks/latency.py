@@ -0,0 +1,32 @@
+"""
+Simulated database round trips for load tests against real servers.
+
+A local database answers in well under a millisecond, so a benchmark against
+it hides what a worker does while it waits for a managed database over the
+network. ``BENCH_DB_LATENCY_MS`` adds that wait to every query, holding the
+connection as a real round trip would. The ``benchmarks.wsgi`` and
+``benchmarks.asgi`` entry points apply it (see bench_asgi).
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+
+def delay_queries(ms=None):
+    """Sleep ``ms`` (default ``BENCH_DB_LATENCY_MS``) before every query on every new connection."""
+    if ms is None:
+        ms = float(os.getenv('BENCH_DB_LATENCY_MS') or 0)
+    if not ms:
+        return
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(ms / 1000)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            # First, so the execute_wrapper() blocks of others still pop their own
+            connection.execute_wrappers.insert(0, delay)
+
+    connection_created.connect(install, weak=False)
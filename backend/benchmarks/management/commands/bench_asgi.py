@@ -0,0 +1,273 @@
+"""
+Benchmark applying under real servers: WSGI on gunicorn sync workers (and
+gthread workers, for reference) against ASGI on uvicorn, where
+``ASYNC_VIEWS`` serves the apply and upload endpoints with async views.
+
+For each server the command starts it on the seeded load-test dataset (see
+seed_load_data), then per scenario opens --requests connections at once, each
+sending one request as a different student: a click on one external job,
+an in-app application, or a resume upload. It reports throughput, latency
+from send to response, status codes and connection errors, and checks that
+the in-app run created one application per 201.
+
+A local database answers in well under a millisecond, and async views only
+help while a request waits on I/O. --db-latency-ms adds a simulated round trip
+to every query in the servers (see benchmarks.latency); try the latency to
+your managed database. Client and servers share the machine's CPUs.
+
+The servers inherit the environment, so ``ASGI_MAX_CONCURRENCY=0`` measures
+uvicorn without admission control (see config.concurrency).
+
+    python manage.py bench_asgi --requests 1000 --workers 2 --db-latency-ms 0 5
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.applications import clicks
+from apps.applications.models import Application, ClickEvent
+from apps.jobs.models import Job
+from benchmarks import seed
+from benchmarks.client import http_request
+from benchmarks.utils import summarize
+
+SERVERS = ('gunicorn_sync', 'gunicorn_gthread', 'uvicorn')
+
+SCENARIOS = ('apply_click', 'apply_in_app', 'upload')
+
+APPLICATION_FORM = {'name': 'Load Student', 'email': 'load-student@example.com', 'phone': '9700000000'}
+
+HOST = '127.0.0.1'
+
+BOUNDARY = 'bench-asgi-boundary'
+
+
+class Command(BaseCommand):
+    help = 'Compare simultaneous applies on gunicorn (WSGI) and uvicorn (ASGI, async views)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument('--requests', type=int, default=1000, help='Simultaneous requests per scenario')
+        parser.add_argument('--workers', type=int, default=2, help='Server processes')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn gthread worker')
+        parser.add_argument('--db-latency-ms', type=float, nargs='+', default=[0.0])
+        parser.add_argument('--conn-mode', choices=['none', 'persistent', 'pool'], default='pool',
+                            help='DB_CONN_MODE of the servers (uvicorn never keeps connections between requests)')
+        parser.add_argument('--upload-kb', type=int, default=100)
+        parser.add_argument('--timeout', type=float, default=120.0, help='Seconds one request may take')
+        parser.add_argument('--output', help='Also write the JSON results to this file')
+
+    def handle(self, *args, **options):
+        if seed.dataset_counts() is None:
+            raise CommandError('No load-test dataset: run seed_load_data first')
+        if connection.vendor == 'sqlite':
+            self.stderr.write('SQLite serializes writes across processes: use PostgreSQL for meaningful results.')
+        self.students = list(seed.students().order_by('pk'))
+        self.tokens = [f'Bearer {AccessToken.for_user(student)}' for student in self.students]
+
+        results = []
+        for latency in options['db_latency_ms']:
+            for server in options['servers']:
+                results += self.bench_server(server, latency, options)
+
+        output = json.dumps({'options': self.reported_options(options), 'runs': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fp:
+                fp.write(output + '\n')
+        self.stdout.write(output)
+
+    def reported_options(self, options):
+        return {
+            'database': connection.vendor,
+            'cpus': os.cpu_count(),
+            # The servers inherit it from this environment
+            'asgi_max_concurrency': settings.ASGI_MAX_CONCURRENCY,
+            **{name: options[name] for name in ('requests', 'workers', 'threads', 'conn_mode', 'upload_kb')},
+        }
+
+    # Servers
+
+    def command(self, server, port, options):
+        if server == 'uvicorn':
+            return [
+                sys.executable, '-m', 'uvicorn', 'benchmarks.asgi:application', '--host', HOST, '--port', str(port),
+                '--workers', str(options['workers']), '--lifespan', 'off', '--no-access-log',
+                '--log-level', 'warning', '--backlog', '4096',
+            ]
+        command = [
+            sys.executable, '-m', 'gunicorn', 'benchmarks.wsgi:application', '--bind', f'{HOST}:{port}',
+            '--workers', str(options['workers']), '--backlog', '4096', '--timeout', str(int(options['timeout'])),
+        ]
+        if server == 'gunicorn_gthread':
+            command += ['--worker-class', 'gthread', '--threads', str(options['threads'])]
+        return command
+
+    def environment(self, server, latency, options):
+        env = {
+            **os.environ,
+            'PYTHONPATH': os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.getenv('PYTHONPATH')])),
+            'ALLOWED_HOSTS': HOST,
+            'DEBUG': 'False',
+            # WhiteNoise is sync-only middleware (see config/asgi.py); both sides skip it
+            'API_ONLY': 'True',
+            'DB_CONN_MODE': options['conn_mode'],
+            'BENCH_DB_LATENCY_MS': str(latency),
+        }
+        env.pop('ASYNC_VIEWS', None)
+        env.pop('DB_CONN_MAX_AGE', None)
+        if server != 'uvicorn':
+            env['ASYNC_VIEWS'] = 'False'
+        return env
+
+    def start(self, server, latency, options):
+        with socket.socket() as sock:
+            sock.bind((HOST, 0))
+            port = sock.getsockname()[1]
+        # A file, not a pipe: a full pipe would block the server's logging
+        log = tempfile.TemporaryFile(mode='w+')
+        process = subprocess.Popen(
+            self.command(server, port, options), env=self.environment(server, latency, options),
+            cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=log,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                log.seek(0)
+                raise CommandError(f'{server} exited:\n{log.read()[-3000:]}')
+            try:
+                if asyncio.run(http_request(HOST, port, 'GET', '/health/live/', timeout=5)).status_code == 200:
+                    return process, port
+            except OSError:
+                pass
+            time.sleep(0.2)
+        self.stop(process)
+        raise CommandError(f'{server} did not answer within 60 s')
+
+    def stop(self, process):
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    # Runs
+
+    def bench_server(self, server, latency, options):
+        run_jobs, requests = self.setup(options)
+        process, port = self.start(server, latency, options)
+        results = []
+        try:
+            # Open the workers' database pools before measuring
+            asyncio.run(self.fire(port, [('GET', '/health/ready/', b'', {})] * options['workers'] * 4, options))
+            for scenario in options['scenarios']:
+                result = self.bench_scenario(port, requests[scenario], options)
+                result.update(server=server, scenario=scenario, db_latency_ms=latency)
+                if scenario == 'apply_in_app':
+                    result['created'] = Application.objects.filter(job__in=run_jobs[1:]).count()
+                    result['created_ok'] = result['created'] == result['statuses'].get('201', 0)
+                results.append(result)
+                self.stderr.write(
+                    f"{server} {scenario} ({latency:g} ms/query): {result['throughput_rps']} req/s, "
+                    f"p50 {result['latency']['p50_ms']} ms, p95 {result['latency']['p95_ms']} ms, "
+                    f"statuses {result['statuses']}, errors {result['errors']}"
+                )
+        finally:
+            self.stop(process)
+            self.teardown(run_jobs)
+        return results
+
+    def setup(self, options):
+        """Jobs for this server's run, and the requests of each scenario."""
+        count = options['requests']
+        if count > len(self.students):
+            raise CommandError(f'--requests {count} needs as many students; the dataset has {len(self.students)}')
+
+        def run_job(apply_type, title):
+            return Job.objects.create(
+                title=title, company='Load Test', description='Created by bench_asgi',
+                apply_type=apply_type, apply_target='https://example.com/apply',
+            )
+
+        # Everyone clicks one external job (as after a push); one in-app job per student
+        click_job = run_job('external', 'ASGI Benchmark Click Target')
+        in_app_job = run_job('in_app', 'ASGI Benchmark Form Target')
+        self.run_id = uuid.uuid4().hex[:8]
+        form = json.dumps(APPLICATION_FORM).encode()
+        resume = b'%PDF-1.4\n' + os.urandom(options['upload_kb'] * 1024)
+        requests = {'apply_click': [], 'apply_in_app': [], 'upload': []}
+        for token in self.tokens[:count]:
+            headers = {'Authorization': token, 'Content-Type': 'application/json'}
+            requests['apply_click'].append(
+                ('POST', reverse('apply_to_job', kwargs={'pk': click_job.pk}), b'{}', headers)
+            )
+            requests['apply_in_app'].append(
+                ('POST', reverse('apply_to_job', kwargs={'pk': in_app_job.pk}), form, headers)
+            )
+            requests['upload'].append((
+                'POST', reverse('upload_resume'), self.multipart(resume),
+                {'Authorization': token, 'Content-Type': f'multipart/form-data; boundary={BOUNDARY}'},
+            ))
+        return [click_job, in_app_job], requests
+
+    def multipart(self, content):
+        return (
+            f'--{BOUNDARY}\r\n'
+            f'Content-Disposition: form-data; name="resume"; filename="bench-asgi-{self.run_id}.pdf"\r\n'
+            'Content-Type: application/pdf\r\n\r\n'
+        ).encode() + content + f'\r\n--{BOUNDARY}--\r\n'.encode()
+
+    def teardown(self, run_jobs):
+        clicks.flush_and_fold()
+        job_ids = [job.pk for job in run_jobs]
+        ClickEvent.objects.filter(job_id__in=job_ids).delete()
+        Job.objects.filter(pk__in=job_ids).delete()
+        for student in self.students:
+            name = f'resumes/{student.id}_bench-asgi-{self.run_id}.pdf'
+            if default_storage.exists(name):
+                default_storage.delete(name)
+
+    def bench_scenario(self, port, requests, options):
+        started = time.perf_counter()
+        samples = asyncio.run(self.fire(port, requests, options))
+        elapsed = time.perf_counter() - started
+        completed = [ms for ms, status in samples if isinstance(status, int)]
+        statuses = Counter(status for _, status in samples if isinstance(status, int))
+        errors = Counter(status for _, status in samples if not isinstance(status, int))
+        return {
+            'requests': len(samples),
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round(len(completed) / elapsed, 1),
+            'latency': summarize(completed),
+            'statuses': {str(code): count for code, count in sorted(statuses.items())},
+            'errors': dict(errors),
+        }
+
+    async def fire(self, port, requests, options):
+        """Send every request at once; returns ``(ms, status code or error name)`` for each."""
+
+        async def send(method, path, body, headers):
+            start = time.perf_counter()
+            try:
+                response = await http_request(HOST, port, method, path, body, headers, timeout=options['timeout'])
+                status = response.status_code
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+                status = type(e).__name__
+            return (time.perf_counter() - start) * 1000, status
+
+        return await asyncio.gather(*(send(*request) for request in requests))
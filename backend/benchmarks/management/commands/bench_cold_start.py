@@ -0,0 +1,181 @@
+"""
+Benchmark cold starts of the WSGI entry point (config/wsgi.py), as on Vercel.
+
+Every run is a fresh interpreter that imports ``config.wsgi`` and sends one
+request, then a second one. ``cold_start_ms`` is the time from spawning the
+process to the first response. Each variant sets its own environment (e.g.
+``API_ONLY``, ``WSGI_WARM_UP``). One more run per variant goes under
+``-X importtime``; the slowest modules and packages are reported, and the raw
+report is kept with --importtime-dir.
+
+S3 and Firebase are configured with dummy values in the children. The command
+fails if a module in DEFERRED_MODULES is imported by the first response, or if
+the --budget-variant misses --budget-ms at the median.
+
+    python manage.py bench_cold_start --runs 10 --path /api/jobs/
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.utils import summarize
+
+VARIANTS = {
+    'baseline': {'API_ONLY': 'False', 'WSGI_WARM_UP': 'False'},
+    'warm_up': {'API_ONLY': 'False', 'WSGI_WARM_UP': 'True'},
+    'api_only': {'API_ONLY': 'True', 'WSGI_WARM_UP': 'True'},
+}
+
+# Must not be imported before the first request that needs them
+DEFERRED_MODULES = (
+    'boto3', 'botocore', 'storages.backends.s3boto3', 'firebase_admin', 'google.cloud', 'openpyxl', 'pyarrow',
+)
+
+# Median cold start (ms) allowed for the API-only entry point: measured at about
+# 610 ms on one vCPU (with 591 collected static files), plus ~20% headroom
+COLD_START_BUDGET_MS = 750
+
+# Dummy credentials, so an eager import of boto3 or firebase_admin shows up
+CHILD_ENV = {
+    'AWS_ACCESS_KEY_ID': 'bench-cold-start',
+    'AWS_SECRET_ACCESS_KEY': 'bench-cold-start',
+    'AWS_STORAGE_BUCKET_NAME': 'bench-cold-start',
+    'FIREBASE_CREDENTIALS_PATH': '/nonexistent/firebase-credentials.json',
+}
+
+CHILD = '''
+import json, resource, sys, time
+imported_at = time.time()
+from config.wsgi import application
+ready_at = time.time()
+from benchmarks.client import WSGIClient
+client = WSGIClient(host=sys.argv[2], handler=application)
+status = client.get(sys.argv[1]).status_code
+first_at = time.time()
+modules = len(sys.modules)
+deferred = [name for name in sys.argv[3].split(',') if name in sys.modules]
+start = time.perf_counter()
+client.get(sys.argv[1])
+second_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'imported_at': imported_at, 'ready_at': ready_at, 'first_at': first_at, 'second_ms': second_ms,
+    'status': status, 'modules': modules, 'deferred': deferred,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+'''
+
+_IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start time, imports and memory of the WSGI entry point in fresh processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+        parser.add_argument('--runs', type=int, default=10, help='Fresh processes per variant')
+        parser.add_argument('--path', default='/api/jobs/', help='Path of the first request')
+        parser.add_argument('--top', type=int, default=15, help='Slowest modules and packages to report')
+        parser.add_argument('--vercel', action='store_true', help='Set VERCEL=1 in the children')
+        parser.add_argument('--importtime-dir', help='Keep the raw -X importtime report of each variant here')
+        parser.add_argument('--budget-variant', choices=VARIANTS, default='api_only')
+        parser.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS)
+
+    def handle(self, *args, **options):
+        host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost'
+        if host == '*':
+            host = 'localhost'
+        runs, children = {}, {}
+        for name in options['variants']:
+            env = {**os.environ, **CHILD_ENV, **VARIANTS[name], 'PYTHONPATH': str(settings.BASE_DIR)}
+            if options['vercel']:
+                env['VERCEL'] = '1'
+            children[name] = ([CHILD, options['path'], host, ','.join(DEFERRED_MODULES)], env)
+            runs[name] = []
+        # Interleave the variants so drift on the machine affects all of them alike
+        for _ in range(options['runs']):
+            for name, (args, env) in children.items():
+                runs[name].append(self.run(args, env))
+
+        results = {}
+        for name, (args, env) in children.items():
+            results[name] = {
+                'cold_start': summarize([run['cold_start_ms'] for run in runs[name]]),
+                'interpreter_ms': round(statistics.median(run['interpreter_ms'] for run in runs[name]), 1),
+                'import_ms': round(statistics.median(run['import_ms'] for run in runs[name]), 1),
+                'first_request_ms': round(statistics.median(run['first_request_ms'] for run in runs[name]), 1),
+                'second_request_ms': round(statistics.median(run['second_ms'] for run in runs[name]), 2),
+                'status': runs[name][0]['status'],
+                'modules': runs[name][0]['modules'],
+                'rss_mb': round(statistics.median(run['rss_mb'] for run in runs[name]), 1),
+                'deferred_loaded': sorted({module for run in runs[name] for module in run['deferred']}),
+                'imports': self.importtime(name, args, env, options),
+            }
+            self.stderr.write(f"{name}: median cold start {results[name]['cold_start']['p50_ms']} ms")
+
+        budget = options['budget_ms']
+        checked = results.get(options['budget_variant'])
+        if checked is not None:
+            results['budget'] = {
+                'variant': options['budget_variant'],
+                'budget_ms': budget,
+                'median_ms': checked['cold_start']['p50_ms'],
+                'ok': checked['cold_start']['p50_ms'] <= budget,
+            }
+        self.stdout.write(json.dumps(results, indent=2))
+
+        eager = {name: result['deferred_loaded'] for name, result in results.items() if result.get('deferred_loaded')}
+        if eager:
+            raise CommandError(f'Imported before first use: {eager}')
+        if checked is not None and not results['budget']['ok']:
+            raise CommandError(
+                f"{options['budget_variant']} cold start {checked['cold_start']['p50_ms']} ms is over "
+                f'the {budget:.0f} ms budget'
+            )
+
+    def run(self, args, env, *flags):
+        spawned_at = time.time()
+        completed = subprocess.run(
+            [sys.executable, *flags, '-c', *args], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f'Cold start failed:\n{completed.stderr[-3000:]}')
+        run = json.loads(completed.stdout.strip().splitlines()[-1])
+        run['interpreter_ms'] = (run['imported_at'] - spawned_at) * 1000
+        run['import_ms'] = (run['ready_at'] - run['imported_at']) * 1000
+        run['first_request_ms'] = (run['first_at'] - run['ready_at']) * 1000
+        run['cold_start_ms'] = (run['first_at'] - spawned_at) * 1000
+        run['stderr'] = completed.stderr
+        return run
+
+    def importtime(self, name, args, env, options):
+        """Slowest top-level imports (cumulative) and packages (self time) of one -X importtime run."""
+        report = self.run(args, env, '-X', 'importtime')['stderr']
+        if options['importtime_dir']:
+            directory = Path(options['importtime_dir'])
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f'{name}.txt').write_text(report)
+
+        modules, packages, total = [], Counter(), 0
+        for match in _IMPORTTIME.finditer(report):
+            self_us, cumulative_us, indent, module = int(match[1]), int(match[2]), len(match[3]), match[4]
+            total += self_us
+            packages[module.split('.')[0]] += self_us
+            if indent <= 2:
+                modules.append((cumulative_us, module))
+        modules.sort(reverse=True)
+        return {
+            'total_ms': round(total / 1000, 1),
+            'slowest_modules_ms': {module: round(us / 1000, 1) for us, module in modules[:options['top']]},
+            'slowest_packages_ms': {
+                package: round(us / 1000, 1) for package, us in packages.most_common(options['top'])
+            },
+        }
@@ -0,0 +1,129 @@
+"""
+Load test the database connection modes (DB_CONN_MODE) against the
+configured database.
+
+Each mode runs in its own process with that mode set, where --concurrency
+threads send GET /api/jobs/<id>/ through Django's WSGI handler. Connections
+are opened, reused or returned to the pool as they would be under gunicorn's
+threaded workers. The run creates one job and one student, commits them, and
+deletes them afterwards.
+
+Point DATABASE_URL at a local PostgreSQL for meaningful numbers. Add
+``?sslmode=require`` to include TLS handshakes in the connection cost.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.jobs.models import Job
+from benchmarks.client import WSGIClient
+from benchmarks.utils import summarize
+
+MODES = ('none', 'persistent', 'pool')
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with per-request, persistent and pooled database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        # Internal: run one mode in this process
+        parser.add_argument('--worker', action='store_true', help='(internal)')
+        parser.add_argument('--job', type=int)
+        parser.add_argument('--token')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            self.stdout.write(json.dumps(self.drive(options)))
+            return
+
+        modes = options['modes']
+        if connection.vendor != 'postgresql':
+            self.stderr.write(f'Database is {connection.vendor}, not PostgreSQL: skipping pool mode.')
+            modes = [mode for mode in modes if mode != 'pool']
+
+        User = get_user_model()
+        user = User.objects.create(username='bench-conn-student', email='bench-conn@example.com')
+        job = Job.objects.create(
+            title='Connection Benchmark Engineer', company='Bench', description='Load test job',
+            apply_type='external', apply_target='https://example.com/apply',
+        )
+        token = str(AccessToken.for_user(user))
+        results = []
+        try:
+            for mode in modes:
+                results.append(self.run_mode(mode, job.pk, token, options))
+        finally:
+            job.delete()
+            user.delete()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_mode(self, mode, job_id, token, options):
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'bench_db_connections', '--worker',
+            '--job', str(job_id), '--token', token,
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+        ]
+        env = {**os.environ, 'DB_CONN_MODE': mode}
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f'{mode} run failed:\n{process.stderr}')
+        return {'mode': mode, **json.loads(process.stdout.strip().splitlines()[-1])}
+
+    def drive(self, options):
+        from config.db.stats import connection_report, connection_stats
+
+        client = WSGIClient()
+        path = reverse('job_detail', kwargs={'pk': options['job']})
+        headers = {'Authorization': f"Bearer {options['token']}"}
+        errors = []
+        lock = threading.Lock()
+
+        def request():
+            response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                with lock:
+                    errors.append(response.status_code)
+
+        def worker(count):
+            samples = []
+            for _ in range(count):
+                start = time.perf_counter()
+                request()
+                samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        concurrency = options['concurrency']
+        per_thread = [options['requests'] // concurrency] * concurrency
+        for i in range(options['requests'] % concurrency):
+            per_thread[i] += 1
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            # Warm up imports, URL resolution and the pool before measuring
+            list(executor.map(worker, [2] * concurrency))
+            connection_stats.reset()
+            started = time.perf_counter()
+            samples = [sample for chunk in executor.map(worker, per_thread) for sample in chunk]
+            elapsed = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(f'{len(errors)} failed requests, e.g. {errors[0]}')
+        return {
+            'latency': summarize(samples),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'connections': connection_report()['databases']['default'],
+        }
@@ -0,0 +1,56 @@
+"""
+Benchmark the health endpoints through the full middleware stack.
+
+Readiness and migrations are timed twice: served from the per-process cache
+(what almost every poll sees) and with the cache cleared before each request
+(one poll per HEALTH_CHECK_TTL). ``/db-status/`` used to run ``migrate`` on
+every request; it now shares the cached migrations check.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.client import WSGIClient
+from benchmarks.utils import counting_queries, summarize
+from config import health
+
+ENDPOINTS = {
+    'live': ('/health/live/', None),
+    'ready': ('/health/ready/', health.readiness),
+    'migrations': ('/health/migrations/', health.migrations),
+    'db_status': ('/db-status/', health.migrations),
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure latency and queries of the liveness, readiness and migration checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500)
+
+    def handle(self, *args, **options):
+        client = WSGIClient()
+        results = {}
+        for name, (path, check) in ENDPOINTS.items():
+            variants = {'cached': False, 'uncached': True} if check is not None else {'': False}
+            for variant, reset in variants.items():
+                samples, queries, statuses = [], [], set()
+                for i in range(options['repeat'] + 2):
+                    if reset:
+                        check.reset()
+                    with counting_queries() as counter:
+                        start = time.perf_counter()
+                        response = client.get(path)
+                        elapsed = (time.perf_counter() - start) * 1000
+                    if i >= 2:
+                        samples.append(elapsed)
+                        queries.append(counter['queries'])
+                        statuses.add(response.status_code)
+                results[f'{name}_{variant}'.rstrip('_')] = {
+                    'latency': summarize(samples),
+                    'queries': max(queries),
+                    'statuses': sorted(statuses),
+                }
+
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,91 @@
+"""
+Benchmark the overhead of RequestMetricsMiddleware on the job feed and detail.
+
+Each request goes through the full middleware stack of one of three handlers:
+instrumentation off, on without profiling, and on with every request profiled.
+Requests are interleaved between the handlers so drift (caches, other load on
+the machine) affects all of them alike. All synthetic rows are rolled back.
+"""
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.jobs.models import Job
+from benchmarks.utils import make_jobs, rolled_back, summarize
+from config.instrumentation import request_metrics, slow_queries
+
+VARIANTS = {
+    'off': {'REQUEST_METRICS_ENABLED': False},
+    'on': {'REQUEST_METRICS_ENABLED': True, 'PROFILE_SAMPLE_RATE': 0.0},
+    'profiled': {'REQUEST_METRICS_ENABLED': True, 'PROFILE_SAMPLE_RATE': 1.0, 'PROFILE_MIN_MS': float('inf')},
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with request instrumentation off, on, and profiling every request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=500, help='Requests per endpoint and variant')
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write('DEBUG is on: queries are logged in memory, which inflates latencies.')
+
+        with rolled_back(), override_settings(JOB_FEED_CACHE_TTL=0, SLOW_QUERY_MS=0):
+            make_jobs(options['jobs'])
+            student = get_user_model().objects.create(username='bench-metrics', email='bench-metrics@example.com')
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(student)}'}
+            job_id = Job.objects.filter(active=True).latest('id').pk
+            paths = {
+                'job_list_create': reverse('job_list_create'),
+                'job_detail': reverse('job_detail', kwargs={'pk': job_id}),
+            }
+
+            clients = {}
+            for name, overrides in VARIANTS.items():
+                clients[name] = Client()
+                # The middleware reads its settings when the stack is built
+                with override_settings(**overrides):
+                    clients[name].handler.load_middleware()
+
+            request_metrics.reset()
+            slow_queries.reset()
+            results = {}
+            for endpoint, path in paths.items():
+                samples = {name: [] for name in clients}
+                for client in clients.values():
+                    for _ in range(5):
+                        client.get(path, **headers)
+                for i in range(options['repeat']):
+                    # Rotate the order so no variant always runs first
+                    names = list(clients)
+                    names = names[i % len(names):] + names[:i % len(names)]
+                    for name in names:
+                        start = time.perf_counter()
+                        clients[name].get(path, **headers)
+                        samples[name].append((time.perf_counter() - start) * 1000)
+
+                off = statistics.median(samples['off'])
+                results[endpoint] = {}
+                for name, times in samples.items():
+                    results[endpoint][name] = summarize(times)
+                    if name != 'off':
+                        median = statistics.median(times)
+                        results[endpoint][name]['overhead_us'] = round((median - off) * 1000, 1)
+                        results[endpoint][name]['overhead_pct'] = round((median - off) / off * 100, 2)
+
+            requests, _, _ = request_metrics.snapshot()
+            results['recorded'] = {
+                f'{view} {method} {status}': count for (view, method, status), count in requests.items()
+            }
+
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,91 @@
+"""
+Benchmark DRF's JSONRenderer/JSONParser against the orjson pair in
+config.renderers on real API payloads, and check they render the same bytes
+apart from how float exponents are spelled (see config.renderers).
+All synthetic rows are rolled back when the command finishes.
+"""
+import io
+import json
+import re
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.applications.models import Application
+from apps.applications.serializers import ApplicationListSerializer
+from apps.jobs.models import Job
+from apps.jobs.serializers import JobDetailSerializer, JobListSerializer
+from benchmarks.utils import make_applications, make_jobs, rolled_back, summarize, time_call
+
+# json writes 1e+16 and 1e-07 where orjson writes 1e16 and 1e-7
+FLOAT_EXPONENT = re.compile(rb'(?<=[0-9])e\+?(-?)0*(?=[0-9])')
+
+
+def normalize_floats(body):
+    return FLOAT_EXPONENT.sub(rb'e\1', body)
+
+
+class Command(BaseCommand):
+    help = 'Compare stdlib json and orjson rendering/parsing of API payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            from config.renderers import ORJSONParser, ORJSONRenderer
+        except ImportError:
+            raise CommandError('orjson is not installed (pip install orjson)')
+
+        with rolled_back():
+            make_jobs(1000)
+            Job.objects.update(salary_min=Decimal('300000.00'), salary_max=Decimal('650000.50'))
+            job_ids = list(Job.objects.values_list('pk', flat=True))
+            make_applications(1000, job_ids)
+
+            jobs = Job.objects.select_related('posted_by').order_by('-posted_at')
+            applications = Application.objects.select_related('job', 'user').order_by('-applied_at')
+            payloads = {
+                'job_list_20': self.page(JobListSerializer(jobs[:20], many=True).data),
+                'job_list_100': self.page(JobListSerializer(jobs[:100], many=True).data),
+                'job_detail': JobDetailSerializer(jobs[0]).data,
+                'application_list_100': self.page(ApplicationListSerializer(applications[:100], many=True).data),
+                'application_list_1000': self.page(ApplicationListSerializer(applications[:1000], many=True).data),
+                # Values left for the encoder rather than pre-formatted by serializers
+                'raw_types_1000': [
+                    {'salary': Decimal('123456.78'), 'at': timezone.now(), 'label': gettext_lazy('Pending'), 'n': i}
+                    for i in range(1000)
+                ],
+                'floats_1000': [
+                    {'small': i * 1e-9, 'large': i * 1e16, 'ratio': i / 7, 'whole': float(i)}
+                    for i in range(1000)
+                ],
+            }
+
+        results = {}
+        for name, data in payloads.items():
+            stdlib, fast = JSONRenderer(), ORJSONRenderer()
+            body, fast_body = stdlib.render(data), fast.render(data)
+            if normalize_floats(fast_body) != normalize_floats(body) or json.loads(fast_body) != json.loads(body):
+                raise CommandError(f'{name}: orjson output differs from JSONRenderer')
+
+            render_json = summarize(time_call(lambda: stdlib.render(data), repeat=options['repeat']))
+            render_orjson = summarize(time_call(lambda: fast.render(data), repeat=options['repeat']))
+            parse_json = summarize(time_call(lambda: JSONParser().parse(io.BytesIO(body)), repeat=options['repeat']))
+            parse_orjson = summarize(time_call(lambda: ORJSONParser().parse(io.BytesIO(body)), repeat=options['repeat']))
+            results[name] = {
+                'bytes': len(body),
+                'identical_bytes': fast_body == body,
+                'render_p50_ms': {'json': render_json['p50_ms'], 'orjson': render_orjson['p50_ms']},
+                'parse_p50_ms': {'json': parse_json['p50_ms'], 'orjson': parse_orjson['p50_ms']},
+                'render_speedup': round(render_json['p50_ms'] / render_orjson['p50_ms'], 2) if render_orjson['p50_ms'] else None,
+            }
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def page(self, results):
+        return {'count': len(results), 'next': None, 'previous': None, 'results': results}
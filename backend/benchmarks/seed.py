@@ -0,0 +1,104 @@
+"""
+Seeded, committed datasets for load tests.
+
+Unlike the rolled-back data of single-threaded benchmarks, a load test needs
+rows every worker thread (and connection) can see, and rebuilding a million
+applications per run is too slow. ``seed()`` commits one dataset per
+database: an admin (``load-admin``), students ``load-student-<n>``, jobs
+posted by the admin and applications to those jobs. Content depends only on
+``SCALES[scale]`` and the seed, so two runs on the same scale measure the
+same data. ``clear()`` removes it again.
+
+Use a scratch database: the rows live alongside whatever else is there.
+"""
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+
+from .utils import make_applications, make_jobs, make_users
+
+# Students, jobs and applications per scale (named after the application count)
+SCALES = {
+    '10k': {'users': 1_000, 'jobs': 1_000, 'applications': 10_000},
+    '100k': {'users': 10_000, 'jobs': 5_000, 'applications': 100_000},
+    '1m': {'users': 100_000, 'jobs': 20_000, 'applications': 1_000_000},
+}
+
+ADMIN_USERNAME = 'load-admin'
+STUDENT_PREFIX = 'load-student'
+
+
+def get_admin():
+    return get_user_model().objects.filter(username=ADMIN_USERNAME).first()
+
+
+def students():
+    return get_user_model().objects.filter(username__startswith=f'{STUDENT_PREFIX}-')
+
+
+def dataset_counts():
+    """Row counts of the seeded dataset, or None if there is none."""
+    from apps.applications.models import Application
+    from apps.jobs.models import Job
+
+    admin = get_admin()
+    if admin is None:
+        return None
+    return {
+        'users': students().count(),
+        'jobs': Job.objects.filter(posted_by=admin).count(),
+        'applications': Application.objects.filter(job__posted_by=admin).count(),
+    }
+
+
+def current_scale():
+    """The scale whose counts the seeded dataset matches, or None."""
+    counts = dataset_counts()
+    return next((scale for scale, wanted in SCALES.items() if counts == wanted), None)
+
+
+def seed(scale, seed=0, log=None):
+    """Commit the dataset for ``scale``. Each bulk insert is its own transaction."""
+    from apps.jobs.models import Job
+
+    log = log or (lambda message: None)
+    counts = SCALES[scale]
+    if get_admin() is not None:
+        raise ValueError('A load dataset already exists; clear it first')
+
+    admin = get_user_model().objects.create(
+        username=ADMIN_USERNAME, email=f'{ADMIN_USERNAME}@example.com', role='admin'
+    )
+    log(f"Creating {counts['users']} students")
+    make_users(counts['users'], prefix=STUDENT_PREFIX, seed=seed)
+    log(f"Creating {counts['jobs']} jobs")
+    make_jobs(counts['jobs'], seed=seed, posted_by=admin)
+    log(f"Creating {counts['applications']} applications")
+    make_applications(
+        counts['applications'],
+        list(Job.objects.filter(posted_by=admin).order_by('pk').values_list('pk', flat=True)),
+        user_ids=list(students().order_by('pk').values_list('pk', flat=True)),
+        seed=seed,
+    )
+    # bulk_create skips Application.save(), which keeps the counter
+    call_command('reconcile_applications_count', stdout=io.StringIO())
+
+
+def clear():
+    """Delete the seeded dataset."""
+    from apps.applications.models import Application
+    from apps.jobs.models import Job
+
+    admin = get_admin()
+    if admin is None:
+        return
+    with transaction.atomic():
+        # Applications go in one statement: deleting them through the ORM
+        # would load each row to run the applications_count signal
+        applications = Application.objects.filter(job__posted_by=admin)
+        applications._raw_delete(applications.db)
+        Job.objects.filter(posted_by=admin).delete()
+        students().delete()
+        admin.delete()
@@ -0,0 +1,213 @@
+"""
+Timing, data generation and isolation helpers for benchmarks.
+
+Benchmarks run inside ``rolled_back()`` so synthetic rows never outlive the
+command, even when pointed at a real database.
+"""
+import os
+import random
+import resource
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections, transaction
+
+WORDS = (
+    'python django react native android ios java kotlin swift sql postgres '
+    'aws docker kubernetes linux data analyst engineer developer designer '
+    'marketing sales finance accounting operations support intern trainee '
+    'manager lead senior junior backend frontend fullstack cloud security '
+    'testing automation excel tally communication research content writer'
+).split()
+
+COMPANIES = (
+    'Infosys', 'TCS', 'Wipro', 'Accenture', 'Capgemini', 'Cognizant', 'HCL',
+    'Tech Mahindra', 'Persistent', 'Zensar', 'KPIT', 'Deloitte', 'Amazon',
+)
+
+LOCATIONS = ('Pune', 'Mumbai', 'Bengaluru', 'Hyderabad', 'Chennai', 'Remote')
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back(using='default'):
+    """Run a block inside a transaction that is always rolled back."""
+    try:
+        with transaction.atomic(using=using):
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Return latency stats (milliseconds) for a list of samples."""
+    return {
+        'runs': len(samples),
+        'mean_ms': round(statistics.fmean(samples), 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'max_ms': round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def time_call(fn, repeat=20, warmup=2):
+    """Call ``fn`` repeatedly and return per-call wall times in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@contextmanager
+def counting_queries():
+    """
+    Count queries run by this thread on every database alias.
+
+    Unlike ``CaptureQueriesContext`` this doesn't depend on the debug query
+    log, which only keeps the last 9000 queries.
+    """
+    counter = {'queries': 0}
+
+    def count(execute, sql, params, many, context):
+        counter['queries'] += 1
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(count))
+        yield counter
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open(f'/proc/{os.getpid()}/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # No procfs (macOS): fall back to peak RSS, reported in bytes there.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+def _sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def make_users(count, prefix='bench-student', seed=0, batch_size=5000):
+    """Bulk-insert ``count`` synthetic students named ``<prefix>-<n>``, with profile skills."""
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    rng = random.Random(seed)
+    batch = []
+    for i in range(count):
+        batch.append(User(
+            username=f'{prefix}-{i}',
+            email=f'{prefix}-{i}@example.com',
+            first_name='Student',
+            last_name=str(i),
+            phone=f'97{i:08d}'[:10],
+            skills=', '.join(rng.sample(WORDS, 4)),
+            profile_complete=True,
+        ))
+        if len(batch) >= batch_size:
+            User.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        User.objects.bulk_create(batch)
+
+
+def make_jobs(count, seed=0, batch_size=2000, posted_by=None):
+    """Bulk-insert ``count`` synthetic jobs (roughly 90% active)."""
+    from apps.jobs.models import Job
+
+    rng = random.Random(seed)
+    job_types = [choice for choice, _ in Job.JOB_TYPE_CHOICES]
+    apply_types = [choice for choice, _ in Job.APPLY_TYPE_CHOICES]
+
+    batch = []
+    for i in range(count):
+        job_type = rng.choice(job_types)
+        apply_type = rng.choice(apply_types)
+        batch.append(Job(
+            title=f"{_sentence(rng, 2).title()} {rng.choice(('Engineer', 'Analyst', 'Intern'))}",
+            company=rng.choice(COMPANIES),
+            description=_sentence(rng, 120),
+            requirements=_sentence(rng, 30),
+            location=rng.choice(LOCATIONS),
+            job_type=job_type,
+            job_type_tags=[job_type],
+            skills_required=', '.join(rng.sample(WORDS, 5)),
+            apply_type=apply_type,
+            apply_target='hr@example.com' if apply_type == 'email' else 'https://example.com/apply',
+            posted_by=posted_by,
+            active=rng.random() > 0.1,
+        ))
+        if len(batch) >= batch_size:
+            Job.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Job.objects.bulk_create(batch)
+
+
+def make_applications(count, job_ids, user_ids=None, seed=0, batch_size=5000):
+    """
+    Bulk-insert ``count`` synthetic applications spread over ``job_ids``.
+
+    ``bulk_create`` skips ``Application.save()``, so ``Job.applications_count``
+    is not updated; benchmarks that need it call reconcile_applications_count.
+    """
+    from apps.applications.models import Application
+
+    rng = random.Random(seed)
+    sources = [choice for choice, _ in Application.SOURCE_CHOICES]
+    statuses = [choice for choice, _ in Application.STATUS_CHOICES]
+    submission_statuses = [choice for choice, _ in Application.SUBMISSION_STATUS_CHOICES]
+
+    batch = []
+    in_app_pairs = set()
+    for i in range(count):
+        source = rng.choice(sources)
+        job_id = rng.choice(job_ids)
+        user_id = rng.choice(user_ids) if user_ids else None
+        if source == 'in_app' and user_id is not None:
+            # One in-app application per job and user (unique_in_app_application)
+            if (job_id, user_id) in in_app_pairs:
+                source = 'external_click'
+            in_app_pairs.add((job_id, user_id))
+        batch.append(Application(
+            job_id=job_id,
+            user_id=user_id,
+            name=f'Student {i}',
+            email=f'student{i}@example.com',
+            phone=f'98{i:08d}'[:10],
+            resume_url=f'https://example.com/resumes/{i}.pdf',
+            cover_letter=_sentence(rng, 40) if source == 'in_app' else '',
+            source=source,
+            status=rng.choice(statuses),
+            submission_status='submitted' if source == 'in_app' else rng.choice(submission_statuses),
+            ip_address='127.0.0.1',
+        ))
+        if len(batch) >= batch_size:
+            Application.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Application.objects.bulk_create(batch)
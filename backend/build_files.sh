@@ -1,7 +1,19 @@
 # build_files.sh
 echo "Building project..."
 cd backend
-python3 manage.py collectstatic --noinput --clear
+
+case "${API_ONLY,,}" in
+  true|1|yes|on) api_only=1 ;;
+esac
+if [ -n "${api_only}" ]; then
+  echo "API_ONLY: skipping collectstatic (no admin or browsable API)."
+else
+  python3 manage.py collectstatic --noinput --clear
+fi
+
+# Ship bytecode: the serverless filesystem is read-only, so modules without a
+# .pyc would be compiled again on every cold start
+python3 -m compileall -q apps config services
 
 if [ "${RUN_MIGRATIONS}" = "true" ]; then
   python3 manage.py migrate --noinput
@@ -1,8 +1,27 @@
 """
 ASGI config for DYPCMR Placement Assistance.
+
+    API_ONLY=True DB_CONN_MODE=pool uvicorn config.asgi:application --workers 4 --lifespan off
+
+Applying and resume uploads are served by async views (``ASYNC_VIEWS``); the
+other endpoints stay synchronous and run on a thread per request. WhiteNoise
+is sync-only middleware that would put every request through a thread, hence
+``API_ONLY``.
 """
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'true')
+# Django runs each request's ORM calls on a thread of its own, which ends with
+# the request: a persistent connection would be left behind with it. Close
+# connections after each request instead (DB_CONN_MODE=pool reuses them)
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402  (after DJANGO_SETTINGS_MODULE is set)
+
+if settings.ASGI_MAX_CONCURRENCY:
+    from config.concurrency import ConcurrencyLimit  # noqa: E402
+
+    application = ConcurrencyLimit(application, settings.ASGI_MAX_CONCURRENCY)
@@ -0,0 +1,30 @@
+"""
+Admission control for the ASGI application (``ASGI_MAX_CONCURRENCY``).
+
+Under ASGI every accepted request starts at once: a burst of 1,000 applies
+becomes 1,000 requests each holding a thread and, from its first query to
+its last byte, a pooled database connection, while it waits behind all the
+others for the event loop. Connections then run out (``DB_POOL_TIMEOUT``)
+before the first requests finish. ``ConcurrencyLimit`` lets at most ``limit``
+HTTP requests per process into Django and queues the rest in arrival order,
+as a WSGI server's listen backlog does.
+"""
+import asyncio
+
+
+class ConcurrencyLimit:
+    """ASGI middleware: at most ``limit`` HTTP requests in the wrapped app at a time."""
+
+    def __init__(self, app, limit):
+        self.app = app
+        self.limit = limit
+        self._semaphore = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        if self._semaphore is None:
+            # Created on first use, inside the server's event loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        async with self._semaphore:
+            return await self.app(scope, receive, send)
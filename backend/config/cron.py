@@ -0,0 +1,46 @@
+"""
+Background work for deployments without long-running workers (Vercel).
+
+A serverless instance is frozen as soon as it has answered, so the in-process
+workers (outbox, click fold, exports) never get to run there. Vercel Cron
+calls ``/cron/<task>/`` instead (see vercel.json) with
+``Authorization: Bearer $CRON_SECRET``. Each task does a bounded amount of
+work, well within a function's time limit, and leaves the rest to the next
+call.
+"""
+from apps.applications import clicks, export_jobs
+from apps.notifications import outbox
+
+# Notifications sent per call
+NOTIFICATIONS_PER_RUN = 100
+
+# CLICK_FOLD_BATCH_SIZE batches of click events folded per call
+CLICK_FOLD_BATCHES_PER_RUN = 10
+
+# Exports run per call: each has the whole function time limit to itself
+EXPORTS_PER_RUN = 1
+
+
+def drain_notifications():
+    return {'sent': outbox.drain(limit=NOTIFICATIONS_PER_RUN)}
+
+
+def fold_clicks():
+    folded = 0
+    for _ in range(CLICK_FOLD_BATCHES_PER_RUN):
+        count = clicks.fold()
+        if not count:
+            break
+        folded += count
+    return {'folded': folded}
+
+
+def run_exports():
+    return {'ran': export_jobs.run_pending(limit=EXPORTS_PER_RUN)}
+
+
+TASKS = {
+    'notifications': drain_notifications,
+    'clicks': fold_clicks,
+    'exports': run_exports,
+}
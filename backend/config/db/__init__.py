@@ -0,0 +1 @@
+"""Database connection management: the pooled PostgreSQL backend, replica routing and connection metrics."""
@@ -0,0 +1,108 @@
+"""
+PostgreSQL backend that hands out connections from a psycopg 3 pool.
+
+Django 4.2 has no built-in pooling, so this wrapper replaces "open a
+connection" with ``pool.getconn()`` and "close it" with ``pool.putconn()``.
+Each process keeps one ``psycopg_pool.ConnectionPool`` per database alias,
+shared by all of its threads and opened on first use (after any fork). Pool
+sizes come from the ``POOL`` key of the database settings (see settings.py).
+
+Use it with ``CONN_MAX_AGE = 0``: Django then returns the connection to the
+pool at the end of every request instead of keeping it for the thread.
+"""
+import atexit
+import logging
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+
+logger = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias):
+    """Return the open pool for ``alias`` in this process, or None."""
+    return _pools.get(alias)
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_pools)
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+
+    @property
+    def pool(self):
+        if self.alias == NO_DB_ALIAS:
+            # Database creation during tests connects to the 'postgres' db
+            return None
+        pool = _pools.get(self.alias)
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(self.alias)
+                if pool is None:
+                    pool = _pools[self.alias] = self._create_pool()
+        return pool
+
+    def _create_pool(self):
+        if not is_psycopg3:
+            raise ImproperlyConfigured('The pooled PostgreSQL backend needs psycopg 3 (pip install "psycopg[pool]").')
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise ImproperlyConfigured('Error loading psycopg_pool (pip install "psycopg[pool]").') from exc
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured('Pooled connections need CONN_MAX_AGE = 0.')
+        if 'isolation_level' in self.settings_dict['OPTIONS']:
+            raise ImproperlyConfigured('The pooled PostgreSQL backend does not support OPTIONS["isolation_level"].')
+
+        options = self.settings_dict.get('POOL', {})
+        kwargs = self.get_connection_params()
+        # Connections rest in the pool in autocommit; Django sets its own mode on checkout
+        kwargs['autocommit'] = True
+        pool = ConnectionPool(
+            kwargs=kwargs,
+            min_size=options.get('MIN_SIZE', 2),
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 10),
+            max_idle=options.get('MAX_IDLE', 300),
+            max_lifetime=options.get('MAX_LIFETIME', 3600),
+            check=ConnectionPool.check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+            name=self.alias,
+            open=False,
+        )
+        pool.open()
+        logger.info(f"Opened database pool '{self.alias}' (min {pool.min_size}, max {pool.max_size})")
+        return pool
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        self.isolation_level = IsolationLevel.READ_COMMITTED
+        try:
+            return pool.getconn()
+        except Exception as exc:
+            # PoolTimeout is an OperationalError, surfaced by Django as a normal database error
+            logger.warning(f"Database pool '{self.alias}' could not provide a connection: {exc}")
+            raise
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool rolls back unfinished transactions and drops broken connections
+            pool.putconn(self.connection)
+        self.connection = None
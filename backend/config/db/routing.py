@@ -0,0 +1,184 @@
+"""
+Read-replica routing.
+
+Replicas are the ``replica_<n>`` entries of ``DATABASES``, configured with
+``DATABASE_REPLICA_URLS``. Only reads made while handling a safe (GET, HEAD,
+OPTIONS) request go to a replica; anything else, including every read
+outside a request (workers, management commands) and every read inside a
+transaction, uses ``default``.
+
+``ReplicaRoutingMiddleware`` picks one replica per request. Replicas lag
+behind the primary, so after a client makes a successful write it is
+*pinned* to the primary for ``REPLICA_PIN_SECONDS``. Its next reads then see
+its own write, e.g. the application it just submitted. Clients are
+identified by a hash of their credentials (JWT or session cookie), or by IP
+address when they send none. Pins live in the ``default`` cache: use a
+shared cache backend when running several processes.
+"""
+import contextvars
+import hashlib
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Replica alias serving the current request's reads, or None for the primary
+_read_alias = contextvars.ContextVar('db_read_alias', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def replicas_enabled():
+    return bool(replica_aliases())
+
+
+@contextmanager
+def replica_reads(alias=None):
+    """Send reads in this block to ``alias`` (default: a random replica)."""
+    aliases = replica_aliases()
+    token = _read_alias.set(alias or (random.choice(aliases) if aliases else None))
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Send reads in this block to the primary."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def use_primary():
+    """Send the rest of the current request's reads to the primary."""
+    _read_alias.set(None)
+
+
+class ReplicaRouter:
+    """Reads go to the request's replica, if any; writes and migrations to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections['default'].in_atomic_block:
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {'default', *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def _credentials_key(request):
+    credentials = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return 'db_pin:' + hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def _address_key(request):
+    return f"db_pin:ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def pin(request):
+    """Pin the client that made ``request`` to the primary for a while."""
+    # Writes made before the client has credentials (registration) pin its address
+    key = _credentials_key(request) or _address_key(request)
+    cache.set(key, True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request):
+    keys = [key for key in (_credentials_key(request), _address_key(request)) if key]
+    return bool(cache.get_many(keys))
+
+
+def _routed(chunks, alias):
+    # Streaming responses are iterated after the middleware has returned
+    iterator = iter(chunks)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe requests to a replica unless the client recently wrote."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replicas_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method not in SAFE_METHODS:
+            with primary_reads():
+                response = self.get_response(request)
+            if response.status_code < 400:
+                pin(request)
+            return response
+
+        if is_pinned(request):
+            with primary_reads():
+                return self.get_response(request)
+
+        with replica_reads():
+            response = self.get_response(request)
+            # The view may have switched to the primary with use_primary()
+            alias = _read_alias.get()
+        if response.streaming:
+            response.streaming_content = _routed(response.streaming_content, alias)
+        return response
+
+    async def __acall__(self, request):
+        # The router reads _read_alias on the ORM's threads, which run in a
+        # copy of this context
+        if request.method not in SAFE_METHODS:
+            with primary_reads():
+                response = await self.get_response(request)
+            if response.status_code < 400:
+                await sync_to_async(pin)(request)
+            return response
+
+        if await sync_to_async(is_pinned)(request):
+            with primary_reads():
+                return await self.get_response(request)
+
+        with replica_reads():
+            response = await self.get_response(request)
+            alias = _read_alias.get()
+        if response.streaming and not response.is_async:
+            response.streaming_content = _routed(response.streaming_content, alias)
+        return response
@@ -0,0 +1,90 @@
+"""
+Per-process database connection metrics for ``/db-status/connections/``.
+
+``connects`` counts Django connection setups: new server connections in the
+``none`` and ``persistent`` modes, pool checkouts in ``pool`` mode. Compared
+with ``requests`` it shows how often a request paid for a connection. In pool
+mode the report adds psycopg_pool's own counters and saturation figures.
+"""
+import threading
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class ConnectionStats:
+    """Thread-safe request and per-alias connection counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = 0
+            self._connects = {}
+
+    def request(self):
+        with self._lock:
+            self._requests += 1
+
+    def connected(self, alias):
+        with self._lock:
+            self._connects[alias] = self._connects.get(alias, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return self._requests, dict(self._connects)
+
+
+connection_stats = ConnectionStats()
+
+
+def _on_request_started(sender, **kwargs):
+    connection_stats.request()
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    connection_stats.connected(connection.alias)
+
+
+request_started.connect(_on_request_started, dispatch_uid='config.db.stats.request_started')
+connection_created.connect(_on_connection_created, dispatch_uid='config.db.stats.connection_created')
+
+
+def pool_report(pool):
+    """psycopg_pool statistics plus how saturated the pool is."""
+    stats = pool.get_stats()
+    in_use = stats['pool_size'] - stats['pool_available']
+    queued = stats.get('requests_queued', 0)
+    stats.update({
+        'in_use': in_use,
+        'utilization': round(in_use / stats['pool_max'], 4) if stats['pool_max'] else None,
+        'avg_wait_ms': round(stats.get('requests_wait_ms', 0) / queued, 2) if queued else 0.0,
+    })
+    return stats
+
+
+def connection_report():
+    requests, connects = connection_stats.snapshot()
+    report = {'mode': settings.DB_CONN_MODE, 'requests': requests, 'databases': {}}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        count = connects.get(alias, 0)
+        entry = {
+            'engine': settings_dict['ENGINE'],
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'connects': count,
+            'connects_per_request': round(count / requests, 4) if requests else None,
+        }
+        if settings_dict['ENGINE'] == 'config.db.postgresql_pool':
+            from config.db.postgresql_pool.base import get_pool
+
+            pool = get_pool(alias)
+            if pool is not None:
+                entry['pool'] = pool_report(pool)
+        report['databases'][alias] = entry
+    return report
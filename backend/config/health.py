@@ -0,0 +1,150 @@
+"""
+Health checks for uptime monitors and load balancers (``/health/...``).
+
+- Liveness does no I/O: the process is up and serving requests.
+- Readiness runs ``SELECT 1`` on every database alias, at most once per
+  ``HEALTH_CHECK_TTL`` seconds per process. Polls in between get the cached
+  result.
+- Migrations compares the migrations recorded in ``django_migrations`` with
+  the migration graph on disk. The graph is loaded once per process (it
+  imports every migration module) and reduced to a hash. A poll costs one
+  query, also cached for ``HEALTH_CHECK_TTL``.
+
+While one thread refreshes a check, concurrent callers get the previous
+result instead of queueing behind it.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+STARTED_AT = time.monotonic()
+
+
+def _ttl():
+    return getattr(settings, 'HEALTH_CHECK_TTL', 5)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class CachedCheck:
+    """Run ``check()`` at most once per ``HEALTH_CHECK_TTL`` seconds. Thread-safe."""
+
+    def __init__(self, check):
+        self.check = check
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._result = None
+        self._checked_at = 0.0
+
+    def get(self):
+        """Return ``(result, age_seconds, cached)``."""
+        result, checked_at = self._result, self._checked_at
+        if result is not None and time.monotonic() - checked_at < _ttl():
+            return result, time.monotonic() - checked_at, True
+        # Only the first caller waits; later ones reuse the stale result meanwhile
+        if not self._lock.acquire(blocking=result is None):
+            return result, time.monotonic() - checked_at, True
+        try:
+            if self._result is not result:
+                # Refreshed by another thread while this one waited for the lock
+                return self._result, time.monotonic() - self._checked_at, True
+            result = self.check()
+            self._result, self._checked_at = result, time.monotonic()
+            return result, 0.0, False
+        finally:
+            self._lock.release()
+
+
+def _ping_databases():
+    databases = {}
+    for alias in settings.DATABASES:
+        start = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except DatabaseError as e:
+            databases[alias] = {'ok': False, 'latency_ms': _ms(time.perf_counter() - start), 'error': str(e)}
+        else:
+            databases[alias] = {'ok': True, 'latency_ms': _ms(time.perf_counter() - start)}
+    return databases
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def _graph_hash(nodes):
+    return hashlib.sha256('\n'.join(f'{app}.{name}' for app, name in sorted(nodes)).encode()).hexdigest()[:16]
+
+
+def migration_graph():
+    """``(nodes, hash)`` of the migrations on disk for the installed apps, computed once per process."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                from django.db.migrations.loader import MigrationLoader
+
+                # Without a connection the loader reads the files only
+                nodes = frozenset(MigrationLoader(None, ignore_no_migrations=True).graph.nodes)
+                _graph = (nodes, _graph_hash(nodes))
+    return _graph
+
+
+def _check_migrations():
+    from django.db.migrations.recorder import MigrationRecorder
+
+    nodes, expected = migration_graph()
+    start = time.perf_counter()
+    try:
+        recorded = set(MigrationRecorder.Migration.objects.using('default').values_list('app', 'name'))
+    except DatabaseError as e:
+        return {'ok': False, 'graph_hash': expected, 'error': str(e)}
+    # Rows of apps that are not installed (e.g. the admin with API_ONLY) don't count
+    applied = recorded & nodes
+    result = {
+        'ok': True,
+        'graph_hash': expected,
+        'applied_hash': _graph_hash(applied),
+        'query_ms': _ms(time.perf_counter() - start),
+    }
+    if result['applied_hash'] != expected:
+        result['ok'] = False
+        result['pending'] = sorted(f'{app}.{name}' for app, name in nodes - applied)
+    return result
+
+
+readiness = CachedCheck(_ping_databases)
+migrations = CachedCheck(_check_migrations)
+
+
+def liveness_report():
+    return {'status': 'ok', 'uptime_s': round(time.monotonic() - STARTED_AT, 1)}
+
+
+def readiness_report():
+    """``(report, ok)``."""
+    databases, age, cached = readiness.get()
+    ok = all(database['ok'] for database in databases.values())
+    report = {'status': 'ok' if ok else 'unavailable', 'databases': databases, 'age_s': round(age, 3), 'cached': cached}
+    return report, ok
+
+
+def migrations_report():
+    """``(report, ok)``."""
+    result, age, cached = migrations.get()
+    if result['ok']:
+        status = 'ok'
+    else:
+        status = 'pending' if 'pending' in result else 'unavailable'
+    report = {'status': status, **{key: value for key, value in result.items() if key != 'ok'}}
+    report.update(age_s=round(age, 3), cached=cached)
+    return report, result['ok']
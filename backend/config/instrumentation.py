@@ -0,0 +1,353 @@
+"""
+Opt-in request instrumentation (``REQUEST_METRICS_ENABLED``).
+
+``RequestMetricsMiddleware`` times every request from the first middleware to
+the last byte of the response (streamed exports included). It also counts the
+queries the request ran and the time they took, on every database alias. The
+figures are tagged with the URL name (``job_list_create``, ``apply_to_job``,
+...) and served in Prometheus text format on ``/metrics``.
+
+Queries slower than ``SLOW_QUERY_MS`` are logged and grouped by fingerprint:
+the SQL with literals and placeholder lists collapsed, so ``IN (%s, %s)`` and
+``IN (%s, %s, %s)`` count as one statement. ``PROFILE_SAMPLE_RATE`` runs that
+share of requests under cProfile and writes the stats to ``PROFILE_DIR``.
+
+Metrics are per worker process and reset on restart. With the setting off the
+middleware removes itself from the stack. Under ASGI it runs as async
+middleware, but doesn't profile: cProfile sees one thread, and an async
+request moves between the event loop and worker threads.
+"""
+import bisect
+import cProfile
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label for requests that never resolved to a URL pattern (404s, static files)
+UNMATCHED = 'unmatched'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ROWS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """``sql`` with literals replaced by ``?`` and value lists collapsed to ``(...)``."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql.replace('%s', '?'))
+    sql = _ROWS.sub('(...)', _PLACEHOLDER_LIST.sub('(...)', sql))
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def metrics_enabled():
+    return getattr(settings, 'REQUEST_METRICS_ENABLED', False)
+
+
+class SlowQueryLog:
+    """Thread-safe slow query totals per fingerprint, capped at ``max_entries`` statements."""
+
+    def __init__(self, max_entries=200):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+            self._by_view = {}
+            self._dropped = 0
+
+    def record(self, sql, ms, view):
+        key = fingerprint(sql)
+        with self._lock:
+            self._by_view[view] = self._by_view.get(view, 0) + 1
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    self._dropped += 1
+                    return None
+                entry = self._entries[key] = {
+                    'id': hashlib.md5(key.encode()).hexdigest()[:12],
+                    'fingerprint': key,
+                    'example': sql[:2000],
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'views': {},
+                }
+            entry['count'] += 1
+            entry['total_ms'] += ms
+            entry['max_ms'] = max(entry['max_ms'], ms)
+            entry['views'][view] = entry['views'].get(view, 0) + 1
+            return entry['id']
+
+    def by_view(self):
+        with self._lock:
+            return dict(self._by_view)
+
+    def snapshot(self):
+        """Statements by total time spent, slowest first."""
+        with self._lock:
+            entries = [dict(entry, views=dict(entry['views'])) for entry in self._entries.values()]
+            dropped = self._dropped
+        for entry in entries:
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+            entry['mean_ms'] = round(entry['total_ms'] / entry['count'], 3)
+        entries.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return {'threshold_ms': getattr(settings, 'SLOW_QUERY_MS', 0), 'dropped': dropped, 'queries': entries}
+
+
+class RequestMetrics:
+    """Thread-safe per-view request counters and duration histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._views = {}
+            self._profiles = 0
+
+    def observe(self, view, method, status, seconds, db_seconds, queries):
+        bucket = bisect.bisect_left(DURATION_BUCKETS, seconds)
+        with self._lock:
+            key = (view, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            totals = self._views.get(view)
+            if totals is None:
+                totals = self._views[view] = {
+                    'buckets': [0] * (len(DURATION_BUCKETS) + 1),
+                    'seconds': 0.0,
+                    'db_seconds': 0.0,
+                    'queries': 0,
+                }
+            totals['buckets'][bucket] += 1
+            totals['seconds'] += seconds
+            totals['db_seconds'] += db_seconds
+            totals['queries'] += queries
+
+    def profiled(self):
+        with self._lock:
+            self._profiles += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = {
+                view: dict(totals, buckets=list(totals['buckets'])) for view, totals in self._views.items()
+            }
+            return dict(self._requests), views, self._profiles
+
+
+request_metrics = RequestMetrics()
+slow_queries = SlowQueryLog()
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """All metrics of this process in the Prometheus text exposition format."""
+    requests, views, profiles = request_metrics.snapshot()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels)
+            lines.append(f'{name}{suffix}{{{label_text}}} {value}' if label_text else f'{name}{suffix} {value}')
+
+    metric('http_requests_total', 'counter', 'Requests handled by this process.', [
+        ('', (('view', view), ('method', method), ('status', status)), count)
+        for (view, method, status), count in sorted(requests.items())
+    ])
+
+    duration = []
+    for view, totals in sorted(views.items()):
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS + ('+Inf',), totals['buckets']):
+            cumulative += count
+            duration.append(('_bucket', (('view', view), ('le', bound)), cumulative))
+        duration.append(('_sum', (('view', view),), round(totals['seconds'], 6)))
+        duration.append(('_count', (('view', view),), cumulative))
+    metric('http_request_duration_seconds', 'histogram', 'Request wall time, including streamed bodies.', duration)
+
+    metric('http_request_db_seconds_total', 'counter', 'Time spent running queries.', [
+        ('', (('view', view),), round(totals['db_seconds'], 6)) for view, totals in sorted(views.items())
+    ])
+    metric('http_request_queries_total', 'counter', 'Queries run by requests.', [
+        ('', (('view', view),), totals['queries']) for view, totals in sorted(views.items())
+    ])
+    metric('db_slow_queries_total', 'counter', 'Queries slower than SLOW_QUERY_MS.', [
+        ('', (('view', view),), count) for view, count in sorted(slow_queries.by_view().items())
+    ])
+    metric('request_profiles_total', 'counter', 'Requests profiled with cProfile.', [('', (), profiles)])
+    return '\n'.join(lines) + '\n'
+
+
+class _RequestTimer:
+    """Execute wrapper and timings of one request."""
+
+    def __init__(self, request, slow_query_ms, profile):
+        self.request = request
+        self.slow_query_ms = slow_query_ms
+        self.profile = profile
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_seconds += elapsed
+            if self.slow_query_ms and elapsed * 1000 >= self.slow_query_ms:
+                self.slow_query(sql, elapsed * 1000)
+
+    def slow_query(self, sql, ms):
+        view = self.view()
+        query_id = slow_queries.record(sql, ms, view)
+        logger.warning(f'Slow query ({ms:.1f} ms, {view}) [{query_id}]: {sql[:500]}')
+
+    def view(self):
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match is not None else UNMATCHED
+
+    def measuring(self):
+        """Context manager that counts queries (and profiles) while it is open."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        if self.profile is not None:
+            self.profile.enable()
+            stack.callback(self.profile.disable)
+        return stack
+
+
+class _MeasuredStream:
+    """Keeps measuring while a streaming response is iterated, after the middleware returned."""
+
+    def __init__(self, chunks, timer, on_finish):
+        self.iterator = iter(chunks)
+        self.timer = timer
+        self.on_finish = on_finish
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self.timer.measuring():
+            return next(self.iterator)
+
+    def close(self):
+        # Called by the response once it is sent, or abandoned by the client
+        if self.on_finish is not None:
+            on_finish, self.on_finish = self.on_finish, None
+            on_finish()
+
+
+class RequestMetricsMiddleware:
+    """Record wall time, DB time and query count per URL name; profile a sample."""
+
+    sync_capable = True
+    async_capable = True
+
+    # cProfile can only profile one request at a time
+    _profile_lock = threading.Lock()
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.slow_query_ms = getattr(settings, 'SLOW_QUERY_MS', 0)
+        self.sample_rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_dir = getattr(settings, 'PROFILE_DIR', None)
+        self.profile_min_ms = getattr(settings, 'PROFILE_MIN_MS', 0)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = None
+        if self.sample_rate and random.random() < self.sample_rate and self._profile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+        timer = _RequestTimer(request, self.slow_query_ms, profile)
+        try:
+            with timer.measuring():
+                response = self.get_response(request)
+        except BaseException:
+            self.finish(timer, request, 500)
+            raise
+        return self.measure_response(timer, request, response)
+
+    async def __acall__(self, request):
+        timer = _RequestTimer(request, self.slow_query_ms, None)
+        # The ORM runs on the request's sync thread (see asgiref's
+        # ThreadSensitiveContext), so the execute wrappers go on its connections
+        measuring = await sync_to_async(timer.measuring)()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await sync_to_async(measuring.close)()
+            self.finish(timer, request, 500)
+            raise
+        await sync_to_async(measuring.close)()
+        return self.measure_response(timer, request, response)
+
+    def measure_response(self, timer, request, response):
+        # Async iterators are timed up to the response, not the last byte
+        if response.streaming and not getattr(response, 'is_async', False):
+            response.streaming_content = _MeasuredStream(
+                response.streaming_content, timer, lambda: self.finish(timer, request, response.status_code)
+            )
+        else:
+            self.finish(timer, request, response.status_code)
+        return response
+
+    def finish(self, timer, request, status):
+        seconds = time.perf_counter() - timer.started
+        request_metrics.observe(timer.view(), request.method, status, seconds, timer.db_seconds, timer.queries)
+        if timer.profile is not None:
+            try:
+                if seconds * 1000 >= self.profile_min_ms:
+                    self.dump(timer, seconds)
+            finally:
+                self._profile_lock.release()
+
+    def dump(self, timer, seconds):
+        name = re.sub(r'[^\w.-]', '_', timer.view())
+        stamp = time.strftime('%Y%m%dT%H%M%S')
+        path = os.path.join(self.profile_dir, f'{name}-{stamp}-{seconds * 1000:.0f}ms-{os.getpid()}.prof')
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            timer.profile.dump_stats(path)
+        except OSError as e:
+            logger.error(f'Could not write profile {path}: {e}')
+            return
+        request_metrics.profiled()
@@ -0,0 +1,100 @@
+"""
+orjson-backed JSON renderer and parser for Django REST Framework.
+
+Enabled with ``JSON_BACKEND=orjson`` (see settings). Output matches DRF's
+``JSONRenderer``: compact, UTF-8, ``\\u2028``/``\\u2029`` escaped, and
+non-native types (lazy strings, Decimal, datetime, ...) encoded by DRF's own
+``JSONEncoder.default``. Anything orjson can't encode (integers over 64 bits,
+indented output other than 2 spaces) falls back to ``json``.
+
+It is not byte-identical for floats:
+
+- exponents are written without ``+`` or zero padding (``1e16``, ``1e-7``
+  where ``json`` writes ``1e+16``, ``1e-07``); the value is the same;
+- NaN and infinite floats render as ``null`` instead of raising.
+
+``bench_json_renderers`` checks the output is otherwise identical.
+"""
+import datetime
+import decimal
+
+import orjson
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Datetimes go through DRF's encoder, which writes UTC as "Z" where orjson
+# would write "+00:00".
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_LINE_SEPARATOR = '\u2028'.encode()
+_PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+def _encode_datetime(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+# Exact-type shortcuts for the values serializers leave to the encoder most
+# often; everything else goes through DRF's JSONEncoder.default.
+_FAST_DEFAULTS = {
+    decimal.Decimal: float,
+    datetime.datetime: _encode_datetime,
+}
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for ``JSONRenderer`` using orjson."""
+
+    def __init__(self):
+        self._encoder_default = self.encoder_class().default
+
+    def default(self, obj):
+        encode = _FAST_DEFAULTS.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        if isinstance(obj, Promise):
+            return force_str(obj)
+        return self._encoder_default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent not in (None, 2) or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = OPTIONS | orjson.OPT_INDENT_2 if indent else OPTIONS
+        try:
+            ret = orjson.dumps(data, default=self.default, option=options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b'\\u2028').replace(_PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """Drop-in replacement for ``JSONParser`` using orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -43,6 +43,27 @@ def _sqlite_db_config() -> dict[str, object]:
         'NAME': default_sqlite_path,
     }
 
+
+def _has_module(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def _cache_config(url: str) -> dict[str, object]:
+    """Cache settings from a URL: locmem://[name], file:///path, redis[s]://... or dummy://"""
+    scheme, _, location = url.partition('://')
+    if scheme == 'file':
+        return {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+    if scheme in ('redis', 'rediss'):
+        # Any Redis-compatible server (Redis, Valkey, KeyDB, ...); needs the redis package
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    if scheme == 'dummy':
+        return {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': location or scheme}
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -63,12 +84,18 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.jobs',
     'apps.applications',
+    'apps.notifications',
+    # Management commands that benchmark the project-level setup (server,
+    # startup, connections, renderers) rather than one app
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'config.instrumentation.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.db.routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,6 +104,40 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# API-only deployments (e.g. serverless) skip the admin site, sessions, messages,
+# static files and the browsable API: the mobile app uses none of them, and
+# leaving them out shortens cold starts
+API_ONLY = config('API_ONLY', default=False, cast=bool)
+if API_ONLY:
+    _BROWSER_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    }
+    _BROWSER_MIDDLEWARE = {
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    }
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _BROWSER_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in _BROWSER_MIDDLEWARE]
+
+# Build the URL resolver and DRF's imported settings when the WSGI app loads
+# instead of on the first request (see config.warmup)
+WSGI_WARM_UP = config('WSGI_WARM_UP', default=True, cast=bool)
+
+# Serve the I/O-bound endpoints (apply, resume upload) with async views. On by
+# default under ASGI (config/asgi.py); under WSGI every async view would start
+# an event loop of its own
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+# Requests one ASGI process handles at a time; the rest wait in line (see
+# config.concurrency). Best kept near DB_POOL_MAX_SIZE; 0 lets every accepted
+# request in
+ASGI_MAX_CONCURRENCY = config('ASGI_MAX_CONCURRENCY', default=10, cast=int)
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -100,9 +161,46 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 database_url = config('DATABASE_URL', default='')
 
+# Connection handling: 'none' opens a connection per request, 'persistent'
+# keeps one per worker thread for DB_CONN_MAX_AGE seconds, and 'pool' shares a
+# psycopg 3 pool between the threads of each process (PostgreSQL only). On
+# Vercel, where a frozen instance would hold its connection open, the default
+# is 'none': keeping connections is an explicit opt-in there
+DB_CONN_MODE = config('DB_CONN_MODE', default='none' if os.getenv('VERCEL') else 'persistent')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+if DB_CONN_MODE == 'pool' and not (_has_module('psycopg') and _has_module('psycopg_pool')):
+    logging.warning('DB_CONN_MODE=pool needs psycopg 3 and psycopg_pool. Falling back to persistent connections.')
+    DB_CONN_MODE = 'persistent'
+
+
+def _with_connection_mode(db_config: dict[str, object]) -> dict[str, object]:
+    # Pooling is PostgreSQL only; SQLite fallbacks keep persistent connections
+    mode = DB_CONN_MODE
+    if mode == 'pool' and not db_config['ENGINE'].endswith('postgresql'):
+        mode = 'persistent'
+
+    db_config['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+    if mode == 'pool':
+        db_config['ENGINE'] = 'config.db.postgresql_pool'
+        db_config['CONN_MAX_AGE'] = 0
+        db_config['POOL'] = {
+            'MIN_SIZE': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Seconds a request waits for a free connection before failing
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+        }
+    else:
+        db_config['CONN_MAX_AGE'] = DB_CONN_MAX_AGE if mode == 'persistent' else 0
+    return db_config
+
+
 if database_url:
     try:
-        parsed_db = dj_database_url.parse(database_url, conn_max_age=0)
+        parsed_db = dj_database_url.parse(database_url)
         engine = parsed_db.get('ENGINE', '')
         if engine.endswith('postgresql') and not _has_postgres_driver():
             logging.warning('PostgreSQL driver unavailable. Falling back to SQLite.')
@@ -114,8 +212,32 @@ else:
     parsed_db = _sqlite_db_config()
 
 DATABASES = {
-    'default': parsed_db
+    'default': _with_connection_mode(parsed_db)
+}
+
+# Read replicas (comma-separated database URLs). Safe requests read from one of
+# them; a client that writes is pinned to the primary for REPLICA_PIN_SECONDS
+# so it reads its own writes. See config/db/routing.py.
+for index, replica_url in enumerate(_as_list(config('DATABASE_REPLICA_URLS', default=''))):
+    replica_db = _with_connection_mode(dj_database_url.parse(replica_url))
+    replica_db['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica_{index}'] = replica_db
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['config.db.routing.ReplicaRouter'] if DATABASE_REPLICAS else []
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Caches. locmem is per process: with several workers, point CACHE_URL at a
+# file path or a Redis-compatible server. The job feed cache uses the same
+# backend unless JOB_FEED_CACHE_URL is set. On a per-process backend its
+# invalidations would only reach one worker, so it stays off there unless
+# JOB_FEED_CACHE_ALLOW_LOCAL says the deployment is a single process.
+cache_url = config('CACHE_URL', default='locmem://default')
+CACHES = {
+    'default': _cache_config(cache_url),
+    'job_feed': _cache_config(config('JOB_FEED_CACHE_URL', default=cache_url)),
 }
+JOB_FEED_CACHE_ALLOW_LOCAL = config('JOB_FEED_CACHE_ALLOW_LOCAL', default=False, cast=bool)
 
 CSRF_TRUSTED_ORIGINS = _as_list(
     config('CSRF_TRUSTED_ORIGINS', default='https://*.vercel.app')
@@ -153,13 +275,33 @@ if config('AWS_ACCESS_KEY_ID', default=None):
     AWS_S3_FILE_OVERWRITE = False
     AWS_DEFAULT_ACL = None
     AWS_S3_SIGNATURE_VERSION = 's3v4'
+    # Uploads are read from the request's file by boto3: in one piece up to the
+    # threshold, else as a multipart upload holding up to max_concurrency parts
+    # in memory. 5 MB is the smallest part S3 accepts
+    from boto3.s3.transfer import TransferConfig
+    AWS_S3_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=config('AWS_S3_MULTIPART_THRESHOLD', default=5 * 1024 * 1024, cast=int),
+        multipart_chunksize=config('AWS_S3_MULTIPART_CHUNKSIZE', default=5 * 1024 * 1024, cast=int),
+        max_concurrency=config('AWS_S3_MAX_CONCURRENCY', default=4, cast=int),
+    )
 else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resume uploads (see apps.applications.resumes). Files up to
+# FILE_UPLOAD_MAX_MEMORY_SIZE are parsed in memory, larger ones spooled to disk
+RESUME_MAX_UPLOAD_SIZE = config('RESUME_MAX_UPLOAD_SIZE', default=5 * 1024 * 1024, cast=int)
+FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=1024 * 1024, cast=int)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework
+# JSON encoding for API requests/responses: 'json' (stdlib) or 'orjson'
+JSON_BACKEND = config('JSON_BACKEND', default='json')
+if JSON_BACKEND == 'orjson' and not _has_module('orjson'):
+    logging.warning('JSON_BACKEND=orjson but orjson is not installed. Falling back to json.')
+    JSON_BACKEND = 'json'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -167,6 +309,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer' if JSON_BACKEND == 'orjson' else 'rest_framework.renderers.JSONRenderer',
+        *([] if API_ONLY else ['rest_framework.renderers.BrowsableAPIRenderer']),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.renderers.ORJSONParser' if JSON_BACKEND == 'orjson' else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -201,10 +352,82 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
+# Job view counter: buffered views are written every N seconds or M views. On
+# Vercel an instance is frozen after each response, so views are written through
+JOB_VIEW_FLUSH_INTERVAL = config('JOB_VIEW_FLUSH_INTERVAL', default=10.0, cast=float)
+JOB_VIEW_FLUSH_THRESHOLD = config('JOB_VIEW_FLUSH_THRESHOLD', default=1 if os.getenv('VERCEL') else 500, cast=int)
+
+# Apply clicks: buffered in process and bulk-inserted into click_events every
+# N seconds or M clicks, then folded into applications by an in-process worker.
+# Serverless deployments save clicks in the request: no fold worker runs there.
+# With the buffer turned on, they write each click straight through (a buffer
+# wouldn't survive the instance), folded by /cron/clicks/ or `fold_click_events`
+CLICK_BUFFER_ENABLED = config('CLICK_BUFFER_ENABLED', default=not os.getenv('VERCEL'), cast=bool)
+CLICK_FLUSH_INTERVAL = config('CLICK_FLUSH_INTERVAL', default=2.0, cast=float)
+CLICK_FLUSH_THRESHOLD = config('CLICK_FLUSH_THRESHOLD', default=1 if os.getenv('VERCEL') else 200, cast=int)
+CLICK_ID_BLOCK_SIZE = config('CLICK_ID_BLOCK_SIZE', default=100, cast=int)
+CLICK_FOLD_BATCH_SIZE = config('CLICK_FOLD_BATCH_SIZE', default=1000, cast=int)
+CLICKS_FOLD_IN_PROCESS = config('CLICKS_FOLD_IN_PROCESS', default=not os.getenv('VERCEL'), cast=bool)
+
+# Seconds an Idempotency-Key (and its stored response) is remembered
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+
+# Serve the job and application lists through values()-based serializers
+FAST_READ_SERIALIZERS = config('FAST_READ_SERIALIZERS', default=True, cast=bool)
+
+# Job feed response cache: seconds a cached page lives (0 disables the cache)
+JOB_FEED_CACHE_TTL = config('JOB_FEED_CACHE_TTL', default=300, cast=int)
+
+# Background exports: run on an in-process thread pool, except on serverless
+# deployments where `manage.py run_export_jobs` or Vercel Cron (/cron/exports/)
+# drains the queue instead
+EXPORT_WORKERS = config('EXPORT_WORKERS', default=2, cast=int)
+EXPORT_RUN_IN_PROCESS = config('EXPORT_RUN_IN_PROCESS', default=not os.getenv('VERCEL'), cast=bool)
+# A running export not heard from for this long lost its worker and is requeued,
+# up to EXPORT_MAX_ATTEMPTS runs in all
+EXPORT_LEASE_SECONDS = config('EXPORT_LEASE_SECONDS', default=300, cast=int)
+EXPORT_MAX_ATTEMPTS = config('EXPORT_MAX_ATTEMPTS', default=3, cast=int)
+
 # Firebase (for FCM)
 FIREBASE_CREDENTIALS_PATH = config('FIREBASE_CREDENTIALS_PATH', default=None)
+# Dotted path to a stand-in messaging transport, e.g. services.fcm_fake.fake_messaging
+FCM_TRANSPORT = config('FCM_TRANSPORT', default=None)
+# Concurrent 500-token multicast requests per fan-out
+FCM_MULTICAST_WORKERS = config('FCM_MULTICAST_WORKERS', default=8, cast=int)
+
+# Notification outbox: delivered by an in-process worker, except on serverless
+# deployments, where /cron/notifications/ (or `manage.py drain_notifications`)
+# delivers it. NOTIFICATIONS_DRAIN_ON_COMMIT (opt-in) also tries to send the
+# new notification in the request after commit, unless the rate limit is used up
+NOTIFICATIONS_RUN_IN_PROCESS = config('NOTIFICATIONS_RUN_IN_PROCESS', default=not os.getenv('VERCEL'), cast=bool)
+NOTIFICATIONS_DRAIN_ON_COMMIT = config('NOTIFICATIONS_DRAIN_ON_COMMIT', default=False, cast=bool)
+NOTIFICATION_MAX_ATTEMPTS = config('NOTIFICATION_MAX_ATTEMPTS', default=6, cast=int)
+NOTIFICATION_BACKOFF_BASE = config('NOTIFICATION_BACKOFF_BASE', default=30, cast=float)
+NOTIFICATION_BACKOFF_MAX = config('NOTIFICATION_BACKOFF_MAX', default=3600, cast=float)
+NOTIFICATION_RATE_LIMIT = config('NOTIFICATION_RATE_LIMIT', default=10, cast=float)
+NOTIFICATION_LEASE_SECONDS = config('NOTIFICATION_LEASE_SECONDS', default=120, cast=int)
+
+# Health checks: seconds a readiness (SELECT 1) or pending-migrations result is
+# reused before the next poll checks the database again
+HEALTH_CHECK_TTL = config('HEALTH_CHECK_TTL', default=5, cast=float)
+
+# Request instrumentation (off by default): per-view timings and query counts
+# on /metrics, logging of queries slower than SLOW_QUERY_MS (0 disables it) and
+# cProfile dumps of a PROFILE_SAMPLE_RATE share of requests. Set METRICS_TOKEN
+# to require `Authorization: Bearer <token>` on /metrics
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=False, cast=bool)
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=200, cast=float)
+PROFILE_SAMPLE_RATE = config('PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+PROFILE_MIN_MS = config('PROFILE_MIN_MS', default=0, cast=float)
+PROFILE_DIR = config('PROFILE_DIR', default='/tmp/profiles' if os.getenv('VERCEL') else str(BASE_DIR / 'profiles'))
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Bearer token Vercel Cron sends to /cron/<task>/ (see config.cron); the
+# endpoints 404 without it
+CRON_SECRET = config('CRON_SECRET', default='')
 
 # Logging
 LOGGING = {
@@ -1,11 +1,19 @@
 """
 URL configuration for DYPCMR Placement Assistance.
 """
-from django.contrib import admin
+import time
+
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.conf import settings
 from django.conf.urls.static import static
+from django.utils.crypto import constant_time_compare
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from apps.jobs.permissions import IsAdminUser
+from config import cron, health, instrumentation
+from config.db.stats import connection_report
 
 
 def root(_request):
@@ -13,40 +21,107 @@ def root(_request):
 
 
 def db_status(_request):
-    """Diagnostic endpoint to check database configuration"""
+    """Database configuration and migration state (migrations run at deploy time, not here)"""
     from django.db import connection
-    from django.core.management import call_command
-    import io
-    
+
     db_config = connection.settings_dict
     db_info = {
         'engine': db_config.get('ENGINE', 'unknown'),
         'name': db_config.get('NAME', 'unknown'),
         'host': db_config.get('HOST', 'default'),
     }
-    
-    # Try to run migrations
-    try:
-        out = io.StringIO()
-        call_command('migrate', '--noinput', stdout=out)
-        migration_output = out.getvalue()
-        db_info['migrations'] = 'success'
-        db_info['migration_output'] = migration_output
-    except Exception as e:
-        db_info['migrations'] = 'failed'
-        db_info['error'] = str(e)
-    
+    report, _ = health.migrations_report()
+    db_info['migrations'] = report['status']
+    if 'pending' in report:
+        db_info['pending_migrations'] = report['pending']
+    if 'error' in report:
+        db_info['error'] = report['error']
     return JsonResponse(db_info)
 
+
+def _health_response(report, ok, started):
+    report['latency_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    response = JsonResponse(report, status=200 if ok else 503)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def health_live(_request):
+    """Liveness: the process serves requests. No database work"""
+    started = time.perf_counter()
+    return _health_response(health.liveness_report(), True, started)
+
+
+def health_ready(_request):
+    """Readiness: every database answers SELECT 1 (cached for HEALTH_CHECK_TTL)"""
+    started = time.perf_counter()
+    return _health_response(*health.readiness_report(), started)
+
+
+def health_migrations(_request):
+    """503 while migrations on disk are not applied (cached for HEALTH_CHECK_TTL)"""
+    started = time.perf_counter()
+    return _health_response(*health.migrations_report(), started)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_connections(_request):
+    """Connection counters and pool saturation of this worker process (admin only)"""
+    return Response(connection_report())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def slow_queries(_request):
+    """Queries over SLOW_QUERY_MS in this worker process, by fingerprint (admin only)"""
+    if not instrumentation.metrics_enabled():
+        raise Http404
+    return Response(instrumentation.slow_queries.snapshot())
+
+
+def metrics(request):
+    """Request metrics of this worker process in Prometheus text format"""
+    if not instrumentation.metrics_enabled():
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(instrumentation.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def run_cron(request, task):
+    """Run one background task (see config.cron); needs CRON_SECRET as a bearer token"""
+    secret = settings.CRON_SECRET
+    if not secret or task not in cron.TASKS:
+        raise Http404
+    if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {secret}'):
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    response = JsonResponse({'task': task, **cron.TASKS[task]()})
+    response['Cache-Control'] = 'no-store'
+    return response
+
 urlpatterns = [
     path('', root, name='root'),
+    path('health/live/', health_live, name='health_live'),
+    path('health/ready/', health_ready, name='health_ready'),
+    path('health/migrations/', health_migrations, name='health_migrations'),
     path('db-status/', db_status, name='db_status'),
-    path('admin/', admin.site.urls),
+    path('db-status/connections/', db_connections, name='db_connections'),
+    path('db-status/slow-queries/', slow_queries, name='slow_queries'),
+    path('metrics', metrics, name='metrics'),
+    path('cron/<slug:task>/', run_cron, name='run_cron'),
     path('api/auth/', include('apps.users.urls')),
     path('api/users/', include('apps.users.urls_users')),
     path('api/jobs/', include('apps.jobs.urls')),
     path('api/applications/', include('apps.applications.urls')),
+    path('api/notifications/', include('apps.notifications.urls')),
 ]
 
+if not settings.API_ONLY:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,16 @@
+"""
+Startup work that would otherwise land on the first request.
+
+Django imports the URLconf, and with it every view, serializer and filter
+module (and the DRF classes they configure), on the first request: about a
+sixth of a cold start. ``warm_up()`` does it while the WSGI app loads, so
+gunicorn ``--preload`` workers fork with it done and serverless platforms run
+it in their init phase. The reverse lookup tables are left to the first
+``reverse()``, which API requests rarely need.
+"""
+from django.urls import get_resolver
+
+
+def warm_up():
+    # Imports the URLconf and every view module it includes
+    get_resolver().url_patterns
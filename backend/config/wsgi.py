@@ -6,7 +6,6 @@ import os
 import sys
 from pathlib import Path
 
-from django.core.management import call_command
 from django.core.wsgi import get_wsgi_application
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,8 +15,18 @@ if str(BASE_DIR) not in sys.path:
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
 
+from django.conf import settings  # noqa: E402  (after DJANGO_SETTINGS_MODULE is set)
+
+if settings.WSGI_WARM_UP:
+    from config.warmup import warm_up  # noqa: E402
+
+    warm_up()
+
 _BOOTSTRAP_FLAG = os.getenv('CREATE_SUPERUSER_ON_START', '').lower() in {'1', 'true', 'yes'}
 if _BOOTSTRAP_FLAG:
+    # Imported here: the management machinery is not needed to serve requests
+    from django.core.management import call_command
+
     try:
         call_command('create_default_superuser')
     except Exception:  # pragma: no cover - avoid crashing the app on bootstrap
@@ -0,0 +1,47 @@
+"""
+Shared pytest fixtures.
+
+Background work (click folds, exports, notification delivery) normally runs
+on in-process threads after commit; the tests turn those off and drive the
+work directly, so no thread outlives a test or writes to its database.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    from django.conf import settings
+
+    # An in-memory SQLite test database fails concurrent writers at once
+    # ("table is locked"); a file waits for the lock, as a real one does
+    database = settings.DATABASES['default']
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('TEST', {})['NAME'] = str(tmp_path_factory.mktemp('db') / 'test.sqlite3')
+
+
+@pytest.fixture(autouse=True)
+def no_background_work(settings):
+    settings.CLICKS_FOLD_IN_PROCESS = False
+    settings.EXPORT_RUN_IN_PROCESS = False
+    settings.NOTIFICATIONS_RUN_IN_PROCESS = False
+    settings.NOTIFICATIONS_DRAIN_ON_COMMIT = False
+
+
+@pytest.fixture
+def admin(db):
+    return get_user_model().objects.create(username='test-admin', email='admin@example.com', role='admin')
+
+
+@pytest.fixture
+def student(db):
+    return get_user_model().objects.create(
+        username='test-student', email='student@example.com', first_name='Test', last_name='Student',
+        phone='9800000000',
+    )
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
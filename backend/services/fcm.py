@@ -1,8 +1,14 @@
 """
 Firebase Cloud Messaging service for push notifications.
 """
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.utils.module_loading import import_string
 
 logger = logging.getLogger(__name__)
 
@@ -34,33 +40,67 @@ def get_firebase_app():
         return None
 
 
+def get_messaging():
+    """
+    Return the messaging transport used to send pushes.
+
+    This is ``firebase_admin.messaging`` unless ``settings.FCM_TRANSPORT`` names
+    a stand-in with the same interface (e.g. ``services.fcm_fake.fake_messaging``).
+    Returns None when Firebase is not configured.
+    """
+    transport = getattr(settings, 'FCM_TRANSPORT', None)
+    if transport:
+        return import_string(transport)
+
+    if get_firebase_app() is None:
+        return None
+    from firebase_admin import messaging
+    return messaging
+
+
+def is_enabled():
+    """Return True if pushes can be sent."""
+    return get_messaging() is not None
+
+
+def _job_message(messaging, job):
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=f"New Job: {job.title}",
+            body=f"{job.company} - {job.location or 'Location not specified'}",
+        ),
+        data={
+            'job_id': str(job.id),
+            'type': 'new_job',
+            'click_action': 'OPEN_JOB_DETAIL',
+        },
+        topic='jobs',  # Users subscribe to this topic
+    )
+
+
+def _user_message(messaging, user, title, body, data):
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        data=data or {},
+        token=user.fcm_token,
+    )
+
+
 def send_job_notification(job):
     """
     Send push notification for a new job posting.
     Sends to 'jobs' topic that users can subscribe/unsubscribe from.
     """
-    app = get_firebase_app()
-    if app is None:
+    messaging = get_messaging()
+    if messaging is None:
         logger.warning(f"Skipping push notification for job {job.id} - Firebase not configured")
         return False
     
     try:
-        from firebase_admin import messaging
-        
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=f"New Job: {job.title}",
-                body=f"{job.company} - {job.location or 'Location not specified'}",
-            ),
-            data={
-                'job_id': str(job.id),
-                'type': 'new_job',
-                'click_action': 'OPEN_JOB_DETAIL',
-            },
-            topic='jobs',  # Users subscribe to this topic
-        )
-        
-        response = messaging.send(message)
+        response = messaging.send(_job_message(messaging, job))
         logger.info(f"Push notification sent for job {job.id}: {response}")
         return True
         
@@ -77,23 +117,12 @@ def send_notification_to_user(user, title, body, data=None):
         logger.warning(f"User {user.id} has no FCM token")
         return False
     
-    app = get_firebase_app()
-    if app is None:
+    messaging = get_messaging()
+    if messaging is None:
         return False
     
     try:
-        from firebase_admin import messaging
-        
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            data=data or {},
-            token=user.fcm_token,
-        )
-        
-        response = messaging.send(message)
+        response = messaging.send(_user_message(messaging, user, title, body, data))
         logger.info(f"Push notification sent to user {user.id}: {response}")
         return True
         
@@ -102,33 +131,212 @@ def send_notification_to_user(user, title, body, data=None):
         return False
 
 
-def send_notification_to_tokens(tokens, title, body, data=None):
+# FCM accepts at most this many tokens per multicast request.
+MULTICAST_BATCH_SIZE = 500
+
+# Per-token errors meaning the token will never work again.
+DEAD_TOKEN_ERRORS = ('UnregisteredError', 'SenderIdMismatchError')
+
+
+@dataclass
+class MulticastResult:
+    """Outcome of a fan-out across any number of tokens."""
+
+    success_count: int = 0
+    failure_count: int = 0
+    dead_tokens: list = field(default_factory=list)
+    # token -> error message, for tokens that failed (dead or transient)
+    errors: dict = field(default_factory=dict)
+
+
+def _multicast_message(messaging, tokens, title, body, data):
+    return messaging.MulticastMessage(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        data=data or {},
+        tokens=tokens,
+    )
+
+
+def _send_multicast_batch(messaging, tokens, title, body, data):
+    message = _multicast_message(messaging, tokens, title, body, data)
+    # send_multicast is deprecated (and removed in newer SDKs) in favour of
+    # send_each_for_multicast; both return a BatchResponse.
+    send = getattr(messaging, 'send_each_for_multicast', None) or messaging.send_multicast
+    return send(message)
+
+
+def send_notification_to_tokens(tokens, title, body, data=None, prune=True):
     """
     Send push notification to multiple device tokens.
+
+    Tokens are sent in batches of ``MULTICAST_BATCH_SIZE`` on a bounded thread
+    pool (``FCM_MULTICAST_WORKERS``). Tokens FCM reports as unregistered are
+    cleared from ``User.fcm_token`` in one UPDATE unless ``prune`` is False.
+    Returns a ``MulticastResult``, or None if Firebase is not configured.
     """
     if not tokens:
-        return []
+        return MulticastResult()
     
-    app = get_firebase_app()
-    if app is None:
-        return []
+    messaging = get_messaging()
+    if messaging is None:
+        return None
     
-    try:
-        from firebase_admin import messaging
-        
-        message = messaging.MulticastMessage(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            data=data or {},
-            tokens=tokens,
+    tokens, batches = _batches(tokens)
+    result = MulticastResult()
+    workers = min(len(batches), getattr(settings, 'FCM_MULTICAST_WORKERS', 8))
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fcm') as executor:
+        futures = {
+            executor.submit(_send_multicast_batch, messaging, batch, title, body, data): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            _collect_batch(result, futures[future], future.exception() or future.result())
+    
+    _log_multicast(tokens, batches, result)
+    if prune and result.dead_tokens:
+        prune_dead_tokens(result.dead_tokens)
+    return result
+
+
+def _batches(tokens):
+    tokens = list(dict.fromkeys(tokens))  # de-duplicate, keep order
+    return tokens, [
+        tokens[i:i + MULTICAST_BATCH_SIZE]
+        for i in range(0, len(tokens), MULTICAST_BATCH_SIZE)
+    ]
+
+
+def _collect_batch(result, batch, response):
+    """Add one batch's outcome (its BatchResponse, or the exception sending it) to ``result``."""
+    if isinstance(response, BaseException):
+        logger.error(f"Failed to send multicast batch of {len(batch)} tokens: {response}")
+        result.failure_count += len(batch)
+        result.errors.update(dict.fromkeys(batch, str(response)))
+        return
+    
+    for token, token_response in zip(batch, response.responses):
+        if token_response.success:
+            result.success_count += 1
+            continue
+        result.failure_count += 1
+        result.errors[token] = str(token_response.exception)
+        if type(token_response.exception).__name__ in DEAD_TOKEN_ERRORS:
+            result.dead_tokens.append(token)
+
+
+def _log_multicast(tokens, batches, result):
+    logger.info(
+        f"Multicast sent to {len(tokens)} tokens in {len(batches)} batches: "
+        f"{result.success_count} success, {result.failure_count} failures, "
+        f"{len(result.dead_tokens)} dead"
+    )
+
+
+def prune_dead_tokens(tokens):
+    """Clear ``User.fcm_token`` for tokens FCM no longer accepts. Returns rows updated."""
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    cleared = 0
+    for i in range(0, len(tokens), MULTICAST_BATCH_SIZE):
+        cleared += User.objects.filter(
+            fcm_token__in=tokens[i:i + MULTICAST_BATCH_SIZE]
+        ).update(fcm_token='')
+    if cleared:
+        logger.info(f"Cleared {cleared} dead FCM tokens")
+    return cleared
+
+
+# Async senders, for coroutines (async views under ASGI). firebase-admin 6.6+
+# sends over an async HTTP client (send_each_async); with older SDKs, and
+# transports without it, each send blocks a worker thread instead.
+
+async def _asend(messaging, message):
+    send_each_async = getattr(messaging, 'send_each_async', None)
+    if send_each_async is None:
+        return await sync_to_async(messaging.send, thread_sensitive=False)(message)
+    response = (await send_each_async([message])).responses[0]
+    if not response.success:
+        raise response.exception
+    return response.message_id
+
+
+async def _asend_multicast_batch(messaging, tokens, title, body, data):
+    send = getattr(messaging, 'send_each_for_multicast_async', None)
+    if send is None:
+        return await sync_to_async(_send_multicast_batch, thread_sensitive=False)(
+            messaging, tokens, title, body, data
         )
+    return await send(_multicast_message(messaging, tokens, title, body, data))
+
+
+async def asend_job_notification(job):
+    """``send_job_notification`` for coroutines."""
+    messaging = get_messaging()
+    if messaging is None:
+        logger.warning(f"Skipping push notification for job {job.id} - Firebase not configured")
+        return False
+    
+    try:
+        response = await _asend(messaging, _job_message(messaging, job))
+        logger.info(f"Push notification sent for job {job.id}: {response}")
+        return True
         
-        response = messaging.send_multicast(message)
-        logger.info(f"Multicast sent: {response.success_count} success, {response.failure_count} failures")
-        return response
+    except Exception as e:
+        logger.error(f"Failed to send push notification for job {job.id}: {e}")
+        return False
+
+
+async def asend_notification_to_user(user, title, body, data=None):
+    """``send_notification_to_user`` for coroutines."""
+    if not user.fcm_token:
+        logger.warning(f"User {user.id} has no FCM token")
+        return False
+    
+    messaging = get_messaging()
+    if messaging is None:
+        return False
+    
+    try:
+        response = await _asend(messaging, _user_message(messaging, user, title, body, data))
+        logger.info(f"Push notification sent to user {user.id}: {response}")
+        return True
         
     except Exception as e:
-        logger.error(f"Failed to send multicast notification: {e}")
+        logger.error(f"Failed to send push notification to user {user.id}: {e}")
+        return False
+
+
+async def asend_notification_to_tokens(tokens, title, body, data=None, prune=True):
+    """
+    ``send_notification_to_tokens`` for coroutines: the batches are sent
+    concurrently from the event loop, at most ``FCM_MULTICAST_WORKERS`` at a
+    time, instead of on a thread pool.
+    """
+    if not tokens:
+        return MulticastResult()
+    
+    messaging = get_messaging()
+    if messaging is None:
         return None
+    
+    tokens, batches = _batches(tokens)
+    result = MulticastResult()
+    limit = asyncio.Semaphore(getattr(settings, 'FCM_MULTICAST_WORKERS', 8))
+    
+    async def send(batch):
+        async with limit:
+            return await _asend_multicast_batch(messaging, batch, title, body, data)
+    
+    responses = await asyncio.gather(*(send(batch) for batch in batches), return_exceptions=True)
+    for batch, response in zip(batches, responses):
+        _collect_batch(result, batch, response)
+    
+    _log_multicast(tokens, batches, result)
+    if prune and result.dead_tokens:
+        await sync_to_async(prune_dead_tokens)(result.dead_tokens)
+    return result
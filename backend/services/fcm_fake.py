@@ -0,0 +1,158 @@
+"""
+In-memory stand-in for ``firebase_admin.messaging``.
+
+Enable it with ``FCM_TRANSPORT=services.fcm_fake.fake_messaging`` to exercise
+push code locally (outbox worker, multicast fan-out, benchmarks) without
+Firebase credentials or network access.
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+class FakeMessagingError(Exception):
+    """Raised by the fake transport for simulated send failures."""
+
+
+@dataclass
+class Notification:
+    title: str = None
+    body: str = None
+
+
+@dataclass
+class Message:
+    notification: Notification = None
+    data: dict = field(default_factory=dict)
+    token: str = None
+    topic: str = None
+
+
+@dataclass
+class MulticastMessage:
+    tokens: list
+    notification: Notification = None
+    data: dict = field(default_factory=dict)
+
+
+@dataclass
+class SendResponse:
+    message_id: str = None
+    exception: Exception = None
+
+    @property
+    def success(self):
+        return self.exception is None
+
+
+@dataclass
+class BatchResponse:
+    responses: list
+
+    @property
+    def success_count(self):
+        return sum(1 for response in self.responses if response.success)
+
+    @property
+    def failure_count(self):
+        return len(self.responses) - self.success_count
+
+
+class UnregisteredError(FakeMessagingError):
+    """Mirrors ``firebase_admin.messaging.UnregisteredError`` for dead tokens."""
+
+
+class FakeMessaging:
+    """
+    Records every message instead of sending it.
+
+    ``fail_next`` makes the next N sends raise, ``dead_tokens`` are reported
+    as unregistered, and ``latency`` (seconds) simulates network round trips.
+    """
+
+    Notification = Notification
+    Message = Message
+    MulticastMessage = MulticastMessage
+    UnregisteredError = UnregisteredError
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.sent = []
+        self.calls = 0
+        self.fail_next = 0
+        self.dead_tokens = set()
+        self.failure_rate = 0.0
+        self.latency = 0.0
+
+    def _next_id(self):
+        return f'projects/fake/messages/{next(self._ids)}'
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+            if self.fail_next:
+                self.fail_next -= 1
+                raise FakeMessagingError('Simulated FCM failure')
+
+    def _deliver(self, message):
+        if message.token in self.dead_tokens:
+            raise UnregisteredError('Requested entity was not found.')
+        with self._lock:
+            self.sent.append(message)
+            return self._next_id()
+
+    def _multicast(self, message):
+        self._maybe_fail()
+        responses = []
+        with self._lock:
+            for token in message.tokens:
+                if token in self.dead_tokens:
+                    responses.append(SendResponse(exception=UnregisteredError('Requested entity was not found.')))
+                elif self.failure_rate and random.random() < self.failure_rate:
+                    responses.append(SendResponse(exception=FakeMessagingError('Simulated token failure')))
+                else:
+                    self.sent.append(Message(notification=message.notification, data=message.data, token=token))
+                    responses.append(SendResponse(message_id=self._next_id()))
+        return BatchResponse(responses)
+
+    def send(self, message):
+        if self.latency:
+            time.sleep(self.latency)
+        self._maybe_fail()
+        return self._deliver(message)
+
+    def send_each_for_multicast(self, message):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._multicast(message)
+
+    # The async API of firebase-admin 6.6+
+
+    async def send_each_async(self, messages):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._maybe_fail()
+        responses = []
+        for message in messages:
+            try:
+                responses.append(SendResponse(message_id=self._deliver(message)))
+            except UnregisteredError as e:
+                responses.append(SendResponse(exception=e))
+        return BatchResponse(responses)
+
+    async def send_each_for_multicast_async(self, message):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._multicast(message)
+
+    send_multicast = send_each_for_multicast
+
+
+fake_messaging = FakeMessaging()
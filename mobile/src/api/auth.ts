@@ -25,6 +25,7 @@ export interface User {
     last_name: string;
     phone: string;
     resume_url: string;
+    skills: string;
     role: 'user' | 'admin' | 'super_admin';
     is_admin: boolean;
     profile_complete: boolean;
@@ -66,4 +66,64 @@ apiClient.interceptors.response.use(
     }
 );
 
+// Responses kept for conditional GETs, keyed by URL and params. Only the
+// most recently used ones are kept: a Map iterates in insertion order, so
+// re-inserting on use keeps the oldest entry first in line for eviction.
+const ETAG_CACHE_SIZE = 20;
+const etagCache = new Map<string, { etag: string; data: any }>();
+
+const rememberETag = (key: string, entry: { etag: string; data: any }) => {
+    etagCache.delete(key);
+    etagCache.set(key, entry);
+    if (etagCache.size > ETAG_CACHE_SIZE) {
+        etagCache.delete(etagCache.keys().next().value as string);
+    }
+};
+
+/**
+ * GET that revalidates with If-None-Match: when the server answers
+ * 304 Not Modified the previously received body is returned instead.
+ */
+export const getWithETag = async (url: string, params?: object) => {
+    const key = `${url}?${JSON.stringify(params ?? {})}`;
+    const cached = etagCache.get(key);
+    const response = await apiClient.get(url, {
+        params,
+        headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+        validateStatus: (status) => (status >= 200 && status < 300) || (status === 304 && !!cached),
+    });
+
+    if (response.status === 304 && cached) {
+        rememberETag(key, cached);
+        return cached.data;
+    }
+    const etag = response.headers['etag'];
+    if (etag) {
+        rememberETag(key, { etag, data: response.data });
+    } else {
+        etagCache.delete(key);
+    }
+    return response.data;
+};
+
+const newIdempotencyKey = () =>
+    `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+
+/**
+ * POST with an Idempotency-Key header. When the request fails without a
+ * response (the connection dropped, possibly after the server acted on it)
+ * it is retried once with the same key, so the server runs it at most once.
+ */
+export const postIdempotent = async (url: string, data?: object) => {
+    const headers = { 'Idempotency-Key': newIdempotencyKey() };
+    try {
+        return await apiClient.post(url, data, { headers });
+    } catch (error: any) {
+        if (error.response) {
+            throw error;
+        }
+        return apiClient.post(url, data, { headers });
+    }
+};
+
 export default apiClient;
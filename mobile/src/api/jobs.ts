@@ -1,6 +1,9 @@
-import apiClient from './client';
+import apiClient, { getWithETag, postIdempotent } from './client';
 import { API_ENDPOINTS } from '../config/api';
 
+// Tries at confirming a click the server hasn't written yet
+const CONFIRM_ATTEMPTS = 3;
+
 export interface Job {
     id: number;
     title: string;
@@ -31,6 +34,8 @@ export interface JobFilters {
     job_type?: string;
     search?: string;
     page?: number;
+    cursor?: string;
+    count?: 'exact' | 'approximate';
 }
 
 export interface ApplicationData {
@@ -45,19 +50,39 @@ export interface ApplicationConfirmationData {
     submission_status: 'clicked' | 'submitted' | 'abandoned';
 }
 
+export interface ExportRequest {
+    format?: 'csv' | 'csv.gz' | 'xlsx' | 'parquet';
+    job_id?: number;
+    start?: string;
+    end?: string;
+    source?: 'in_app' | 'external_click' | 'mailto_click';
+    status?: 'pending' | 'reviewed' | 'shortlisted' | 'rejected' | 'hired';
+    submission_status?: 'clicked' | 'submitted' | 'abandoned';
+}
+
+export interface ExportJob {
+    id: string;
+    format: string;
+    state: 'queued' | 'running' | 'done' | 'failed';
+    total_rows: number | null;
+    rows_written: number;
+    progress: number | null;
+    file_size: number | null;
+    error: string;
+    download_url: string | null;
+}
+
 export const jobsApi = {
     getJobs: async (filters?: JobFilters) => {
-        const response = await apiClient.get(API_ENDPOINTS.JOBS, { params: filters });
-        return response.data;
+        return getWithETag(API_ENDPOINTS.JOBS, filters);
     },
 
     getJobDetail: async (id: number) => {
-        const response = await apiClient.get(API_ENDPOINTS.JOB_DETAIL(id));
-        return response.data;
+        return getWithETag(API_ENDPOINTS.JOB_DETAIL(id));
     },
 
     applyToJob: async (jobId: number, applicationData?: ApplicationData) => {
-        const response = await apiClient.post(
+        const response = await postIdempotent(
             API_ENDPOINTS.APPLY_TO_JOB(jobId),
             applicationData || {}
         );
@@ -65,11 +90,18 @@ export const jobsApi = {
     },
 
     confirmApplication: async (applicationId: number, data: ApplicationConfirmationData) => {
-        const response = await apiClient.post(
-            API_ENDPOINTS.APPLICATION_CONFIRM(applicationId),
-            data
-        );
-        return response.data;
+        // 202: the click is still buffered on the server; retry after Retry-After
+        for (let attempt = 1; ; attempt++) {
+            const response = await apiClient.post(
+                API_ENDPOINTS.APPLICATION_CONFIRM(applicationId),
+                data
+            );
+            if (response.status !== 202 || attempt >= CONFIRM_ATTEMPTS) {
+                return response.data;
+            }
+            const seconds = Number(response.headers['retry-after']) || 2;
+            await new Promise((resolve) => setTimeout(resolve, seconds * 1000));
+        }
     },
 
     // Admin only
@@ -101,4 +133,14 @@ export const jobsApi = {
         const response = await apiClient.get(API_ENDPOINTS.APPLICATIONS);
         return response.data;
     },
+
+    queueExport: async (request: ExportRequest): Promise<ExportJob> => {
+        const response = await apiClient.post(API_ENDPOINTS.EXPORT_JOBS, request);
+        return response.data;
+    },
+
+    getExport: async (id: string): Promise<ExportJob> => {
+        const response = await apiClient.get(API_ENDPOINTS.EXPORT_JOB_DETAIL(id));
+        return response.data;
+    },
 };
@@ -32,6 +32,8 @@ export const API_ENDPOINTS = {
     APPLICATIONS: 'applications/',
     JOB_APPLICATIONS: (id: number) => `applications/job/${id}/`,
     EXPORT_APPLICATIONS: 'applications/export/',
+    EXPORT_JOBS: 'applications/exports/',
+    EXPORT_JOB_DETAIL: (id: string) => `applications/exports/${id}/`,
     UPLOAD_RESUME: 'applications/upload/',
     APPLICATION_CONFIRM: (id: number) => `applications/${id}/confirm/`,
 };